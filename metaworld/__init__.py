@@ -16,6 +16,7 @@ import numpy.typing as npt
 from gymnasium.envs.registration import register
 
 import metaworld.env_dict as _env_dict
+from metaworld import task_cache
 from metaworld.env_dict import (
     ALL_V3_ENVIRONMENTS,
     ALL_V3_ENVIRONMENTS_GOAL_HIDDEN,
@@ -111,56 +112,91 @@ def _encode_task(env_name, data) -> Task:
     return Task(env_name=env_name, data=pickle.dumps(data))
 
 
-def _make_tasks(
+def _sample_goals(
     classes: _env_dict.EnvDict,
     args_kwargs: _env_dict.EnvArgsKwargsDict,
-    kwargs_override: dict,
     seed: int | None = None,
-) -> list[Task]:
-    """Initialises goals for a given set of environments.
+) -> dict[str, npt.NDArray[np.float64]]:
+    """Samples `_N_GOALS` random goals (`rand_vec`s) for each of the given environments.
 
     Args:
         classes: The environment classes as an `EnvDict`.
         args_kwargs: The environment arguments and keyword arguments.
-        kwargs_override: Any kwarg overrides.
         seed: The random seed to use.
 
     Returns:
-        A flat list of `Task` objects, `_N_GOALS` for each environment in `classes`.
+        The goals of each environment, of shape `(_N_GOALS, dim)`.
     """
     # Cache existing random state
     if seed is not None:
         st0 = np.random.get_state()
         np.random.seed(seed)
 
-    tasks = []
+    goals = {}
     for env_name, args in args_kwargs.items():
-        kwargs = args["kwargs"].copy()
+        kwargs = args["kwargs"]
         assert isinstance(kwargs, dict)
         assert len(args["args"]) == 0
-
-        # Init env
-        env = classes[env_name]()
-        env._freeze_rand_vec = False
-        env._set_task_called = True
-        rand_vecs: list[npt.NDArray[Any]] = []
-
-        # Set task
-        del kwargs["task_id"]
-        env._set_task_inner(**kwargs)
-
-        for _ in range(_N_GOALS):  # Generate random goals
-            env.reset()
-            assert env._last_rand_vec is not None
-            rand_vecs.append(env._last_rand_vec)
-        unique_task_rand_vecs = np.unique(np.array(rand_vecs), axis=0)
+        # `_set_task_inner()` takes no task data, so nothing but the task ID
+        # can be passed.
+        assert kwargs.keys() == {"task_id"}
+
+        # Generate random goals. This yields the goals that `_N_GOALS` calls to
+        # `env.reset()` would: every reset runs `reset_model()` twice, and only
+        # the `rand_vec` drawn by the second call is kept. No env is created:
+        # the goals only depend on the task's reset space and constraints.
+        rand_vecs = classes[env_name].sample_task_rand_vecs(2 * _N_GOALS, np.random)[
+            1::2
+        ]
+        unique_task_rand_vecs = np.unique(rand_vecs, axis=0)
         assert (
             unique_task_rand_vecs.shape[0] == _N_GOALS
         ), f"Only generated {unique_task_rand_vecs.shape[0]} unique goals, not {_N_GOALS}"
-        env.close()
 
+        goals[env_name] = rand_vecs
+
+    # Restore random state
+    if seed is not None:
+        np.random.set_state(st0)
+
+    return goals
+
+
+def _make_tasks(
+    classes: _env_dict.EnvDict,
+    args_kwargs: _env_dict.EnvArgsKwargsDict,
+    kwargs_override: dict,
+    seed: int | None = None,
+) -> list[Task]:
+    """Initialises goals for a given set of environments.
+
+    With a seed, the goals are read from the on-disk task cache if possible,
+    see `metaworld.task_cache`.
+
+    Args:
+        classes: The environment classes as an `EnvDict`.
+        args_kwargs: The environment arguments and keyword arguments.
+        kwargs_override: Any kwarg overrides.
+        seed: The random seed to use.
+
+    Returns:
+        A flat list of `Task` objects, `_N_GOALS` for each environment in `classes`.
+    """
+    goals = None
+    cache_dir = task_cache.get_cache_dir() if seed is not None else None
+    if cache_dir is not None:
+        assert seed is not None
+        key = task_cache.task_key(classes, args_kwargs, seed, _N_GOALS)
+        goals = task_cache.load(cache_dir, key, list(args_kwargs))
+    if goals is None:
+        goals = _sample_goals(classes, args_kwargs, seed=seed)
+        if cache_dir is not None:
+            task_cache.save(cache_dir, key, goals)
+
+    tasks = []
+    for env_name, args in args_kwargs.items():
         # Create a task for each random goal
-        for rand_vec in rand_vecs:
+        for rand_vec in goals[env_name]:
             kwargs = args["kwargs"].copy()
             assert isinstance(kwargs, dict)
             del kwargs["task_id"]
@@ -170,12 +206,6 @@ def _make_tasks(
 
             tasks.append(_encode_task(env_name, kwargs))
 
-        del env
-
-    # Restore random state
-    if seed is not None:
-        np.random.set_state(st0)
-
     return tasks
 
 
@@ -416,6 +446,7 @@ def _init_each_env(
     camera_id: int | None = None,
     width: int = 480,
     height: int = 480,
+    structured_info: bool = False,
 ) -> gym.Env:
     env: gym.Env = env_cls(
         reward_function_version=reward_function_version,
@@ -425,6 +456,7 @@ def _init_each_env(
         width=width,
         height=height,
     )
+    env.structured_info = structured_info  # type: ignore
     if seed is not None:
         env.seed(seed)  # type: ignore
     env = gym.wrappers.TimeLimit(env, max_episode_steps or env.max_path_length)  # type: ignore
@@ -0,0 +1,255 @@
+"""A batched backend that steps N worlds of one task in a single call."""
+
+from __future__ import annotations
+
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Sequence
+
+import gymnasium as gym
+import mujoco
+import numpy as np
+import numpy.typing as npt
+from gymnasium.vector.utils import batch_space
+
+from metaworld.sawyer_xyz_env import SawyerXYZEnv
+from metaworld.types import Task
+from metaworld.utils.mujoco_utils import data_array_fields, rebind_attributes
+from metaworld.utils.step_cache import StepCache
+
+
+class SawyerXYZBatchEnv(gym.vector.VectorEnv):
+    """Steps N worlds of the same Sawyer task in a single call.
+
+    The task's XML is parsed once; every other world is a lightweight clone of
+    that template env with its own `MjModel` copy (tasks move bodies and sites
+    by writing to the model during reset), its own `MjData` and its own
+    per-episode attributes. The task's `reset_model()` and `evaluate_state()`
+    are reused unchanged, so every world produces exactly the same results as
+    an independent env.
+
+    Compared to a `SyncVectorEnv` of wrapped envs this skips the per-env
+    wrapper stack and builds the info arrays directly, and the physics of all
+    worlds is stepped on a thread pool (`mj_step` releases the GIL).
+
+    Sub-environments are reset automatically in the step after they truncate
+    (the "next step" autoreset mode).
+    """
+
+    metadata = {"autoreset_mode": gym.vector.AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        env_cls: type[SawyerXYZEnv],
+        num_envs: int,
+        tasks: Sequence[Task] | None = None,
+        num_threads: int | None = None,
+        **env_kwargs: Any,
+    ) -> None:
+        """Creates the batched env.
+
+        Args:
+            env_cls: The task's env class, e.g. `SawyerReachEnvV3`.
+            num_envs: The number of worlds.
+            tasks: Optional tasks to set, one per world. See `set_tasks()`.
+            num_threads: The number of threads used to step the physics. Defaults to the number of CPUs.
+            **env_kwargs: Keyword arguments for `env_cls`. Rendering is not supported.
+        """
+        assert num_envs > 0, "num_envs must be positive"
+        if env_kwargs.get("render_mode") is not None:
+            raise ValueError("SawyerXYZBatchEnv does not support rendering.")
+        super().__init__()
+
+        template = env_cls(**env_kwargs)
+        self.num_envs = num_envs
+        self.worlds: list[SawyerXYZEnv] = [template]
+        fields = data_array_fields(template.data)
+        for _ in range(num_envs - 1):
+            self.worlds.append(self._clone_world(template, fields))
+
+        self.num_threads = num_threads or os.cpu_count() or 1
+        self._pool = (
+            ThreadPoolExecutor(max_workers=self.num_threads)
+            if self.num_threads > 1 and num_envs > 1
+            else None
+        )
+
+        self.single_action_space = template.action_space
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.single_observation_space = template.observation_space
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self._observations = np.zeros(
+            (num_envs,) + self.single_observation_space.shape, dtype=np.float64
+        )
+        self._rewards = np.zeros((num_envs,), dtype=np.float64)
+        self._terminations = np.zeros((num_envs,), dtype=np.bool_)
+        self._truncations = np.zeros((num_envs,), dtype=np.bool_)
+        self._autoreset_envs = np.zeros((num_envs,), dtype=np.bool_)
+
+        if tasks is not None:
+            self.set_tasks(tasks)
+
+    @staticmethod
+    def _clone_world(template: SawyerXYZEnv, fields: list[str]) -> SawyerXYZEnv:
+        """Creates a world with its own copies of the template's model and data."""
+        world = object.__new__(type(template))
+        model = copy.copy(template.model)
+        data = mujoco.MjData(model)
+        mujoco.mj_copyData(data, model, template.data)
+        attributes = rebind_attributes(template.__dict__, template.data, data, fields)
+        for key, value in attributes.items():
+            # Spaces carry their own RNG, which `SawyerXYZEnv.seed()` reseeds.
+            if isinstance(value, gym.spaces.Space):
+                attributes[key] = copy.deepcopy(value)
+        attributes["model"] = model
+        attributes["data"] = data
+        attributes["_np_random"] = None
+        attributes["mujoco_renderer"] = None
+        attributes["_step_cache"] = StepCache()
+        world.__dict__.update(attributes)
+        return world
+
+    def set_tasks(self, tasks: Sequence[Task]) -> None:
+        """Sets the task of every world.
+
+        Args:
+            tasks: One task per world. All tasks must belong to this batch's env class.
+        """
+        if len(tasks) != self.num_envs:
+            raise ValueError(
+                f"Expected {self.num_envs} tasks, got {len(tasks)} instead."
+            )
+        for world, task in zip(self.worlds, tasks):
+            world.set_task(task)
+        observability = {world._partially_observable for world in self.worlds}
+        if len(observability) != 1:
+            raise ValueError(
+                "All tasks in a batch must share the same goal observability."
+            )
+
+    def reset(
+        self,
+        *,
+        seed: int | list[int | None] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, Any]]:
+        """Resets the worlds.
+
+        Args:
+            seed: Seeds each world with `SawyerXYZEnv.seed()` before resetting it, either one value per world or an int `s` for `[s, s + 1, ...]`.
+            options: Passed through to each world's `reset()`. The `reset_mask` option selects which worlds to reset.
+
+        Returns:
+            The `(obs, info)` tuple, with `obs` of shape `(num_envs, 39)`.
+        """
+        if seed is None:
+            seed = [None for _ in range(self.num_envs)]
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError(
+                f"If seeds are passed as a list the length must match num_envs={self.num_envs} but got length={len(seed)}."
+            )
+
+        options = dict(options) if options is not None else None
+        reset_mask = np.ones((self.num_envs,), dtype=np.bool_)
+        if options is not None and "reset_mask" in options:
+            reset_mask = options.pop("reset_mask")
+            if not isinstance(reset_mask, np.ndarray) or reset_mask.dtype != np.bool_:
+                raise TypeError(
+                    "`options['reset_mask']` must be a boolean numpy array."
+                )
+            if reset_mask.shape != (self.num_envs,):
+                raise ValueError(
+                    f"`options['reset_mask']` must have shape `({self.num_envs},)`, got {reset_mask.shape}"
+                )
+
+        for i in np.flatnonzero(reset_mask):
+            world = self.worlds[i]
+            if seed[i] is not None:
+                world.seed(seed[i])
+            self._observations[i], _ = world.reset(options=options)
+        self._terminations[reset_mask] = False
+        self._truncations[reset_mask] = False
+        self._autoreset_envs[reset_mask] = False
+        return self._observations.copy(), {}
+
+    def step(self, actions: npt.NDArray[np.float32]) -> tuple[
+        npt.NDArray[np.float64],
+        npt.NDArray[np.float64],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+        dict[str, Any],
+    ]:
+        """Steps every world by one action.
+
+        Args:
+            actions: The actions, of shape `(num_envs, 4)`.
+
+        Returns:
+            The batched `(obs, reward, terminated, truncated, info)` tuple. The
+            info dict maps each of the task's info keys to an `(num_envs,)`
+            array, with a boolean `_<key>` mask marking the worlds that were
+            stepped. Worlds that truncated in the previous step are reset
+            instead and report a reward of 0.
+        """
+        actions = np.asarray(actions)
+        assert actions.shape == (
+            self.num_envs,
+            4,
+        ), f"Actions should be of shape ({self.num_envs}, 4), got {actions.shape}"
+
+        stepped = np.flatnonzero(~self._autoreset_envs)
+        for i in stepped:
+            self.worlds[i]._apply_action(actions[i])
+        if self._pool is None or len(stepped) < 2:
+            for i in stepped:
+                self.worlds[i]._simulate(actions[i])
+        else:
+            list(
+                self._pool.map(lambda i: self.worlds[i]._simulate(actions[i]), stepped)
+            )
+
+        step_infos = []
+        for i in stepped:
+            (
+                self._observations[i],
+                self._rewards[i],
+                self._terminations[i],
+                self._truncations[i],
+                info,
+            ) = self.worlds[i]._finish_step(actions[i])
+            step_infos.append(info)
+
+        for i in np.flatnonzero(self._autoreset_envs):
+            self._observations[i], _ = self.worlds[i].reset()
+            self._rewards[i] = 0.0
+            self._terminations[i] = False
+            self._truncations[i] = False
+
+        infos: dict[str, Any] = {}
+        if step_infos:
+            mask = np.zeros((self.num_envs,), dtype=np.bool_)
+            mask[stepped] = True
+            for key in step_infos[0]:
+                values = np.array([info[key] for info in step_infos])
+                infos[key] = np.zeros((self.num_envs,), dtype=values.dtype)
+                infos[key][stepped] = values
+                infos[f"_{key}"] = mask
+
+        self._autoreset_envs = np.logical_or(self._terminations, self._truncations)
+        return (
+            self._observations.copy(),
+            self._rewards.copy(),
+            self._terminations.copy(),
+            self._truncations.copy(),
+            infos,
+        )
+
+    def close_extras(self, **kwargs: Any) -> None:
+        """Shuts down the physics thread pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -145,6 +145,9 @@ def _create_hidden_goal_envs(all_envs: EnvDict) -> EnvDict:
                 st0 = np.random.get_state()
                 np.random.seed(seed)
             super(type(env), env).__init__()
+            if env._without_model:
+                # Created by `SawyerXYZEnv.random_reset_space()`.
+                return
             env._partially_observable = True
             del env.sawyer_observation_space
             env._freeze_rand_vec = False
@@ -186,6 +189,9 @@ def _create_observable_goal_envs(all_envs: EnvDict) -> EnvDict:
                 st0 = np.random.get_state()
                 np.random.seed(seed)
             super(type(env), env).__init__()
+            if env._without_model:
+                # Created by `SawyerXYZEnv.random_reset_space()`.
+                return
 
             env._partially_observable = False
             env._freeze_rand_vec = False
@@ -9,11 +9,13 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict, ObservationDict
-from metaworld.utils.reward_utils import tolerance
+from metaworld.types import InitConfigDict, ObservationDict, RewardInputs
+from metaworld.utils.reward_utils import make_tolerance, tolerance
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerNutAssemblyEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.1),)
     WRENCH_HANDLE_LENGTH: float = 0.02
 
     def __init__(
@@ -101,13 +103,13 @@ class SawyerNutAssemblyEnvV3(SawyerXYZEnv):
 
     def _get_id_main_object(self) -> int:
         """TODO: Reggie"""
-        return self.model.geom_name2id("WrenchHandle")
+        return self._ids.geom["WrenchHandle"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.site("RoundNut-8").xpos
+        return self.data.site_xpos[self._ids.site["RoundNut-8"]]
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("RoundNut").xquat
+        return self.data.xquat[self._ids.body["RoundNut"]]
 
     def _get_obs_dict(self) -> ObservationDict:
         obs_dict = super()._get_obs_dict()
@@ -117,8 +119,6 @@ class SawyerNutAssemblyEnvV3(SawyerXYZEnv):
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - goal_pos[-3:-1]) < 0.1:
-            goal_pos = self._get_state_rand_vec()
         self.obj_init_pos = goal_pos[:3]
         self._target_pos = goal_pos[-3:]
         peg_pos = self._target_pos - np.array([0.0, 0.0, 0.05])
@@ -335,3 +335,74 @@ class SawyerNutAssemblyEnvV3(SawyerXYZEnv):
                 0.0,
                 success,
             )
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "wrench_center": self._get_site_pos("RoundNut"),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        hand = obs[:, :3]
+        wrench = obs[:, 4:7]
+        wrench_center = features["wrench_center"]
+        target_pos = episode_consts["target_pos"]
+
+        wrench_threshed = wrench.copy()
+        threshold = cls.WRENCH_HANDLE_LENGTH / 2.0
+        near_handle = np.abs(wrench[:, 0] - hand[:, 0]) < threshold
+        wrench_threshed[:, 0] = np.where(near_handle, hand[:, 0], wrench[:, 0])
+
+        ideal = np.array([0.707, 0, 0, 0.707])
+        error = np.linalg.norm(obs[:, 7:11] - ideal, axis=-1)
+        reward_quat = np.maximum(1.0 - error / 0.4, 0.0)
+
+        reward_grab = cls._gripper_caging_reward_batch(
+            action,
+            wrench_threshed,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.015,
+            pad_success_thresh=0.02,
+            xz_thresh=0.01,
+            medium_density=True,
+        )
+
+        pos_error = target_pos - wrench_center
+        radius = np.linalg.norm(pos_error[:, :2], axis=-1)
+        success = (radius < 0.02) & (pos_error[:, 2] > 0.0)
+        funnel = np.where(success, 0.02, 0.01)
+        in_funnel = radius > funnel
+        target_height = np.where(
+            in_funnel,
+            0.02 * np.log(np.where(in_funnel, radius - funnel, 1.0)) + 0.2,
+            0.0,
+        )
+        pos_error[:, 2] = target_height - wrench_center[:, 2]
+        scale = np.array([1.0, 1.0, 3.0])
+        lifted = (wrench_center[:, 2] > 0.02) | (radius < funnel)
+        reward_in_place = 0.1 * lifted + 0.9 * make_tolerance(
+            bounds=(0, 0.02), sigmoid="long_tail"
+        )(np.linalg.norm(pos_error * scale, axis=-1), 0.4)
+
+        reward = (2.0 * reward_grab + 6.0 * reward_in_place) * reward_quat
+        reward = np.where(success, 10.0, reward)
+
+        info = {
+            "success": success.astype(np.float64),
+            "near_object": reward_quat,
+            "grasp_success": (reward_grab >= 0.5).astype(np.float64),
+            "grasp_reward": reward_grab,
+            "in_place_reward": reward_in_place,
+            "obj_to_target": np.zeros(len(obs)),
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -8,11 +8,13 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerBasketballEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
     PAD_SUCCESS_MARGIN: float = 0.06
     TARGET_RADIUS: float = 0.08
 
@@ -98,31 +100,28 @@ class SawyerBasketballEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("objGeom")
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("bsktball")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("bsktball").xquat
+        return self.data.xquat[self._ids.body["bsktball"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
         self.prev_obs = self._get_curr_obs_combined_no_goal()
         goal_pos = self._get_state_rand_vec()
         basket_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - basket_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            basket_pos = goal_pos[3:]
         assert self.obj_init_pos is not None
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
         self.model.body("basket_goal").pos = basket_pos
-        self._target_pos = self.data.site("goal").xpos
+        self._target_pos = self.data.site_xpos[self._ids.site["goal"]]
         self._set_obj_xyz(self.obj_init_pos)
         self.model.site("goal").pos = self._target_pos
 
         self.liftThresh = 0.3
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxPlacingDist = (
@@ -269,3 +268,61 @@ class SawyerBasketballEnvV3(SawyerXYZEnv):
             assert (placeRew >= 0) and (pickRew >= 0)
             reward = reachRew + pickRew + placeRew
             return reward, 0.0, 0.0, float(placingDist), 0.0, 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        # Force target to be slightly above basketball hoop
+        target = episode_consts["target_pos"].copy()
+        target[:, 2] = 0.3
+
+        # Emphasize Z error
+        scale = np.array([1.0, 1.0, 2.0])
+        target_to_obj = np.linalg.norm((obj - target) * scale, axis=-1)
+        target_to_obj_init = np.linalg.norm((obj_init_pos - target) * scale, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, target_to_obj_init)
+        tcp_opened = obs[:, 3]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.025,
+            pad_success_thresh=0.06,
+            xz_thresh=0.005,
+            high_density=True,
+        )
+        lifted = (
+            (tcp_to_obj < 0.035)
+            & (tcp_opened > 0)
+            & (obj[:, 2] - 0.01 > obj_init_pos[:, 2])
+        )
+        object_grasped = np.where(lifted, 1.0, object_grasped)
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+        reward = np.where(lifted, reward + 1.0 + 5.0 * in_place, reward)
+        reward = np.where(target_to_obj < cls.TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (target_to_obj <= cls.TARGET_RADIUS).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.05).astype(np.float64),
+            "grasp_success": (
+                (tcp_opened > 0) & (obj[:, 2] - 0.03 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
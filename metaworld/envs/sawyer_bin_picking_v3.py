@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -122,13 +122,13 @@ class SawyerBinPickingEnvV3(SawyerXYZEnv):
         return []
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("objGeom")
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("obj").xquat
+        return self.data.xquat[self._ids.body["obj"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -144,7 +144,7 @@ class SawyerBinPickingEnvV3(SawyerXYZEnv):
         self._target_pos = self.get_body_com("bin_goal")
         self._target_to_obj_init = None
 
-        self.objHeight = self.data.body("obj").xpos[2]
+        self.objHeight = self.data.xpos[self._ids.body["obj"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxPlacingDist = (
@@ -335,3 +335,89 @@ class SawyerBinPickingEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + placeRew
 
             return float(reward), False, False, float(placingDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        assert (
+            self._target_to_obj_init is not None
+        ), "`step()` must be called before `episode_constants()`."
+        return {
+            **super().episode_constants(),
+            "target_to_obj_init": np.array(self._target_to_obj_init),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        hand = obs[:, :3]
+        obj = obs[:, 4:7]
+        target_pos = episode_consts["target_pos"]
+        obj_init_pos = episode_consts["obj_init_pos"]
+
+        target_to_obj = np.linalg.norm(obj - target_pos, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, episode_consts["target_to_obj_init"])
+
+        threshold = 0.03
+        radii = np.stack(
+            (
+                np.linalg.norm(hand[:, :2] - obj_init_pos[:, :2], axis=-1),
+                np.linalg.norm(hand[:, :2] - target_pos[:, :2], axis=-1),
+            )
+        )
+        # floor is a *pair* of 3D funnels centered on (1) the object's initial
+        # position and (2) the desired final position
+        in_funnel = radii > threshold
+        floor = np.where(
+            in_funnel,
+            0.02 * np.log(np.where(in_funnel, radii - threshold, 1.0)) + 0.2,
+            0.0,
+        ).min(axis=0)
+        above_floor = np.where(
+            hand[:, 2] >= floor,
+            1.0,
+            reward_utils.make_tolerance(bounds=(0.0, 0.01), sigmoid="long_tail")(
+                np.maximum(floor - hand[:, 2], 0.0), 0.05
+            ),
+        )
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            obj_radius=0.015,
+            pad_success_thresh=0.05,
+            object_reach_radius=0.01,
+            xz_thresh=0.01,
+            desired_gripper_effort=0.7,
+            high_density=True,
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+
+        near_object = np.linalg.norm(obj - hand, axis=-1) < 0.04
+        pinched_without_obj = obs[:, 3] < 0.43
+        lifted = obj[:, 2] - 0.02 > obj_init_pos[:, 2]
+        grasp_success = near_object & lifted & ~pinched_without_obj
+        reward = np.where(
+            grasp_success,
+            reward + 1.0 + 5.0 * reward_utils.hamacher_product(above_floor, in_place),
+            reward,
+        )
+        reward = np.where(target_to_obj < cls.TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (target_to_obj <= 0.05).astype(np.float64),
+            "near_object": near_object.astype(np.float64),
+            "grasp_success": grasp_success.astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -9,11 +9,14 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerBoxCloseEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.25),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -98,13 +101,13 @@ class SawyerBoxCloseEnvV3(SawyerXYZEnv):
         return []
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("BoxHandleGeom")
+        return self._ids.geom["BoxHandleGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("top_link")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("top_link").xquat
+        return self.data.xquat[self._ids.body["top_link"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -113,8 +116,6 @@ class SawyerBoxCloseEnvV3(SawyerXYZEnv):
         box_height = self.get_body_com("boxbody")[2]
 
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - goal_pos[-3:-1]) < 0.25:
-            goal_pos = self._get_state_rand_vec()
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
         self._target_pos = goal_pos[-3:]
 
@@ -128,7 +129,7 @@ class SawyerBoxCloseEnvV3(SawyerXYZEnv):
         self._set_obj_xyz(self.obj_init_pos)
         self.model.site("goal").pos = self._target_pos
 
-        self.objHeight = self.data.geom("BoxHandleGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["BoxHandleGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxPlacingDist = (
@@ -305,3 +306,64 @@ class SawyerBoxCloseEnvV3(SawyerXYZEnv):
             success = bool(np.linalg.norm(obs[4:7] - self._target_pos) < 0.08)
 
             return float(reward), 0.0, 0.0, 0.0, success
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        hand = obs[:, :3]
+        lid = obs[:, 4:7] + np.array([0.0, 0.0, 0.02])
+        target_pos = episode_consts["target_pos"]
+
+        reward_grab = np.clip((np.clip(action[:, 3], -1, 1) + 1.0) / 2.0, 0.0, 1.0)
+        ideal = np.array([0.707, 0, 0, 0.707])
+        error = np.linalg.norm(obs[:, 7:11] - ideal, axis=-1)
+        reward_quat = np.maximum(1.0 - error / 0.2, 0.0)
+
+        threshold = 0.02
+        # floor is a 3D funnel centered on the lid's handle
+        radius = np.linalg.norm(hand[:, :2] - lid[:, :2], axis=-1)
+        in_funnel = radius > threshold
+        floor = np.where(
+            in_funnel,
+            0.04 * np.log(np.where(in_funnel, radius - threshold, 1.0)) + 0.4,
+            0.0,
+        )
+        # The margin is only used below the floor, where it is positive.
+        above_floor = np.where(
+            hand[:, 2] >= floor,
+            1.0,
+            reward_utils.make_tolerance(bounds=(0.0, 0.01), sigmoid="long_tail")(
+                floor - hand[:, 2], np.abs(floor) / 2.0
+            ),
+        )
+        in_place = reward_utils.make_tolerance(bounds=(0, 0.02), sigmoid="long_tail")(
+            np.linalg.norm(hand - lid, axis=-1), 0.5
+        )
+        ready_to_lift = reward_utils.hamacher_product(above_floor, in_place)
+
+        error_scale = np.array([1.0, 1.0, 3.0])  # Emphasize Z error
+        lifted = 0.2 * (lid[:, 2] > 0.04) + 0.8 * reward_utils.make_tolerance(
+            bounds=(0, 0.05), sigmoid="long_tail"
+        )(np.linalg.norm((target_pos - lid) * error_scale, axis=-1), 0.25)
+
+        reward = 2.0 * reward_utils.hamacher_product(reward_grab, ready_to_lift)
+        reward = reward + 8.0 * lifted
+        success = np.linalg.norm(obs[:, 4:7] - target_pos, axis=-1) < 0.08
+        reward = np.where(success, 10.0, reward)
+        reward = reward * reward_quat
+
+        info = {
+            "success": success.astype(np.float64),
+            "near_object": ready_to_lift,
+            "grasp_success": (reward_grab >= 0.5).astype(np.float64),
+            "grasp_reward": reward_grab,
+            "in_place_reward": lifted,
+            "obj_to_target": np.zeros(len(obs)),
+            "unscaled_reward": reward,
+        }
+        return reward, info
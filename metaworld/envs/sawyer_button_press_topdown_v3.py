@@ -9,7 +9,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -89,13 +89,13 @@ class SawyerButtonPressTopdownEnvV3(SawyerXYZEnv):
         return []
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("btnGeom")
+        return self._ids.geom["btnGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("button") + np.array([0.0, 0.0, 0.193])
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("button").xquat
+        return self.data.xquat[self._ids.body["button"]]
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.flat.copy()
@@ -189,3 +189,44 @@ class SawyerButtonPressTopdownEnvV3(SawyerXYZEnv):
             reward = reachRew + pressRew
 
             return reward, float(0.0), float(0.0), pressDist, float(0.0), float(0.0)
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "obj_to_target_init": np.array(self._obj_to_target_init),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        tcp_to_obj_init = np.linalg.norm(obj - episode_consts["init_tcp"], axis=-1)
+        obj_to_target = np.abs(episode_consts["target_pos"][:, 2] - obj[:, 2])
+
+        tcp_closed = 1 - obs[:, 3]
+        near_button = reward_utils.make_tolerance(
+            bounds=(0, 0.01), sigmoid="long_tail"
+        )(tcp_to_obj, tcp_to_obj_init)
+        button_pressed = reward_utils.make_tolerance(
+            bounds=(0, 0.005), sigmoid="long_tail"
+        )(obj_to_target, episode_consts["obj_to_target_init"])
+
+        reward = 5 * reward_utils.hamacher_product(tcp_closed, near_button)
+        reward = np.where(tcp_to_obj <= 0.03, reward + 5 * button_pressed, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.024).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.05).astype(np.float64),
+            "grasp_success": (obs[:, 3] > 0).astype(np.float64),
+            "grasp_reward": near_button,
+            "in_place_reward": button_pressed,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -5,15 +5,18 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerCoffeePullEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -100,14 +103,13 @@ class SawyerCoffeePullEnvV3(SawyerXYZEnv):
         return [("mug_goal", self._target_pos)]
 
     def _get_id_main_object(self) -> int:
-        return self.data.geom("mug").id
+        return self._ids.geom["mug"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("mug").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["mug"]])
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.flatten()
@@ -120,8 +122,6 @@ class SawyerCoffeePullEnvV3(SawyerXYZEnv):
         self._reset_hand()
 
         pos_mug_init, pos_mug_goal = np.split(self._get_state_rand_vec(), 2)
-        while np.linalg.norm(pos_mug_init[:2] - pos_mug_goal[:2]) < 0.15:
-            pos_mug_init, pos_mug_goal = np.split(self._get_state_rand_vec(), 2)
 
         self._set_obj_xyz(pos_mug_init)
         self.obj_init_pos = pos_mug_init
@@ -235,3 +235,67 @@ class SawyerCoffeePullEnvV3(SawyerXYZEnv):
                 0.0,
                 0.0,
             )
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        target = episode_consts["target_pos"]
+
+        # Emphasize X and Y errors
+        scale = np.array([2.0, 2.0, 1.0])
+        target_to_obj = np.linalg.norm((obj - target) * scale, axis=-1)
+        target_to_obj_init = np.linalg.norm(
+            (episode_consts["obj_init_pos"] - target) * scale, axis=-1
+        )
+        in_place = reward_utils.make_tolerance(bounds=(0, 0.05), sigmoid="long_tail")(
+            target_to_obj, target_to_obj_init
+        )
+        tcp_opened = obs[:, 3]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.04,
+            obj_radius=0.02,
+            pad_success_thresh=0.05,
+            xz_thresh=0.05,
+            desired_gripper_effort=0.7,
+            medium_density=True,
+        )
+
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+        reward = np.where(
+            (tcp_to_obj < 0.04) & (tcp_opened > 0),
+            reward + 1.0 + 5.0 * in_place,
+            reward,
+        )
+        reward = np.where(target_to_obj < 0.05, 10.0, reward)
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0) & (tcp_opened > 0)
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -88,7 +88,7 @@ class SawyerDialTurnEnvV3(SawyerXYZEnv):
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         dial_center = self.get_body_com("dial").copy()
-        dial_angle_rad = self.data.joint("knob_Joint_1").qpos
+        dial_angle_rad = self._get_joint_qpos("knob_Joint_1")
 
         offset = np.array(
             [np.sin(dial_angle_rad).item(), -np.cos(dial_angle_rad).item(), 0.0]
@@ -100,7 +100,7 @@ class SawyerDialTurnEnvV3(SawyerXYZEnv):
         return dial_center + offset
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("dial").xquat
+        return self.data.xquat[self._ids.body["dial"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -128,8 +128,8 @@ class SawyerDialTurnEnvV3(SawyerXYZEnv):
             self._target_pos is not None
         ), "`reset_model()` must be called before `compute_reward()`."
         if self.reward_function_version == "v2":
-            obj = self._get_pos_objects()
-            dial_push_position = self._get_pos_objects() + np.array([0.05, 0.02, 0.09])
+            obj = self._get_pos_objects_cached()
+            dial_push_position = self._get_pos_objects_cached() + np.array([0.05, 0.02, 0.09])
             tcp = self.tcp_center
             target = self._target_pos.copy()
 
@@ -205,3 +205,54 @@ class SawyerDialTurnEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return float(reward), 0.0, 0.0, float(pullDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "dial_push_position": np.array(self.dial_push_position, dtype=np.float64),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        dial_push_position = obj + np.array([0.05, 0.02, 0.09])
+        init_dial_push_position = episode_consts["dial_push_position"]
+        target = episode_consts["target_pos"]
+
+        target_to_obj = np.linalg.norm(obj - target, axis=-1)
+        target_to_obj_init = np.linalg.norm(init_dial_push_position - target, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, np.abs(target_to_obj_init - cls.TARGET_RADIUS))
+
+        dial_reach_radius = 0.005
+        tcp_to_obj = np.linalg.norm(
+            dial_push_position - features["tcp_center"], axis=-1
+        )
+        tcp_to_obj_init = np.linalg.norm(
+            init_dial_push_position - episode_consts["init_tcp"], axis=-1
+        )
+        reach = reward_utils.make_tolerance(
+            bounds=(0, dial_reach_radius), sigmoid="gaussian"
+        )(tcp_to_obj, np.abs(tcp_to_obj_init - dial_reach_radius))
+        gripper_closed = np.clip(action[:, -1], 0, 1)
+        object_grasped = reward_utils.hamacher_product(reach, gripper_closed)
+
+        reward = 10 * reward_utils.hamacher_product(object_grasped, in_place)
+
+        info = {
+            "success": (target_to_obj <= cls.TARGET_RADIUS).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.01).astype(np.float64),
+            "grasp_success": np.ones(len(obs)),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
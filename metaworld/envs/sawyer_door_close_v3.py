@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+from functools import cached_property
 from typing import Any
 
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
 
 
 class SawyerDoorCloseEnvV3(SawyerXYZEnv):
@@ -53,26 +54,31 @@ class SawyerDoorCloseEnvV3(SawyerXYZEnv):
         self.obj_init_angle = self.init_config["obj_init_angle"]
         self.hand_init_pos = self.init_config["hand_init_pos"]
 
-        self.door_qpos_adr = self.model.joint("doorjoint").qposadr.item()
-        self.door_qvel_adr = self.model.joint("doorjoint").dofadr.item()
-
         self.goal_space = Box(np.array(goal_low), np.array(goal_high), dtype=np.float64)
 
         self._random_reset_space = Box(
             np.array(obj_low), np.array(obj_high), dtype=np.float64
         )
 
+    # Looked up lazily, so that `__init__()` does not need the model to declare
+    # the task's spaces, see `SawyerXYZEnv.random_reset_space()`.
+    @cached_property
+    def door_qpos_adr(self) -> int:
+        return self.model.joint("doorjoint").qposadr.item()
+
+    @cached_property
+    def door_qvel_adr(self) -> int:
+        return self.model.joint("doorjoint").dofadr.item()
+
     @property
     def model_name(self) -> str:
         return full_V3_path_for("sawyer_xyz/sawyer_door_pull.xml") if self._model_name is None else self._model_name
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.geom("handle").xpos.copy()
+        return self.data.geom_xpos[self._ids.geom["handle"]].copy()
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return Rotation.from_matrix(
-            self.data.geom("handle").xmat.reshape(3, 3)
-        ).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["handle"]])
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.copy()
@@ -83,7 +89,7 @@ class SawyerDoorCloseEnvV3(SawyerXYZEnv):
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
-        self.objHeight = self.data.geom("handle").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["handle"]][2]
         obj_pos = self._get_state_rand_vec()
         self.obj_init_pos = obj_pos
         goal_pos = obj_pos.copy() + np.array([0.2, -0.2, 0.0])
@@ -98,7 +104,7 @@ class SawyerDoorCloseEnvV3(SawyerXYZEnv):
 
         assert self._target_pos is not None
         self.maxPullDist = np.linalg.norm(
-            self.data.geom("handle").xpos[:-1] - self._target_pos[:-1]
+            self.data.geom_xpos[self._ids.geom["handle"]][:-1] - self._target_pos[:-1]
         )
 
         return self._get_obs()
@@ -190,3 +196,46 @@ class SawyerDoorCloseEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return float(reward), float(pullDist), 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        obj = obs[:, 4:7]
+        target = episode_consts["target_pos"]
+
+        tcp_to_target = np.linalg.norm(features["tcp_center"] - target, axis=-1)
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+
+        in_place_margin = np.linalg.norm(
+            episode_consts["obj_init_pos"] - target, axis=-1
+        )
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="gaussian"
+        )(obj_to_target, in_place_margin)
+
+        hand_margin = (
+            np.linalg.norm(episode_consts["hand_init_pos"] - obj, axis=-1) + 0.1
+        )
+        hand_in_place = reward_utils.make_tolerance(
+            bounds=(0, 0.25 * _TARGET_RADIUS), sigmoid="gaussian"
+        )(tcp_to_target, hand_margin)
+
+        reward = 3 * hand_in_place + 6 * in_place
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "obj_to_target": obj_to_target,
+            "in_place_reward": hand_in_place,
+            "success": (obj_to_target <= 0.08).astype(np.float64),
+            "near_object": np.zeros(len(obs)),
+            "grasp_success": np.ones(len(obs)),
+            "grasp_reward": np.ones(len(obs)),
+            "unscaled_reward": reward,
+        }
+        return reward, info
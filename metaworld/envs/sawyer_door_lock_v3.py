@@ -9,7 +9,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -105,7 +105,7 @@ class SawyerDoorLockEnvV3(SawyerXYZEnv):
         return self._get_site_pos("lockStartLock")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("door_link").xquat
+        return self.data.xquat[self._ids.body["door_link"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -114,7 +114,7 @@ class SawyerDoorLockEnvV3(SawyerXYZEnv):
 
         for _ in range(self.frame_skip):
             mujoco.mj_step(self.model, self.data)
-        self.obj_init_pos = self.data.body("lock_link").xpos
+        self.obj_init_pos = self.data.xpos[self._ids.body["lock_link"]]
         self._target_pos = self.obj_init_pos + np.array([0.0, -0.04, -0.1])
 
         assert self._target_pos is not None and self.obj_init_pos is not None
@@ -193,3 +193,50 @@ class SawyerDoorLockEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return float(reward), 0.0, 0.0, float(pullDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "lock_length": np.array(self._lock_length),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        del action
+        obj = obs[:, 4:7]
+        tcp = features["left_pad"]
+
+        scale = np.array([0.25, 1.0, 0.5])
+        tcp_to_obj = np.linalg.norm((obj - tcp) * scale, axis=-1)
+        # `init_left_pad` tracks the current position of the left pad.
+        tcp_to_obj_init = tcp_to_obj
+
+        obj_to_target = np.abs(episode_consts["target_pos"][:, 2] - obj[:, 2])
+
+        tcp_opened = np.maximum(obs[:, 3], 0.0)
+        near_lock = reward_utils.make_tolerance(bounds=(0, 0.01), sigmoid="long_tail")(
+            tcp_to_obj, tcp_to_obj_init
+        )
+        lock_pressed = reward_utils.make_tolerance(
+            bounds=(0, 0.005), sigmoid="long_tail"
+        )(obj_to_target, episode_consts["lock_length"])
+
+        reward = 2 * reward_utils.hamacher_product(tcp_opened, near_lock)
+        reward = reward + 8 * lock_pressed
+
+        info = {
+            "success": (obj_to_target <= 0.02).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.05).astype(np.float64),
+            "grasp_success": (obs[:, 3] > 0).astype(np.float64),
+            "grasp_reward": near_lock,
+            "in_place_reward": lock_pressed,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
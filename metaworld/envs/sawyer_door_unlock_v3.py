@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -103,7 +103,7 @@ class SawyerDoorUnlockEnvV3(SawyerXYZEnv):
         return self._get_site_pos("lockStartUnlock")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("door_link").xquat
+        return self.data.xquat[self._ids.body["door_link"]]
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.flat.copy()
@@ -117,7 +117,7 @@ class SawyerDoorUnlockEnvV3(SawyerXYZEnv):
         self.model.body("door").pos = self._get_state_rand_vec()
         self._set_obj_xyz(np.array(1.5708))
 
-        self.obj_init_pos = self.data.body("lock_link").xpos
+        self.obj_init_pos = self.data.xpos[self._ids.body["lock_link"]]
         self._target_pos = self.obj_init_pos + np.array([0.1, -0.04, 0.0])
 
         assert self._target_pos is not None and self.obj_init_pos is not None
@@ -204,3 +204,53 @@ class SawyerDoorUnlockEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return float(reward), 0.0, 0.0, float(pullDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "lock_length": np.array(self._lock_length),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        del action, features
+        gripper = obs[:, :3]
+        lock = obs[:, 4:7]
+
+        # Add offset to track gripper's shoulder, rather than fingers
+        offset = np.array([0.0, 0.055, 0.07])
+
+        scale = np.array([0.25, 1.0, 0.5])
+        shoulder_to_lock = np.linalg.norm((gripper + offset - lock) * scale, axis=-1)
+        shoulder_to_lock_init = np.linalg.norm(
+            (episode_consts["init_tcp"] + offset - episode_consts["obj_init_pos"])
+            * scale,
+            axis=-1,
+        )
+        ready_to_push = reward_utils.make_tolerance(
+            bounds=(0, 0.02), sigmoid="long_tail"
+        )(shoulder_to_lock, shoulder_to_lock_init)
+
+        obj_to_target = np.abs(episode_consts["target_pos"][:, 0] - lock[:, 0])
+        pushed = reward_utils.make_tolerance(bounds=(0, 0.005), sigmoid="long_tail")(
+            obj_to_target, episode_consts["lock_length"]
+        )
+
+        reward = 2 * ready_to_push + 8 * pushed
+
+        info = {
+            "success": (obj_to_target <= 0.02).astype(np.float64),
+            "near_object": (shoulder_to_lock <= 0.05).astype(np.float64),
+            "grasp_success": (obs[:, 3] > 0).astype(np.float64),
+            "grasp_reward": ready_to_push,
+            "in_place_reward": pushed,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
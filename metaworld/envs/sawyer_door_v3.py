@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+from functools import cached_property
 from typing import Any
 
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
 
 
 class SawyerDoorEnvV3(SawyerXYZEnv):
@@ -54,14 +55,21 @@ class SawyerDoorEnvV3(SawyerXYZEnv):
         self.obj_init_angle = self.init_config["obj_init_angle"]
         self.hand_init_pos = self.init_config["hand_init_pos"]
 
-        self.door_qpos_adr = self.model.joint("doorjoint").qposadr.item()
-        self.door_qvel_adr = self.model.joint("doorjoint").dofadr.item()
-
         self._random_reset_space = Box(
             np.array(obj_low), np.array(obj_high), dtype=np.float64
         )
         self.goal_space = Box(np.array(goal_low), np.array(goal_high), dtype=np.float64)
 
+    # Looked up lazily, so that `__init__()` does not need the model to declare
+    # the task's spaces, see `SawyerXYZEnv.random_reset_space()`.
+    @cached_property
+    def door_qpos_adr(self) -> int:
+        return self.model.joint("doorjoint").qposadr.item()
+
+    @cached_property
+    def door_qvel_adr(self) -> int:
+        return self.model.joint("doorjoint").dofadr.item()
+
     @property
     def model_name(self) -> str:
         return full_V3_path_for("sawyer_xyz/sawyer_door_pull.xml") if self._model_name is None else self._model_name
@@ -97,12 +105,10 @@ class SawyerDoorEnvV3(SawyerXYZEnv):
         return []
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.geom("handle").xpos.copy()
+        return self.data.geom_xpos[self._ids.geom["handle"]].copy()
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return Rotation.from_matrix(
-            self.data.geom("handle").xmat.reshape(3, 3)
-        ).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["handle"]])
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.copy()
@@ -113,7 +119,7 @@ class SawyerDoorEnvV3(SawyerXYZEnv):
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
-        self.objHeight = self.data.geom("handle").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["handle"]][2]
 
         self.obj_init_pos = self._get_state_rand_vec()
         self._target_pos = self.obj_init_pos + np.array([-0.3, -0.45, 0.0])
@@ -123,7 +129,7 @@ class SawyerDoorEnvV3(SawyerXYZEnv):
         self._set_obj_xyz(np.array(0))
         assert self._target_pos is not None
         self.maxPullDist = np.linalg.norm(
-            self.data.geom("handle").xpos[:-1] - self._target_pos[:-1]
+            self.data.geom_xpos[self._ids.geom["handle"]][:-1] - self._target_pos[:-1]
         )
         self.target_reward = 1000 * self.maxPullDist + 1000 * 2
         self.model.site("goal").pos = self._target_pos
@@ -186,7 +192,7 @@ class SawyerDoorEnvV3(SawyerXYZEnv):
             self._target_pos is not None
         ), "`reset_model()` must be called before `compute_reward()`."
         if self.reward_function_version == "v2":
-            theta = float(self.data.joint("doorjoint").qpos.item())
+            theta = float(self._get_joint_qpos("doorjoint"))
 
             reward_grab = SawyerDoorEnvV3._reward_grab_effort(actions)
             reward_steps = SawyerDoorEnvV3._reward_pos(obs, theta)
@@ -237,3 +243,65 @@ class SawyerDoorEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return reward, 0.0, 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "door_angle": np.array(self._get_joint_qpos("doorjoint")),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        hand = obs[:, :3]
+        door = obs[:, 4:7] + np.array([-0.05, 0, 0])
+        theta = features["door_angle"]
+
+        reward_grab = (np.clip(action[:, 3], -1, 1) + 1.0) / 2.0
+
+        threshold = 0.12
+        # floor is a 3D funnel centered on the door handle
+        radius = np.linalg.norm(hand[:, :2] - door[:, :2], axis=-1)
+        in_funnel = radius > threshold
+        floor = np.where(
+            in_funnel,
+            0.04 * np.log(np.where(in_funnel, radius - threshold, 1.0)) + 0.4,
+            0.0,
+        )
+        # The margin is only used below the floor, where it is positive.
+        above_floor = np.where(
+            hand[:, 2] >= floor,
+            1.0,
+            reward_utils.make_tolerance(bounds=(0.0, 0.01), sigmoid="long_tail")(
+                floor - hand[:, 2], np.abs(floor) / 2.0
+            ),
+        )
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, threshold / 2.0), sigmoid="long_tail"
+        )(np.linalg.norm(hand - door - np.array([0.05, 0.03, -0.01]), axis=-1), 0.5)
+        ready_to_open = reward_utils.hamacher_product(above_floor, in_place)
+
+        opened = 0.2 * (theta < -np.pi / 90.0) + 0.8 * reward_utils.make_tolerance(
+            bounds=(0, 0.5), sigmoid="long_tail"
+        )(np.pi / 2.0 + np.pi / 6 + theta, np.pi / 3.0)
+
+        reward = 2.0 * reward_utils.hamacher_product(ready_to_open, reward_grab)
+        reward = reward + 8.0 * opened
+        success = np.abs(obs[:, 4] - episode_consts["target_pos"][:, 0]) <= 0.08
+        reward = np.where(success, 10.0, reward)
+
+        info = {
+            "success": success.astype(np.float64),
+            "near_object": ready_to_open,
+            "grasp_success": (reward_grab >= 0.5).astype(np.float64),
+            "grasp_reward": reward_grab,
+            "in_place_reward": opened,
+            "obj_to_target": np.zeros(len(obs)),
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -200,3 +200,47 @@ class SawyerDrawerCloseEnvV3(SawyerXYZEnv):
             reward = -reachDist + pullRew
 
             return reward, 0.0, 0.0, pullDist, 0.0, 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target = episode_consts["target_pos"]
+
+        target_to_obj = np.linalg.norm(obj - target, axis=-1)
+        target_to_obj_init = np.linalg.norm(obj_init_pos - target, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, np.abs(target_to_obj_init - cls.TARGET_RADIUS))
+
+        handle_reach_radius = 0.005
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        tcp_to_obj_init = np.linalg.norm(
+            obj_init_pos - episode_consts["init_tcp"], axis=-1
+        )
+        reach = reward_utils.make_tolerance(
+            bounds=(0, handle_reach_radius), sigmoid="gaussian"
+        )(tcp_to_obj, np.abs(tcp_to_obj_init - handle_reach_radius))
+        gripper_closed = np.clip(action[:, -1], 0, 1)
+        object_grasped = reward_utils.hamacher_product(reach, gripper_closed)
+
+        closed = target_to_obj <= cls.TARGET_RADIUS + 0.015
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+        reward = 10 * np.where(closed, 1.0, reward)
+
+        info = {
+            "success": closed.astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.01).astype(np.float64),
+            "grasp_success": np.ones(len(obs)),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
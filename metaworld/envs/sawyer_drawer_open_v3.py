@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -90,13 +90,13 @@ class SawyerDrawerOpenEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("objGeom")
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("drawer_link") + np.array([0.0, -0.16, 0.0])
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("drawer_link").xquat
+        return self.data.xquat[self._ids.body["drawer_link"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -188,3 +188,52 @@ class SawyerDrawerOpenEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return reward, 0.0, 0.0, pullDist, 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {**super().episode_constants(), "max_dist": np.array(self.maxDist)}
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        gripper = obs[:, :3]
+        handle = obs[:, 4:7]
+        target_pos = episode_consts["target_pos"]
+        max_dist = episode_consts["max_dist"]
+
+        handle_error = np.linalg.norm(handle - target_pos, axis=-1)
+        reward_for_opening = reward_utils.make_tolerance(
+            bounds=(0, 0.02), sigmoid="long_tail"
+        )(handle_error, max_dist)
+
+        handle_pos_init = target_pos.copy()
+        handle_pos_init[:, 1] += max_dist
+        # Emphasize XY error so that gripper is able to drop down and cage
+        # handle without running into it.
+        scale = np.array([3.0, 3.0, 1.0])
+        gripper_error = np.linalg.norm((handle - gripper) * scale, axis=-1)
+        gripper_error_init = np.linalg.norm(
+            (handle_pos_init - episode_consts["init_tcp"]) * scale, axis=-1
+        )
+        reward_for_caging = reward_utils.make_tolerance(
+            bounds=(0, 0.01), sigmoid="long_tail"
+        )(gripper_error, gripper_error_init)
+
+        reward = (reward_for_caging + reward_for_opening) * 5.0
+
+        info = {
+            "success": (handle_error <= 0.03).astype(np.float64),
+            "near_object": (np.linalg.norm(handle - gripper, axis=-1) <= 0.03).astype(
+                np.float64
+            ),
+            "grasp_success": (obs[:, 3] > 0).astype(np.float64),
+            "grasp_reward": reward_for_caging,
+            "in_place_reward": reward_for_opening,
+            "obj_to_target": handle_error,
+            "unscaled_reward": reward,
+        }
+        return reward, info
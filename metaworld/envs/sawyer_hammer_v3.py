@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import HammerInitConfigDict
+from metaworld.types import HammerInitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -88,7 +88,7 @@ class SawyerHammerEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("HammerHandle")
+        return self._ids.geom["HammerHandle"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return np.hstack(
@@ -97,7 +97,10 @@ class SawyerHammerEnvV3(SawyerXYZEnv):
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
         return np.hstack(
-            (self.data.body("hammer").xquat, self.data.body("nail_link").xquat)
+            (
+                self.data.xquat[self._ids.body["hammer"]],
+                self.data.xquat[self._ids.body["nail_link"]],
+            )
         )
 
     def _set_hammer_xyz(self, pos: npt.NDArray[Any]) -> None:
@@ -203,7 +206,7 @@ class SawyerHammerEnvV3(SawyerXYZEnv):
             reward = (2.0 * reward_grab + 6.0 * reward_in_place) * reward_quat
             # Override reward on success. We check that reward is above a threshold
             # because this env's success metric could be hacked easily
-            success = bool(self.data.joint("NailSlideJoint").qpos > 0.09)
+            success = bool(self._get_joint_qpos("NailSlideJoint") > 0.09)
             if success and reward > 5.0:
                 reward = 10.0
 
@@ -216,8 +219,8 @@ class SawyerHammerEnvV3(SawyerXYZEnv):
             )
         else:
             hammerPos = obs[4:7]
-            hammerHeadPos = self.data.geom("HammerHead").xpos.copy()
-            objPos = self.data.site("nailHead").xpos
+            hammerHeadPos = self.data.geom_xpos[self._ids.geom["HammerHead"]].copy()
+            objPos = self.data.site_xpos[self._ids.site["nailHead"]]
 
             rightFinger, leftFinger = self._get_site_pos(
                 "rightEndEffector"
@@ -282,5 +285,66 @@ class SawyerHammerEnvV3(SawyerXYZEnv):
                 0.0,
                 0.0,
                 0.0,
-                bool(self.data.joint("NailSlideJoint").qpos > 0.09),
+                bool(self._get_joint_qpos("NailSlideJoint") > 0.09),
+            )
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "nail_depth": np.array(self._get_joint_qpos("NailSlideJoint")),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        hand = obs[:, :3]
+        hammer = obs[:, 4:7]
+        hammer_head = hammer + np.array([0.16, 0.06, 0.0])
+
+        hammer_threshed = hammer.copy()
+        threshold = cls.HAMMER_HANDLE_LENGTH / 2.0
+        near_handle = np.abs(hammer[:, 0] - hand[:, 0]) < threshold
+        hammer_threshed[:, 0] = np.where(near_handle, hand[:, 0], hammer[:, 0])
+
+        ideal = np.array([1.0, 0.0, 0.0, 0.0])
+        error = np.linalg.norm(obs[:, 7:11] - ideal, axis=-1)
+        reward_quat = np.maximum(1.0 - error / 0.4, 0.0)
+
+        reward_grab = cls._gripper_caging_reward_batch(
+            action,
+            hammer_threshed,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.015,
+            pad_success_thresh=0.02,
+            xz_thresh=0.01,
+            high_density=True,
+        )
+        pos_error = episode_consts["target_pos"] - hammer_head
+        reward_in_place = 0.1 * (hammer_head[:, 2] > 0.02) + 0.9 * (
+            reward_utils.make_tolerance(bounds=(0, 0.02), sigmoid="long_tail")(
+                np.linalg.norm(pos_error, axis=-1), 0.2
             )
+        )
+
+        reward = (2.0 * reward_grab + 6.0 * reward_in_place) * reward_quat
+        # Only override on success above a threshold, see `compute_reward()`.
+        success = features["nail_depth"] > 0.09
+        reward = np.where(success & (reward > 5.0), 10.0, reward)
+
+        info = {
+            "success": success.astype(np.float64),
+            "near_object": reward_quat,
+            "grasp_success": (reward_grab >= 0.5).astype(np.float64),
+            "grasp_reward": reward_grab,
+            "in_place_reward": reward_in_place,
+            "obj_to_target": np.zeros(len(obs)),
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -8,11 +8,13 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerHandInsertEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
     TARGET_RADIUS: float = 0.05
 
     def __init__(
@@ -99,13 +101,13 @@ class SawyerHandInsertEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom("objGeom").id
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("obj").xquat
+        return self.data.xquat[self._ids.body["obj"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -114,8 +116,6 @@ class SawyerHandInsertEnvV3(SawyerXYZEnv):
         self.objHeight = self.get_body_com("obj")[2]
 
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - goal_pos[-3:-1]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
         assert self.obj_init_pos is not None
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
         self._target_pos = goal_pos[-3:]
@@ -210,3 +210,64 @@ class SawyerHandInsertEnvV3(SawyerXYZEnv):
                 0.0,
                 0.0,
             )
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target_pos = episode_consts["target_pos"]
+
+        target_to_obj = np.linalg.norm(obj - target_pos, axis=-1)
+        target_to_obj_init = np.linalg.norm(obj_init_pos - target_pos, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, target_to_obj_init)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.015,
+            pad_success_thresh=0.05,
+            xz_thresh=0.005,
+            high_density=True,
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+
+        tcp_opened = obs[:, 3]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        reward = np.where(
+            (tcp_to_obj < 0.02) & (tcp_opened > 0),
+            reward + 1.0 + 7.0 * in_place,
+            reward,
+        )
+        reward = np.where(target_to_obj < cls.TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (target_to_obj <= 0.05).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -113,7 +113,7 @@ class SawyerHandlePressEnvV3(SawyerXYZEnv):
         self._set_obj_xyz(np.array(-0.001))
         self._target_pos = self._get_site_pos("goalPress")
         self.maxDist = np.abs(
-            self.data.site("handleStart").xpos[-1] - self._target_pos[-1]
+            self.data.site_xpos[self._ids.site["handleStart"]][-1] - self._target_pos[-1]
         )
         self.target_reward = 1000 * self.maxDist + 1000 * 2
         self._handle_init_pos = self._get_pos_objects()
@@ -128,7 +128,7 @@ class SawyerHandlePressEnvV3(SawyerXYZEnv):
         ), "`reset_model()` must be called before `compute_reward()`."
         if self.reward_function_version == "v2":
             del actions
-            obj = self._get_pos_objects()
+            obj = self._get_pos_objects_cached()
             tcp = self.tcp_center
             target = self._target_pos.copy()
 
@@ -193,3 +193,52 @@ class SawyerHandlePressEnvV3(SawyerXYZEnv):
             reward = -reachDist + pressRew
 
             return float(reward), 0.0, 0.0, float(pressDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "handle_init_pos": np.array(self._handle_init_pos, dtype=np.float64),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        del action
+        obj = obs[:, 4:7]
+        handle_init_pos = episode_consts["handle_init_pos"]
+        target = episode_consts["target_pos"]
+
+        target_to_obj = np.abs(obj[:, 2] - target[:, 2])
+        target_to_obj_init = np.abs(handle_init_pos[:, 2] - target[:, 2])
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, np.abs(target_to_obj_init - cls.TARGET_RADIUS))
+
+        handle_radius = 0.02
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        tcp_to_obj_init = np.linalg.norm(
+            handle_init_pos - episode_consts["init_tcp"], axis=-1
+        )
+        reach = reward_utils.make_tolerance(
+            bounds=(0, handle_radius), sigmoid="long_tail"
+        )(tcp_to_obj, np.abs(tcp_to_obj_init - handle_radius))
+
+        pressed = target_to_obj <= cls.TARGET_RADIUS
+        reward = reward_utils.hamacher_product(reach, in_place)
+        reward = 10 * np.where(pressed, 1.0, reward)
+
+        info = {
+            "success": pressed.astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.05).astype(np.float64),
+            "grasp_success": np.ones(len(obs)),
+            "grasp_reward": reach,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
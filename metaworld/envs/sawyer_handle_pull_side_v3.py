@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -116,7 +116,7 @@ class SawyerHandlePullSideEnvV3(SawyerXYZEnv):
         self._set_obj_xyz(np.array(-0.1))
         self._target_pos = self._get_site_pos("goalPull")
         self.maxDist = np.abs(
-            self.data.site("handleStart").xpos[-1] - self._target_pos[-1]
+            self.data.site_xpos[self._ids.site["handleStart"]][-1] - self._target_pos[-1]
         )
         self.target_reward = 1000 * self.maxDist + 1000 * 2
         self.obj_init_pos = self._get_pos_objects()
@@ -205,3 +205,57 @@ class SawyerHandlePullSideEnvV3(SawyerXYZEnv):
             reward = -reachDist + pressRew
 
             return float(reward), 0.0, 0.0, float(pressDist), 0.0, 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target = episode_consts["target_pos"]
+
+        target_to_obj = np.linalg.norm(obj - target, axis=-1)
+        target_to_obj_init = np.linalg.norm(obj_init_pos - target, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, target_to_obj_init)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            pad_success_thresh=0.06,
+            obj_radius=0.032,
+            object_reach_radius=0.01,
+            xz_thresh=0.01,
+            high_density=True,
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+
+        tcp_opened = obs[:, 3]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        lifted = (
+            (tcp_to_obj < 0.035)
+            & (tcp_opened > 0)
+            & (obj[:, 2] - 0.01 > obj_init_pos[:, 2])
+        )
+        reward = np.where(lifted, reward + 1.0 + 5.0 * in_place, reward)
+        reward = np.where(target_to_obj < cls.TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (target_to_obj <= 0.08).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.05).astype(np.float64),
+            "grasp_success": (
+                (tcp_opened > 0) & (obj[:, 2] - 0.03 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
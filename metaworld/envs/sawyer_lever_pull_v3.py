@@ -6,12 +6,12 @@ import mujoco
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
 
 
 class SawyerLeverPullEnvV3(SawyerXYZEnv):
@@ -103,14 +103,13 @@ class SawyerLeverPullEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("objGeom")
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self._get_site_pos("leverStart")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("objGeom").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -164,7 +163,7 @@ class SawyerLeverPullEnvV3(SawyerXYZEnv):
             # The skill of the agent should be measured by its ability to get the
             # lever to point straight upward. This means we'll be measuring the
             # current angle of the lever's joint, and comparing with 90deg.
-            lever_angle = float(-self.data.joint("LeverAxis").qpos.item())
+            lever_angle = float(-self._get_joint_qpos("LeverAxis"))
             lever_angle_desired = np.pi / 2.0
 
             lever_error = abs(lever_angle - lever_angle_desired)
@@ -232,3 +231,68 @@ class SawyerLeverPullEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return (reward, 0.0, 0.0, float(pullDist), 0.0)
+
+    def episode_constants(self) -> RewardInputs:
+        assert self._lever_pos_init is not None
+        return {
+            **super().episode_constants(),
+            "lever_pos_init": np.array(self._lever_pos_init, dtype=np.float64),
+        }
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "lever_angle": np.array(-self._get_joint_qpos("LeverAxis")),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        del action
+        gripper = obs[:, :3]
+        lever = obs[:, 4:7]
+        lever_pos_init = episode_consts["lever_pos_init"]
+        target = episode_consts["target_pos"]
+
+        # De-emphasize y error so that we get Sawyer's shoulder underneath the
+        # lever prior to bumping on against
+        scale = np.array([4.0, 1.0, 4.0])
+        # Offset so that we get the Sawyer's shoulder underneath the lever,
+        # rather than its fingers
+        offset = np.array([0.0, 0.055, 0.07])
+        shoulder_to_lever = np.linalg.norm((gripper + offset - lever) * scale, axis=-1)
+        shoulder_to_lever_init = np.linalg.norm(
+            (episode_consts["init_tcp"] + offset - lever_pos_init) * scale, axis=-1
+        )
+        ready_to_lift = reward_utils.make_tolerance(
+            bounds=(0, 0.02), sigmoid="long_tail"
+        )(shoulder_to_lever, shoulder_to_lever_init)
+
+        lever_error = np.abs(features["lever_angle"] - np.pi / 2.0)
+        lever_engagement = reward_utils.make_tolerance(
+            bounds=(0, np.pi / 48.0), sigmoid="long_tail"
+        )(lever_error, (np.pi / 2.0) - (np.pi / 12.0))
+
+        obj_to_target = np.linalg.norm(lever - target, axis=-1)
+        in_place_margin = np.linalg.norm(lever_pos_init - target, axis=-1)
+        in_place = reward_utils.make_tolerance(bounds=(0, 0.04), sigmoid="long_tail")(
+            obj_to_target, in_place_margin
+        )
+
+        reward = 10.0 * reward_utils.hamacher_product(ready_to_lift, in_place)
+
+        info = {
+            "success": (lever_error <= np.pi / 24).astype(np.float64),
+            "near_object": (shoulder_to_lever < 0.03).astype(np.float64),
+            "grasp_success": (ready_to_lift > 0.9).astype(np.float64),
+            "grasp_reward": ready_to_lift,
+            "in_place_reward": lever_engagement,
+            "obj_to_target": shoulder_to_lever,
+            "unscaled_reward": reward,
+        }
+        return reward, info
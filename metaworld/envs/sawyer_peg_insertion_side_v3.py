@@ -5,15 +5,17 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerPegInsertionSideEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.1),)
     TARGET_RADIUS: float = 0.07
     """
     Motivation for V3:
@@ -133,14 +135,11 @@ class SawyerPegInsertionSideEnvV3(SawyerXYZEnv):
         return self._get_site_pos("pegGrasp")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.site("pegGrasp").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.site_xmat[self._ids.site["pegGrasp"]])
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
         pos_peg, pos_box = np.split(self._get_state_rand_vec(), 2)
-        while np.linalg.norm(pos_peg[:2] - pos_box[:2]) < 0.1:
-            pos_peg, pos_box = np.split(self._get_state_rand_vec(), 2)
         self.obj_init_pos = pos_peg
         self.peg_head_pos_init = self._get_site_pos("pegHead")
         self._set_obj_xyz(self.obj_init_pos)
@@ -330,3 +329,90 @@ class SawyerPegInsertionSideEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + placeRew
 
             return float(reward), 0.0, 0.0, float(placingDist), 0.0, 0.0, 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "peg_head_pos_init": np.array(self.peg_head_pos_init, dtype=np.float64),
+        }
+
+    def reward_features(self) -> RewardInputs:
+        features = {
+            **super().reward_features(),
+            "peg_head": self._get_site_pos("pegHead"),
+        }
+        for box in (1, 2):
+            for corner in ("bottom_right", "top_left"):
+                site = f"{corner}_corner_collision_box_{box}"
+                features[site] = self._get_site_pos(site)
+        return features
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        obj_head = features["peg_head"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        scale = np.array([1.0, 2.0, 2.0])
+        #  force agent to pick up object then insert
+        obj_to_target = np.linalg.norm((obj_head - target) * scale, axis=-1)
+        in_place_margin = np.linalg.norm(
+            (episode_consts["peg_head_pos_init"] - target) * scale, axis=-1
+        )
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(obj_to_target, in_place_margin)
+
+        collision_box_bottom_1 = reward_utils.rect_prism_tolerance(
+            curr=obj_head,
+            one=features["top_left_corner_collision_box_1"],
+            zero=features["bottom_right_corner_collision_box_1"],
+        )
+        collision_box_bottom_2 = reward_utils.rect_prism_tolerance(
+            curr=obj_head,
+            one=features["top_left_corner_collision_box_2"],
+            zero=features["bottom_right_corner_collision_box_2"],
+        )
+        collision_boxes = reward_utils.hamacher_product(
+            collision_box_bottom_2, collision_box_bottom_1
+        )
+        in_place = reward_utils.hamacher_product(in_place, collision_boxes)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.0075,
+            pad_success_thresh=0.03,
+            xz_thresh=0.005,
+            high_density=True,
+        )
+        lifted = obj[:, 2] - 0.01 > obj_init_pos[:, 2]
+        grasped = (tcp_to_obj < 0.08) & (tcp_opened > 0) & lifted
+        object_grasped = np.where(grasped, 1.0, object_grasped)
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+        reward = np.where(grasped, reward + 1.0 + 5 * in_place, reward)
+        reward = np.where(obj_to_target <= 0.07, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": ((tcp_to_obj < 0.02) & (tcp_opened > 0) & lifted).astype(
+                np.float64
+            ),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -93,7 +93,7 @@ class SawyerPegUnplugSideEnvV3(SawyerXYZEnv):
         return self._get_site_pos("pegEnd")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("plug1").xquat
+        return self.data.xquat[self._ids.body["plug1"]]
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.flat.copy()
@@ -220,3 +220,54 @@ class SawyerPegUnplugSideEnvV3(SawyerXYZEnv):
             reward = reachRew + placeRew
 
             return float(reward), 0.0, 0.0, float(placingDist), 0.0, 0.0, 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.025,
+            pad_success_thresh=0.05,
+            xz_thresh=0.005,
+            desired_gripper_effort=0.8,
+            high_density=True,
+        )
+        in_place_margin = np.linalg.norm(obj_init_pos - target, axis=-1)
+        in_place = reward_utils.make_tolerance(bounds=(0, 0.05), sigmoid="long_tail")(
+            obj_to_target, in_place_margin
+        )
+        grasp_success = (tcp_opened > 0.5) & (obj[:, 0] - obj_init_pos[:, 0] > 0.015)
+
+        reward = np.where(
+            grasp_success & (tcp_to_obj < 0.035),
+            1 + 2 * object_grasped + 5 * in_place,
+            2 * object_grasped,
+        )
+        reward = np.where(obj_to_target <= 0.05, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": grasp_success.astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
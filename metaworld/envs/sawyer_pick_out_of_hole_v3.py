@@ -8,11 +8,13 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerPickOutOfHoleEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
     _TARGET_RADIUS: float = 0.02
 
     def __init__(
@@ -102,20 +104,18 @@ class SawyerPickOutOfHoleEnvV3(SawyerXYZEnv):
         return _site_config
 
     def _get_id_main_object(self) -> int:
-        return self.model.geom_name2id("objGeom")
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return self.data.body("obj").xquat
+        return self.data.xquat[self._ids.body["obj"]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
 
         pos_obj, pos_goal = np.split(self._get_state_rand_vec(), 2)
-        while np.linalg.norm(pos_obj[:2] - pos_goal[:2]) < 0.15:
-            pos_obj, pos_goal = np.split(self._get_state_rand_vec(), 2)
 
         self.obj_init_pos = pos_obj
         self._set_obj_xyz(self.obj_init_pos)
@@ -123,7 +123,7 @@ class SawyerPickOutOfHoleEnvV3(SawyerXYZEnv):
         self.model.site("goal").pos = self._target_pos
 
         self.liftThresh = 0.11
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
         self.maxPlacingDist = (
             np.linalg.norm(
@@ -270,3 +270,76 @@ class SawyerPickOutOfHoleEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + placeRew
 
             return float(reward), 0.0, 0.0, float(placingDist), 0.0, 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        gripper = features["tcp_center"]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target_pos = episode_consts["target_pos"]
+
+        obj_to_target = np.linalg.norm(obj - target_pos, axis=-1)
+        tcp_to_obj = np.linalg.norm(obj - gripper, axis=-1)
+        in_place_margin = np.linalg.norm(obj_init_pos - target_pos, axis=-1)
+
+        threshold = 0.03
+        # floor is a 3D funnel centered on the initial object pos
+        radius = np.linalg.norm(gripper[:, :2] - obj_init_pos[:, :2], axis=-1)
+        in_funnel = radius > threshold
+        floor = np.where(
+            in_funnel,
+            0.015 * np.log(np.where(in_funnel, radius - threshold, 1.0)) + 0.15,
+            0.0,
+        )
+        above_floor = np.where(
+            gripper[:, 2] >= floor,
+            1.0,
+            reward_utils.make_tolerance(bounds=(0.0, 0.01), sigmoid="long_tail")(
+                np.maximum(floor - gripper[:, 2], 0.0), 0.02
+            ),
+        )
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.015,
+            pad_success_thresh=0.02,
+            xz_thresh=0.03,
+            desired_gripper_effort=0.1,
+            high_density=True,
+        )
+        in_place = reward_utils.make_tolerance(bounds=(0, 0.02), sigmoid="long_tail")(
+            obj_to_target, in_place_margin
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+
+        near_object = tcp_to_obj < 0.04
+        pinched_without_obj = obs[:, 3] < 0.33
+        lifted = obj[:, 2] - 0.02 > obj_init_pos[:, 2]
+        grasp_success = near_object & lifted & ~pinched_without_obj
+        reward = np.where(
+            grasp_success,
+            reward + 1.0 + 5.0 * reward_utils.hamacher_product(in_place, above_floor),
+            reward,
+        )
+        reward = np.where(obj_to_target < cls.TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": grasp_success.astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
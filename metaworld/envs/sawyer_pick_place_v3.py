@@ -5,12 +5,13 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerPickPlaceEnvV3(SawyerXYZEnv):
@@ -28,6 +29,8 @@ class SawyerPickPlaceEnvV3(SawyerXYZEnv):
         - (6/15/20) Separated reach-push-pick-place into 3 separate envs.
     """
 
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -118,15 +121,13 @@ class SawyerPickPlaceEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_id_main_object(self) -> int:
-        return self.data.geom("objGeom").id
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return Rotation.from_matrix(
-            self.data.geom("objGeom").xmat.reshape(3, 3)
-        ).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def fix_extreme_obj_pos(self, orig_init_pos: npt.NDArray[Any]) -> npt.NDArray[Any]:
         # This is to account for meshes for the geom and object are not
@@ -148,9 +149,6 @@ class SawyerPickPlaceEnvV3(SawyerXYZEnv):
 
         goal_pos = self._get_state_rand_vec()
         self._target_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = goal_pos[3:]
         self._target_pos = goal_pos[-3:]
         self.obj_init_pos = goal_pos[:3]
         self.init_tcp = self.tcp_center
@@ -160,7 +158,7 @@ class SawyerPickPlaceEnvV3(SawyerXYZEnv):
         self._set_obj_xyz(self.obj_init_pos)
         self.model.site("goal").pos = self._target_pos
 
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + 0.04
 
         self.maxPlacingDist = (
@@ -365,3 +363,119 @@ class SawyerPickPlaceEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + placeRew
 
             return float(reward), 0.0, 0.0, float(placingDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def _gripper_caging_reward_batch(
+        cls,
+        action: npt.NDArray[np.float32],
+        obj_pos: npt.NDArray[Any],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+        obj_radius: float = 0,
+        pad_success_thresh: float = 0,
+        object_reach_radius: float = 0,
+        xz_thresh: float = 0,
+        desired_gripper_effort: float = 1.0,
+        high_density: bool = False,
+        medium_density: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        pad_success_margin = 0.05
+        x_z_success_margin = 0.005
+        obj_radius = 0.015
+        left_pad = features["left_pad"]
+        right_pad = features["right_pad"]
+        delta_object_y_left_pad = left_pad[:, 1] - obj_pos[:, 1]
+        delta_object_y_right_pad = obj_pos[:, 1] - right_pad[:, 1]
+        # `init_left_pad` and `init_right_pad` track the current pad positions.
+        right_caging_margin = np.abs(
+            np.abs(delta_object_y_right_pad) - pad_success_margin
+        )
+        left_caging_margin = np.abs(
+            np.abs(delta_object_y_left_pad) - pad_success_margin
+        )
+
+        pad_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, pad_success_margin), sigmoid="long_tail"
+        )
+        right_caging = pad_tolerance(delta_object_y_right_pad, right_caging_margin)
+        left_caging = pad_tolerance(delta_object_y_left_pad, left_caging_margin)
+        y_caging = reward_utils.hamacher_product(left_caging, right_caging)
+
+        # compute the tcp_obj distance in the x_z plane
+        xz = [0, 2]
+        tcp_obj_norm_x_z = np.linalg.norm(
+            features["tcp_center"][:, xz] - obj_pos[:, xz], axis=-1
+        )
+        tcp_obj_x_z_margin = (
+            np.linalg.norm(
+                episode_consts["obj_init_pos"][:, xz]
+                - episode_consts["init_tcp"][:, xz],
+                axis=-1,
+            )
+            - x_z_success_margin
+        )
+        x_z_caging = reward_utils.make_tolerance(
+            bounds=(0, x_z_success_margin), sigmoid="long_tail"
+        )(tcp_obj_norm_x_z, tcp_obj_x_z_margin)
+
+        gripper_closed = np.clip(action[:, -1], 0, 1)
+        caging = reward_utils.hamacher_product(y_caging, x_z_caging)
+
+        gripping = np.where(caging > 0.97, gripper_closed, 0.0)
+        caging_and_gripping = reward_utils.hamacher_product(caging, gripping)
+        return (caging_and_gripping + caging) / 2
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        in_place_margin = np.linalg.norm(obj_init_pos - target, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )(obj_to_target, in_place_margin)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action, obj, episode_consts, features
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+        reward = np.where(
+            (tcp_to_obj < 0.02)
+            & (tcp_opened > 0)
+            & (obj[:, 2] - 0.01 > obj_init_pos[:, 2]),
+            reward + 1.0 + 5.0 * in_place,
+            reward,
+        )
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -5,12 +5,13 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerPickPlaceWallEnvV3(SawyerXYZEnv):
@@ -29,6 +30,8 @@ class SawyerPickPlaceWallEnvV3(SawyerXYZEnv):
           reach-push-pick-place-wall.
     """
 
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -118,21 +121,20 @@ class SawyerPickPlaceWallEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.geom("objGeom").xpos
+        return self.data.geom_xpos[self._ids.geom["objGeom"]]
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return Rotation.from_matrix(
-            self.data.geom("objGeom").xmat.reshape(3, 3)
-        ).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def adjust_initObjPos(self, orig_init_pos):
         # This is to account for meshes for the geom and object are not aligned
         # If this is not done, the object could be initialized in an extreme position
-        diff = self.get_body_com("obj")[:2] - self.data.geom("objGeom").xpos[:2]
+        obj_geom_pos = self.data.geom_xpos[self._ids.geom["objGeom"]]
+        diff = self.get_body_com("obj")[:2] - obj_geom_pos[:2]
         adjustedPos = orig_init_pos[:2] + diff
 
         # The convention we follow is that body_com[2] is always 0, and geom_pos[2] is the object height
-        return [adjustedPos[0], adjustedPos[1], self.data.geom("objGeom").xpos[-1]]
+        return [adjustedPos[0], adjustedPos[1], obj_geom_pos[-1]]
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -142,9 +144,6 @@ class SawyerPickPlaceWallEnvV3(SawyerXYZEnv):
 
         goal_pos = self._get_state_rand_vec()
         self._target_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = goal_pos[3:]
         self._target_pos = goal_pos[-3:]
         self.obj_init_pos = goal_pos[:3]
 
@@ -152,7 +151,7 @@ class SawyerPickPlaceWallEnvV3(SawyerXYZEnv):
         self.model.site("goal").pos = self._target_pos
 
         self.liftThresh = 0.04
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxReachDist = np.linalg.norm(self.init_tcp - np.array(self._target_pos))
@@ -320,3 +319,84 @@ class SawyerPickPlaceWallEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + placeRew
 
             return float(reward), 0.0, 0.0, float(placingDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+        midpoint = np.broadcast_to([0.0, 0.77, 0.25], target.shape).copy()
+        midpoint[:, 0] = target[:, 0]
+
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        in_place_scaling = np.array([1.0, 1.0, 3.0])
+        obj_to_midpoint = np.linalg.norm((obj - midpoint) * in_place_scaling, axis=-1)
+        obj_to_midpoint_init = np.linalg.norm(
+            (obj_init_pos - midpoint) * in_place_scaling, axis=-1
+        )
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+        obj_to_target_init = np.linalg.norm(obj_init_pos - target, axis=-1)
+        tolerance = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )
+        in_place_part1 = tolerance(obj_to_midpoint, obj_to_midpoint_init)
+        in_place_part2 = tolerance(obj_to_target, obj_to_target_init)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            obj_radius=0.015,
+            pad_success_thresh=0.05,
+            object_reach_radius=0.01,
+            xz_thresh=0.005,
+            high_density=False,
+        )
+        in_place_and_object_grasped = reward_utils.hamacher_product(
+            object_grasped, in_place_part1
+        )
+        lifted = (
+            (tcp_to_obj < 0.02)
+            & (tcp_opened > 0)
+            & (obj[:, 2] - 0.015 > obj_init_pos[:, 2])
+        )
+        reward = np.where(
+            lifted,
+            np.where(
+                obj[:, 1] > 0.75,
+                in_place_and_object_grasped + 1.0 + 4.0 + 3.0 * in_place_part2,
+                in_place_and_object_grasped + 1.0 + 4.0 * in_place_part1,
+            ),
+            in_place_and_object_grasped,
+        )
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place_part2,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
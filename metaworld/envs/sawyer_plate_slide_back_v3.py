@@ -5,12 +5,12 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
 
 
 class SawyerPlateSlideBackEnvV3(SawyerXYZEnv):
@@ -92,11 +92,10 @@ class SawyerPlateSlideBackEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.geom("puck").xpos
+        return self.data.geom_xpos[self._ids.geom["puck"]]
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("puck").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["puck"]])
 
     def _set_obj_xyz(self, pos: npt.NDArray[Any]) -> None:
         qpos = self.data.qpos.flat.copy()
@@ -113,13 +112,13 @@ class SawyerPlateSlideBackEnvV3(SawyerXYZEnv):
         rand_vec = self._get_state_rand_vec()
         self.obj_init_pos = rand_vec[:3]
         self._target_pos = rand_vec[3:]
-        self.data.body("puck_goal").xpos = self._target_pos
+        self.data.xpos[self._ids.body["puck_goal"]] = self._target_pos
         self._set_obj_xyz(np.array([0, 0.15]))
 
         self.model.site("goal").pos = self._target_pos
 
         self.maxDist = np.linalg.norm(
-            self.data.geom("puck").xpos[:-1] - self._target_pos[:-1]
+            self.data.geom_xpos[self._ids.geom["puck"]][:-1] - self._target_pos[:-1]
         )
 
         return self._get_obs()
@@ -198,3 +197,48 @@ class SawyerPlateSlideBackEnvV3(SawyerXYZEnv):
             reward = -reachDist + pullRew
 
             return float(reward), 0.0, 0.0, float(pullDist), 0.0, 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        tcp = features["tcp_center"]
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target = episode_consts["target_pos"]
+
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+        in_place_margin = np.linalg.norm(obj_init_pos - target, axis=-1)
+        tolerance = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )
+        in_place = tolerance(obj_to_target, in_place_margin - _TARGET_RADIUS)
+
+        tcp_to_obj = np.linalg.norm(tcp - obj, axis=-1)
+        obj_grasped_margin = np.linalg.norm(
+            episode_consts["init_tcp"] - obj_init_pos, axis=-1
+        )
+        object_grasped = tolerance(tcp_to_obj, obj_grasped_margin - _TARGET_RADIUS)
+
+        reward = np.where(
+            (tcp[:, 2] <= 0.03) & (tcp_to_obj < 0.07),
+            2.0 + (7.0 * in_place),
+            1.5 * object_grasped,
+        )
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": np.zeros(len(obs)),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
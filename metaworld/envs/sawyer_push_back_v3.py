@@ -5,15 +5,17 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerPushBackEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
     OBJ_RADIUS: float = 0.007
     TARGET_RADIUS: float = 0.05
 
@@ -101,22 +103,21 @@ class SawyerPushBackEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.geom("objGeom").xpos
+        return self.data.geom_xpos[self._ids.geom["objGeom"]]
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        return Rotation.from_matrix(
-            self.data.geom("objGeom").xmat.reshape(3, 3)
-        ).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def adjust_initObjPos(self, orig_init_pos: npt.NDArray[Any]) -> npt.NDArray[Any]:
         # This is to account for meshes for the geom and object are not aligned
         # If this is not done, the object could be initialized in an extreme position
-        diff = self.get_body_com("obj")[:2] - self.data.geom("objGeom").xpos[:2]
+        obj_geom_pos = self.data.geom_xpos[self._ids.geom["objGeom"]]
+        diff = self.get_body_com("obj")[:2] - obj_geom_pos[:2]
         adjustedPos = orig_init_pos[:2] + diff
 
         # The convention we follow is that body_com[2] is always 0, and geom_pos[2] is the object height
         return np.array(
-            [adjustedPos[0], adjustedPos[1], self.data.geom("objGeom").xpos[-1]]
+            [adjustedPos[0], adjustedPos[1], obj_geom_pos[-1]]
         )
 
     def reset_model(self) -> npt.NDArray[np.float64]:
@@ -128,11 +129,6 @@ class SawyerPushBackEnvV3(SawyerXYZEnv):
         assert self.obj_init_pos is not None
         goal_pos = self._get_state_rand_vec()
         self._target_pos = np.concatenate([goal_pos[-3:-1], [self.obj_init_pos[-1]]])
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = np.concatenate(
-                [goal_pos[-3:-1], [self.obj_init_pos[-1]]]
-            )
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
 
         self._set_obj_xyz(self.obj_init_pos)
@@ -140,7 +136,7 @@ class SawyerPushBackEnvV3(SawyerXYZEnv):
 
         self.liftThresh = 0.04
 
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxReachDist = np.linalg.norm(self.init_tcp - np.array(self._target_pos))
@@ -321,3 +317,123 @@ class SawyerPushBackEnvV3(SawyerXYZEnv):
                 pushRew = 0
             reward = reachRew + pushRew
             return reward, 0.0, 0.0, float(pushDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def _gripper_caging_reward_batch(
+        cls,
+        action: npt.NDArray[np.float32],
+        obj_pos: npt.NDArray[Any],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+        obj_radius: float,
+        pad_success_thresh: float = 0,
+        object_reach_radius: float = 0,
+        xz_thresh: float = 0,
+        desired_gripper_effort: float = 1.0,
+        high_density: bool = False,
+        medium_density: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        pad_success_margin = 0.05
+        grip_success_margin = obj_radius + 0.003
+        x_z_success_margin = 0.01
+
+        delta_object_y_left_pad = features["left_pad"][:, 1] - obj_pos[:, 1]
+        delta_object_y_right_pad = obj_pos[:, 1] - features["right_pad"][:, 1]
+        # `init_left_pad` and `init_right_pad` track the current pad positions.
+        right_caging_margin = np.abs(
+            np.abs(delta_object_y_right_pad) - pad_success_margin
+        )
+        left_caging_margin = np.abs(
+            np.abs(delta_object_y_left_pad) - pad_success_margin
+        )
+
+        caging_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, pad_success_margin), sigmoid="long_tail"
+        )
+        right_caging = caging_tolerance(delta_object_y_right_pad, right_caging_margin)
+        left_caging = caging_tolerance(delta_object_y_left_pad, left_caging_margin)
+        gripping_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, grip_success_margin), sigmoid="long_tail"
+        )
+        right_gripping = gripping_tolerance(
+            delta_object_y_right_pad, right_caging_margin
+        )
+        left_gripping = gripping_tolerance(delta_object_y_left_pad, left_caging_margin)
+
+        y_caging = reward_utils.hamacher_product(right_caging, left_caging)
+        y_gripping = reward_utils.hamacher_product(right_gripping, left_gripping)
+
+        xz = [0, 2]
+        tcp_obj_norm_x_z = np.linalg.norm(
+            features["tcp_center"][:, xz] - obj_pos[:, xz], axis=-1
+        )
+        tcp_obj_x_z_margin = (
+            np.linalg.norm(
+                episode_consts["obj_init_pos"][:, xz]
+                - episode_consts["init_tcp"][:, xz],
+                axis=-1,
+            )
+            - x_z_success_margin
+        )
+        x_z_caging = reward_utils.make_tolerance(
+            bounds=(0, x_z_success_margin), sigmoid="long_tail"
+        )(tcp_obj_norm_x_z, tcp_obj_x_z_margin)
+
+        caging = reward_utils.hamacher_product(y_caging, x_z_caging)
+        gripping = np.where(caging > 0.95, y_gripping, 0.0)
+        return (caging + gripping) / 2
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target_pos = episode_consts["target_pos"]
+        tcp_opened = obs[:, 3]
+
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        target_to_obj = np.linalg.norm(obj - target_pos, axis=-1)
+        target_to_obj_init = np.linalg.norm(obj_init_pos - target_pos, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, target_to_obj_init)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action, obj, episode_consts, features, cls.OBJ_RADIUS
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+        reward = np.where(
+            (tcp_to_obj < 0.01)
+            & (0 < tcp_opened)
+            & (tcp_opened < 0.55)
+            & (target_to_obj_init - target_to_obj > 0.01),
+            reward + 1.0 + 5.0 * in_place,
+            reward,
+        )
+        reward = np.where(target_to_obj < cls.TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (target_to_obj <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -7,12 +7,13 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerPushWallEnvV3(SawyerXYZEnv):
@@ -31,6 +32,8 @@ class SawyerPushWallEnvV3(SawyerXYZEnv):
         - (6/15/20) Separated reach-push-pick-place into 3 separate envs.
     """
 
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
     OBJ_RADIUS: float = 0.02
 
     def __init__(
@@ -121,17 +124,17 @@ class SawyerPushWallEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
-        return self.data.geom("objGeom").xpos
+        return self.data.geom_xpos[self._ids.geom["objGeom"]]
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("objGeom").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def adjust_initObjPos(self, orig_init_pos: npt.NDArray[Any]) -> npt.NDArray[Any]:
-        diff = self.get_body_com("obj")[:2] - self.data.geom("objGeom").xpos[:2]
+        obj_geom_pos = self.data.geom_xpos[self._ids.geom["objGeom"]]
+        diff = self.get_body_com("obj")[:2] - obj_geom_pos[:2]
         adjustedPos = orig_init_pos[:2] + diff
         return np.array(
-            [adjustedPos[0], adjustedPos[1], self.data.geom("objGeom").xpos[-1]]
+            [adjustedPos[0], adjustedPos[1], obj_geom_pos[-1]]
         )
 
     def reset_model(self) -> npt.NDArray[np.float64]:
@@ -142,16 +145,13 @@ class SawyerPushWallEnvV3(SawyerXYZEnv):
 
         goal_pos = self._get_state_rand_vec()
         self._target_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = goal_pos[3:]
         self._target_pos = np.concatenate([goal_pos[-3:-1], [self.obj_init_pos[-1]]])
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
 
         self.model.site("goal").pos = self._target_pos
 
         self.liftThresh = 0.04
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxReachDist = np.linalg.norm(self.init_tcp - np.array(self._target_pos))
@@ -264,3 +264,76 @@ class SawyerPushWallEnvV3(SawyerXYZEnv):
 
             reward = reachRew + pushRew
             return reward, 0.0, 0.0, float(pushDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+        midpoint = np.broadcast_to([-0.05, 0.77, 0.0], obj.shape).copy()
+        midpoint[:, 2] = obj[:, 2]
+
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        in_place_scaling = np.array([3.0, 1.0, 1.0])
+        obj_to_midpoint = np.linalg.norm((obj - midpoint) * in_place_scaling, axis=-1)
+        obj_to_midpoint_init = np.linalg.norm(
+            (obj_init_pos - midpoint) * in_place_scaling, axis=-1
+        )
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+        obj_to_target_init = np.linalg.norm(obj_init_pos - target, axis=-1)
+        tolerance = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )
+        in_place_part1 = tolerance(obj_to_midpoint, obj_to_midpoint_init)
+        in_place_part2 = tolerance(obj_to_target, obj_to_target_init)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            object_reach_radius=0.01,
+            obj_radius=0.015,
+            pad_success_thresh=0.05,
+            xz_thresh=0.005,
+            high_density=True,
+        )
+        reward = np.where(
+            (tcp_to_obj < 0.02) & (tcp_opened > 0),
+            np.where(
+                obj[:, 1] > 0.75,
+                2 * object_grasped + 1.0 + 4.0 + 3.0 * in_place_part2,
+                2.0 * object_grasped + 1.0 + 4.0 * in_place_part1,
+            ),
+            2 * object_grasped,
+        )
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place_part2,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -5,12 +5,13 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerReachEnvV3(SawyerXYZEnv):
@@ -28,6 +29,8 @@ class SawyerReachEnvV3(SawyerXYZEnv):
         - (6/15/20) Separated reach-push-pick-place into 3 separate envs.
     """
 
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -103,8 +106,7 @@ class SawyerReachEnvV3(SawyerXYZEnv):
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("objGeom").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def fix_extreme_obj_pos(self, orig_init_pos: npt.NDArray[Any]) -> npt.NDArray[Any]:
         # This is to account for meshes for the geom and object are not
@@ -126,9 +128,6 @@ class SawyerReachEnvV3(SawyerXYZEnv):
 
         goal_pos = self._get_state_rand_vec()
         self._target_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = goal_pos[3:]
         self._target_pos = goal_pos[-3:]
         self.obj_init_pos = goal_pos[:3]
         self._set_obj_xyz(self.obj_init_pos)
@@ -182,3 +181,32 @@ class SawyerReachEnvV3(SawyerXYZEnv):
             reachRew = max(reachRew, 0)
             reward = reachRew
             return float(reward), float(reachDist), float(0.0)
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        target = episode_consts["target_pos"]
+        tcp_to_target = np.linalg.norm(features["tcp_center"] - target, axis=-1)
+        in_place_margin = np.linalg.norm(
+            episode_consts["hand_init_pos"] - target, axis=-1
+        )
+        in_place = reward_utils.make_tolerance(bounds=(0, 0.05), sigmoid="long_tail")(
+            tcp_to_target, in_place_margin
+        )
+        reward = 10 * in_place
+
+        info = {
+            "success": (tcp_to_target <= 0.05).astype(np.float64),
+            "near_object": tcp_to_target,
+            "grasp_success": np.ones_like(reward),
+            "grasp_reward": tcp_to_target,
+            "in_place_reward": in_place,
+            "obj_to_target": tcp_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
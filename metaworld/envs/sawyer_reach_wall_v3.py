@@ -5,12 +5,13 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerReachWallEnvV3(SawyerXYZEnv):
@@ -28,6 +29,8 @@ class SawyerReachWallEnvV3(SawyerXYZEnv):
             i.e. (self._target_pos - pos_hand)
     """
 
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -105,8 +108,7 @@ class SawyerReachWallEnvV3(SawyerXYZEnv):
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("objGeom").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -115,9 +117,6 @@ class SawyerReachWallEnvV3(SawyerXYZEnv):
 
         goal_pos = self._get_state_rand_vec()
         self._target_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = goal_pos[3:]
         self._target_pos = goal_pos[-3:]
         self.obj_init_pos = goal_pos[:3]
 
@@ -125,7 +124,7 @@ class SawyerReachWallEnvV3(SawyerXYZEnv):
         self.model.site("goal").pos = self._target_pos
 
         self.liftThresh = 0.04
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
 
         self.maxReachDist = np.linalg.norm(self.init_tcp - np.array(self._target_pos))
@@ -188,3 +187,33 @@ class SawyerReachWallEnvV3(SawyerXYZEnv):
             reward = reachRew
 
             return float(reward), float(reachDist), 0.0
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        target = episode_consts["target_pos"]
+        tcp_to_target = np.linalg.norm(features["tcp_center"] - target, axis=-1)
+        in_place_margin = np.linalg.norm(
+            episode_consts["hand_init_pos"] - target, axis=-1
+        )
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )(tcp_to_target, in_place_margin)
+        reward = 10 * in_place
+
+        info = {
+            "success": (tcp_to_target <= 0.05).astype(np.float64),
+            "near_object": np.zeros(len(obs)),
+            "grasp_success": np.zeros(len(obs)),
+            "grasp_reward": np.zeros(len(obs)),
+            "in_place_reward": in_place,
+            "obj_to_target": tcp_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
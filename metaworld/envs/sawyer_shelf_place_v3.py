@@ -6,15 +6,18 @@ import mujoco
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerShelfPlaceEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.1),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -105,13 +108,13 @@ class SawyerShelfPlaceEnvV3(SawyerXYZEnv):
         return self.get_body_com("obj")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("objGeom").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def adjust_initObjPos(self, orig_init_pos: npt.NDArray[Any]) -> npt.NDArray[Any]:
         # This is to account for meshes for the geom and object are not aligned
         # If this is not done, the object could be initialized in an extreme position
-        diff = self.get_body_com("obj")[:2] - self.data.geom("objGeom").xpos[:2]
+        obj_geom_pos = self.data.geom_xpos[self._ids.geom["objGeom"]]
+        diff = self.get_body_com("obj")[:2] - obj_geom_pos[:2]
         adjustedPos = orig_init_pos[:2] + diff
 
         # The convention we follow is that body_com[2] is always 0, and geom_pos[2] is the object height
@@ -123,8 +126,6 @@ class SawyerShelfPlaceEnvV3(SawyerXYZEnv):
         self.obj_init_angle = self.init_config["obj_init_angle"]
 
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - goal_pos[-3:-1]) < 0.1:
-            goal_pos = self._get_state_rand_vec()
         base_shelf_pos = goal_pos - np.array([0, 0, 0, 0, 0, 0.3])
         self.obj_init_pos = np.concatenate(
             (base_shelf_pos[:2], [self.obj_init_pos[-1]])
@@ -140,7 +141,7 @@ class SawyerShelfPlaceEnvV3(SawyerXYZEnv):
         self._set_pos_site("goal", self._target_pos)
 
         self.liftThresh = 0.04
-        self.objHeight = self.data.geom("objGeom").xpos[2]
+        self.objHeight = self.data.geom_xpos[self._ids.geom["objGeom"]][2]
         self.heightTarget = self.objHeight + self.liftThresh
         self.maxPlacingDist = (
             np.linalg.norm(
@@ -287,3 +288,84 @@ class SawyerShelfPlaceEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + placeRew
 
             return float(reward), 0.0, 0.0, float(placingDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        in_place_margin = np.linalg.norm(obj_init_pos - target, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )(obj_to_target, in_place_margin)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            obj,
+            episode_consts,
+            features,
+            obj_radius=0.02,
+            pad_success_thresh=0.05,
+            object_reach_radius=0.01,
+            xz_thresh=0.01,
+            high_density=False,
+        )
+        reward = reward_utils.hamacher_product(object_grasped, in_place)
+
+        below_shelf = (
+            (0.0 < obj[:, 2])
+            & (obj[:, 2] < 0.24)
+            & (target[:, 0] - 0.15 < obj[:, 0])
+            & (obj[:, 0] < target[:, 0] + 0.15)
+        )
+        shelf_front = target[:, 1] - 3 * _TARGET_RADIUS
+        in_front = below_shelf & (shelf_front < obj[:, 1]) & (obj[:, 1] < target[:, 1])
+        # Only in front of the shelf are both scalings within [0, 1].
+        z_scaling = np.clip((0.24 - obj[:, 2]) / 0.24, 0.0, 1.0)
+        y_scaling = np.clip((obj[:, 1] - shelf_front) / (3 * _TARGET_RADIUS), 0.0, 1.0)
+        bound_loss = reward_utils.hamacher_product(y_scaling, z_scaling)
+        in_place = np.where(
+            in_front, np.clip(in_place - bound_loss, 0.0, 1.0), in_place
+        )
+        in_place = np.where(below_shelf & (obj[:, 1] > target[:, 1]), 0.0, in_place)
+
+        reward = np.where(
+            (tcp_to_obj < 0.025)
+            & (tcp_opened > 0)
+            & (obj[:, 2] - 0.01 > obj_init_pos[:, 2]),
+            reward + 1.0 + 5.0 * in_place,
+            reward,
+        )
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
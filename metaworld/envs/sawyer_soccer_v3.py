@@ -5,15 +5,17 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerSoccerEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
     OBJ_RADIUS: float = 0.013
     TARGET_RADIUS: float = 0.07
 
@@ -105,8 +107,7 @@ class SawyerSoccerEnvV3(SawyerXYZEnv):
         return self.get_body_com("soccer_ball")
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.body("soccer_ball").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.xmat[self._ids.body["soccer_ball"]])
 
     def reset_model(self) -> npt.NDArray[np.float64]:
         self._reset_hand()
@@ -115,9 +116,6 @@ class SawyerSoccerEnvV3(SawyerXYZEnv):
 
         goal_pos = self._get_state_rand_vec()
         self._target_pos = goal_pos[3:]
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
-            self._target_pos = goal_pos[3:]
         assert self.obj_init_pos is not None
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
         self.model.body("goal_whole").pos = self._target_pos
@@ -298,3 +296,125 @@ class SawyerSoccerEnvV3(SawyerXYZEnv):
             reward = reachRew + pushRew
 
             return float(reward), 0.0, 0.0, float(pushDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def _gripper_caging_reward_batch(
+        cls,
+        action: npt.NDArray[np.float32],
+        obj_pos: npt.NDArray[Any],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+        obj_radius: float,
+        pad_success_thresh: float = 0,
+        object_reach_radius: float = 0,
+        xz_thresh: float = 0,
+        desired_gripper_effort: float = 1.0,
+        high_density: bool = False,
+        medium_density: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        pad_success_margin = 0.05
+        grip_success_margin = obj_radius + 0.01
+        x_z_success_margin = 0.005
+
+        delta_object_y_left_pad = features["left_pad"][:, 1] - obj_pos[:, 1]
+        delta_object_y_right_pad = obj_pos[:, 1] - features["right_pad"][:, 1]
+        # `init_left_pad` and `init_right_pad` track the current pad positions.
+        right_caging_margin = np.abs(
+            np.abs(delta_object_y_right_pad) - pad_success_margin
+        )
+        left_caging_margin = np.abs(
+            np.abs(delta_object_y_left_pad) - pad_success_margin
+        )
+
+        caging_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, pad_success_margin), sigmoid="long_tail"
+        )
+        right_caging = caging_tolerance(delta_object_y_right_pad, right_caging_margin)
+        left_caging = caging_tolerance(delta_object_y_left_pad, left_caging_margin)
+        gripping_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, grip_success_margin), sigmoid="long_tail"
+        )
+        right_gripping = gripping_tolerance(
+            delta_object_y_right_pad, right_caging_margin
+        )
+        left_gripping = gripping_tolerance(delta_object_y_left_pad, left_caging_margin)
+
+        y_caging = reward_utils.hamacher_product(right_caging, left_caging)
+        y_gripping = reward_utils.hamacher_product(right_gripping, left_gripping)
+
+        xz = [0, 2]
+        tcp_obj_norm_x_z = np.linalg.norm(
+            features["tcp_center"][:, xz] - obj_pos[:, xz], axis=-1
+        )
+        tcp_obj_x_z_margin = (
+            np.linalg.norm(
+                episode_consts["obj_init_pos"][:, xz]
+                - episode_consts["init_tcp"][:, xz],
+                axis=-1,
+            )
+            - x_z_success_margin
+        )
+        x_z_caging = reward_utils.make_tolerance(
+            bounds=(0, x_z_success_margin), sigmoid="long_tail"
+        )(tcp_obj_norm_x_z, tcp_obj_x_z_margin)
+
+        caging = reward_utils.hamacher_product(y_caging, x_z_caging)
+        gripping = np.where(caging > 0.95, y_gripping, 0.0)
+        return (caging + gripping) / 2
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        obj = obs[:, 4:7]
+        obj_init_pos = episode_consts["obj_init_pos"]
+        target_pos = episode_consts["target_pos"]
+        tcp_opened = obs[:, 3]
+
+        x_scaling = np.array([3.0, 1.0, 1.0])
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        target_to_obj = np.linalg.norm((obj - target_pos) * x_scaling, axis=-1)
+        target_to_obj_init = np.linalg.norm((obj - obj_init_pos) * x_scaling, axis=-1)
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, target_to_obj_init)
+
+        goal_line = target_pos[:, 1] - 0.1
+        in_place = np.where(
+            (obj[:, 1] > goal_line) & (np.abs(obj[:, 0] - target_pos[:, 0]) > 0.10),
+            np.clip(
+                in_place - 2 * ((obj[:, 1] - goal_line) / (1 - goal_line)), 0.0, 1.0
+            ),
+            in_place,
+        )
+        object_grasped = cls._gripper_caging_reward_batch(
+            action, obj, episode_consts, features, cls.OBJ_RADIUS
+        )
+        reward = (3 * object_grasped) + (6.5 * in_place)
+        reward = np.where(target_to_obj < cls.TARGET_RADIUS, 10.0, reward)
+        obj_to_target = np.linalg.norm(obj - target_pos, axis=-1)
+
+        info = {
+            "success": (obj_to_target <= 0.07).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (obj[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
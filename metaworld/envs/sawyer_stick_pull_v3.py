@@ -5,15 +5,18 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import ObservationDict, StickInitConfigDict
+from metaworld.types import ObservationDict, RewardInputs, StickInitConfigDict
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerStickPullEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.1),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -115,10 +118,10 @@ class SawyerStickPullEnvV3(SawyerXYZEnv):
         )
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.body("stick").xmat.reshape(3, 3)
+        geom_xmat = self.data.xmat[self._ids.body["stick"]]
         return np.hstack(
             (
-                Rotation.from_matrix(geom_xmat).as_quat(),
+                mat2quat_xyzw(geom_xmat),
                 np.array(
                     [
                         0.0,
@@ -157,8 +160,6 @@ class SawyerStickPullEnvV3(SawyerXYZEnv):
         self._target_pos = np.array([0.3, 0.4, self.stick_init_pos[-1]])
 
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - goal_pos[-3:-1]) < 0.1:
-            goal_pos = self._get_state_rand_vec()
         self.stick_init_pos = np.concatenate([goal_pos[:2], [self.stick_init_pos[-1]]])
         self._target_pos = np.concatenate([goal_pos[-3:-1], [self.stick_init_pos[-1]]])
 
@@ -353,3 +354,112 @@ class SawyerStickPullEnvV3(SawyerXYZEnv):
             assert (pullRew >= 0) and (pickRew >= 0)
             reward = reachRew + pickRew + pullRew
             return float(reward), 0.0, 0.0, float(pullDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "stick_init_pos": np.array(self.stick_init_pos, dtype=np.float64),
+        }
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "end_of_stick": self._get_site_pos("stick_end"),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        stick = obs[:, 4:7]
+        end_of_stick = features["end_of_stick"]
+        handle = obs[:, 11:14]
+        container = handle + np.array([0.05, 0.0, 0.0])
+        obj_init_pos = episode_consts["obj_init_pos"]
+        container_init_pos = obj_init_pos + np.array([0.05, 0.0, 0.0])
+        stick_init_pos = episode_consts["stick_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+
+        tcp_to_stick = np.linalg.norm(stick - features["tcp_center"], axis=-1)
+        handle_to_target = np.linalg.norm(handle - target, axis=-1)
+        tolerance = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )
+        yz_scaling = np.array([1.0, 1.0, 2.0])
+        stick_in_place = tolerance(
+            np.linalg.norm((stick - container) * yz_scaling, axis=-1),
+            np.linalg.norm((stick_init_pos - container_init_pos) * yz_scaling, axis=-1),
+        )
+        stick_in_place_2 = tolerance(
+            np.linalg.norm(stick - target, axis=-1),
+            np.linalg.norm(stick_init_pos - target, axis=-1),
+        )
+        container_in_place = tolerance(
+            np.linalg.norm(container - target, axis=-1),
+            np.linalg.norm(obj_init_pos - target, axis=-1),
+        )
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            stick,
+            episode_consts,
+            features,
+            obj_radius=0.014,
+            pad_success_thresh=0.05,
+            object_reach_radius=0.01,
+            xz_thresh=0.01,
+            high_density=True,
+        )
+        grasp_success = (
+            (tcp_to_stick < 0.02)
+            & (tcp_opened > 0)
+            & (stick[:, 2] - 0.01 > stick_init_pos[:, 2])
+        )
+        object_grasped = np.where(grasp_success, 1.0, object_grasped)
+        in_place_and_object_grasped = reward_utils.hamacher_product(
+            object_grasped, stick_in_place
+        )
+        inserted = (
+            (end_of_stick[:, 0] >= handle[:, 0])
+            & (np.abs(end_of_stick[:, 1] - handle[:, 1]) <= 0.040)
+            & (np.abs(end_of_stick[:, 2] - handle[:, 2]) <= 0.060)
+        )
+        reward = np.select(
+            [
+                grasp_success & inserted & (handle_to_target <= 0.12),
+                grasp_success & inserted,
+                grasp_success,
+            ],
+            [
+                10.0,
+                1.0
+                + in_place_and_object_grasped
+                + 5.0
+                + 2.0 * stick_in_place_2
+                + 1.0 * container_in_place,
+                1.0 + in_place_and_object_grasped + 5.0 * stick_in_place,
+            ],
+            in_place_and_object_grasped,
+        )
+
+        info = {
+            "success": ((handle_to_target <= 0.12) & inserted).astype(np.float64),
+            "near_object": (tcp_to_stick <= 0.03).astype(np.float64),
+            "grasp_success": (
+                (features["touching_main_object"] > 0)
+                & (tcp_opened > 0)
+                & (stick[:, 2] - 0.02 > obj_init_pos[:, 2])
+            ).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": stick_in_place,
+            "obj_to_target": handle_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
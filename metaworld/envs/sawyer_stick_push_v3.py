@@ -5,15 +5,18 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import ObservationDict, StickInitConfigDict
+from metaworld.types import ObservationDict, RewardInputs, StickInitConfigDict
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerStickPushEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.1),)
+
     def __init__(
         self,
         render_mode: RenderMode | None = None,
@@ -110,10 +113,10 @@ class SawyerStickPushEnvV3(SawyerXYZEnv):
         )
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.body("stick").xmat.reshape(3, 3)
+        geom_xmat = self.data.xmat[self._ids.body["stick"]]
         return np.hstack(
             (
-                Rotation.from_matrix(geom_xmat).as_quat(),
+                mat2quat_xyzw(geom_xmat),
                 np.array(
                     [
                         0.0,
@@ -152,8 +155,6 @@ class SawyerStickPushEnvV3(SawyerXYZEnv):
         self._target_pos = np.array([0.4, 0.6, self.stick_init_pos[-1]])
 
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - goal_pos[-3:-1]) < 0.1:
-            goal_pos = self._get_state_rand_vec()
         self.stick_init_pos = np.concatenate([goal_pos[:2], [self.stick_init_pos[-1]]])
         self._target_pos = np.concatenate(
             [goal_pos[-3:-1], [self._get_site_pos("insertion")[-1]]]
@@ -411,3 +412,119 @@ class SawyerStickPushEnvV3(SawyerXYZEnv):
             reward = reachRew + pickRew + pushRew
 
             return float(reward), 0.0, 0.0, float(pushDist), 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "stick_init_pos": np.array(self.stick_init_pos, dtype=np.float64),
+        }
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def _gripper_caging_reward_batch(
+        cls,
+        action: npt.NDArray[np.float32],
+        obj_pos: npt.NDArray[Any],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+        obj_radius: float,
+        pad_success_thresh: float,
+        object_reach_radius: float,
+        xz_thresh: float,
+        desired_gripper_effort: float = 1.0,
+        high_density: bool = False,
+        medium_density: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        # The caging reward is measured from the stick's initial position.
+        return super()._gripper_caging_reward_batch(
+            action,
+            obj_pos,
+            {**episode_consts, "obj_init_pos": episode_consts["stick_init_pos"]},
+            features,
+            obj_radius,
+            pad_success_thresh,
+            object_reach_radius,
+            xz_thresh,
+            desired_gripper_effort,
+            high_density,
+            medium_density,
+        )
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.12
+        stick = obs[:, 4:7] + np.array([0.015, 0.0, 0.0])
+        container = obs[:, 11:14]
+        stick_init_pos = episode_consts["stick_init_pos"]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"]
+
+        tcp_to_stick = np.linalg.norm(stick - features["tcp_center"], axis=-1)
+        tolerance = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )
+        stick_in_place = tolerance(
+            np.linalg.norm(stick - target, axis=-1),
+            np.linalg.norm(stick_init_pos - target, axis=-1) - _TARGET_RADIUS,
+        )
+        container_to_target = np.linalg.norm(container - target, axis=-1)
+        container_in_place = tolerance(
+            container_to_target,
+            np.linalg.norm(episode_consts["obj_init_pos"] - target, axis=-1)
+            - _TARGET_RADIUS,
+        )
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action,
+            stick,
+            episode_consts,
+            features,
+            obj_radius=0.04,
+            pad_success_thresh=0.05,
+            object_reach_radius=0.01,
+            xz_thresh=0.01,
+            high_density=True,
+        )
+        grasped = (
+            (tcp_to_stick < 0.02)
+            & (tcp_opened > 0)
+            & (stick[:, 2] - 0.01 > stick_init_pos[:, 2])
+        )
+        reward = np.where(
+            grasped,
+            np.where(
+                container_to_target <= _TARGET_RADIUS,
+                10.0,
+                2.0 + 5.0 * stick_in_place + 3.0 * container_in_place,
+            ),
+            object_grasped,
+        )
+        object_grasped = np.where(grasped, 1.0, object_grasped)
+
+        grasp_success = (
+            (features["touching_main_object"] > 0)
+            & (tcp_opened > 0)
+            & (obs[:, 6] - 0.01 > stick_init_pos[:, 2])
+        )
+        success = np.linalg.norm(container - target, axis=-1) <= 0.12
+        info = {
+            "success": (grasp_success & success).astype(np.float64),
+            "near_object": (tcp_to_stick <= 0.03).astype(np.float64),
+            "grasp_success": grasp_success.astype(np.float64),
+            "grasp_reward": object_grasped,
+            "in_place_reward": stick_in_place,
+            "obj_to_target": container_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -5,15 +5,17 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 from gymnasium.spaces import Box
-from scipy.spatial.transform import Rotation
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
+from metaworld.utils.rotation import mat2quat_xyzw
+from metaworld.utils.sampling import MinDistance
 
 
 class SawyerSweepIntoGoalEnvV3(SawyerXYZEnv):
+    RAND_VEC_CONSTRAINTS = (MinDistance(slice(0, 2), (0.0, 0.84), 0.15),)
     OBJ_RADIUS: float = 0.02
 
     def __init__(
@@ -94,8 +96,7 @@ class SawyerSweepIntoGoalEnvV3(SawyerXYZEnv):
         return reward, info
 
     def _get_quat_objects(self) -> npt.NDArray[Any]:
-        geom_xmat = self.data.geom("objGeom").xmat.reshape(3, 3)
-        return Rotation.from_matrix(geom_xmat).as_quat()
+        return mat2quat_xyzw(self.data.geom_xmat[self._ids.geom["objGeom"]])
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         return self.get_body_com("obj")
@@ -108,8 +109,6 @@ class SawyerSweepIntoGoalEnvV3(SawyerXYZEnv):
         self.objHeight = self.get_body_com("obj")[2]
 
         goal_pos = self._get_state_rand_vec()
-        while np.linalg.norm(goal_pos[:2] - self._target_pos[:2]) < 0.15:
-            goal_pos = self._get_state_rand_vec()
         assert self.obj_init_pos is not None
         self.obj_init_pos = np.concatenate([goal_pos[:2], [self.obj_init_pos[-1]]])
 
@@ -296,3 +295,119 @@ class SawyerSweepIntoGoalEnvV3(SawyerXYZEnv):
             reward = reachRew + pushRew
 
             return reward, 0.0, 0.0, float(pushDist), 0.0, 0.0
+
+    def reward_features(self) -> RewardInputs:
+        return {
+            **super().reward_features(),
+            "touching_main_object": np.array(self.touching_main_object),
+        }
+
+    @classmethod
+    def _gripper_caging_reward_batch(
+        cls,
+        action: npt.NDArray[np.float32],
+        obj_pos: npt.NDArray[Any],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+        obj_radius: float,
+        pad_success_thresh: float = 0,
+        object_reach_radius: float = 0,
+        xz_thresh: float = 0,
+        desired_gripper_effort: float = 1.0,
+        high_density: bool = False,
+        medium_density: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        pad_success_margin = 0.05
+        grip_success_margin = obj_radius + 0.005
+        x_z_success_margin = 0.01
+
+        delta_object_y_left_pad = features["left_pad"][:, 1] - obj_pos[:, 1]
+        delta_object_y_right_pad = obj_pos[:, 1] - features["right_pad"][:, 1]
+        # `init_left_pad` and `init_right_pad` track the current pad positions.
+        right_caging_margin = np.abs(
+            np.abs(delta_object_y_right_pad) - pad_success_margin
+        )
+        left_caging_margin = np.abs(
+            np.abs(delta_object_y_left_pad) - pad_success_margin
+        )
+
+        caging_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, pad_success_margin), sigmoid="long_tail"
+        )
+        right_caging = caging_tolerance(delta_object_y_right_pad, right_caging_margin)
+        left_caging = caging_tolerance(delta_object_y_left_pad, left_caging_margin)
+        gripping_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, grip_success_margin), sigmoid="long_tail"
+        )
+        right_gripping = gripping_tolerance(
+            delta_object_y_right_pad, right_caging_margin
+        )
+        left_gripping = gripping_tolerance(delta_object_y_left_pad, left_caging_margin)
+
+        y_caging = reward_utils.hamacher_product(right_caging, left_caging)
+        y_gripping = reward_utils.hamacher_product(right_gripping, left_gripping)
+
+        xz = [0, 2]
+        tcp_obj_norm_x_z = np.linalg.norm(
+            features["tcp_center"][:, xz] - obj_pos[:, xz], axis=-1
+        )
+        tcp_obj_x_z_margin = (
+            np.linalg.norm(
+                episode_consts["obj_init_pos"][:, xz]
+                - episode_consts["init_tcp"][:, xz],
+                axis=-1,
+            )
+            - x_z_success_margin
+        )
+        x_z_caging = reward_utils.make_tolerance(
+            bounds=(0, x_z_success_margin), sigmoid="long_tail"
+        )(tcp_obj_norm_x_z, tcp_obj_x_z_margin)
+
+        caging = reward_utils.hamacher_product(y_caging, x_z_caging)
+        gripping = np.where(caging > 0.95, y_gripping, 0.0)
+        return (caging + gripping) / 2
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        _TARGET_RADIUS = 0.05
+        obj = obs[:, 4:7]
+        tcp_opened = obs[:, 3]
+        target = episode_consts["target_pos"].copy()
+        target[:, 2] = obj[:, 2]
+
+        obj_to_target = np.linalg.norm(obj - target, axis=-1)
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        in_place_margin = np.linalg.norm(
+            episode_consts["obj_init_pos"] - target, axis=-1
+        )
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, _TARGET_RADIUS), sigmoid="long_tail"
+        )(obj_to_target, in_place_margin)
+
+        object_grasped = cls._gripper_caging_reward_batch(
+            action, obj, episode_consts, features, cls.OBJ_RADIUS
+        )
+        in_place_and_object_grasped = reward_utils.hamacher_product(
+            object_grasped, in_place
+        )
+        reward = (2 * object_grasped) + (6 * in_place_and_object_grasped)
+        reward = np.where(obj_to_target < _TARGET_RADIUS, 10.0, reward)
+
+        info = {
+            "success": (obj_to_target <= 0.05).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.03).astype(np.float64),
+            "grasp_reward": object_grasped,
+            "grasp_success": (
+                (features["touching_main_object"] > 0) & (tcp_opened > 0)
+            ).astype(np.float64),
+            "in_place_reward": in_place,
+            "obj_to_target": obj_to_target,
+            "unscaled_reward": reward,
+        }
+        return reward, info
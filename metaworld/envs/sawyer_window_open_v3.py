@@ -8,7 +8,7 @@ from gymnasium.spaces import Box
 
 from metaworld.asset_path_utils import full_V3_path_for
 from metaworld.sawyer_xyz_env import RenderMode, SawyerXYZEnv
-from metaworld.types import InitConfigDict
+from metaworld.types import InitConfigDict, RewardInputs
 from metaworld.utils import reward_utils
 
 
@@ -131,7 +131,7 @@ class SawyerWindowOpenEnvV3(SawyerXYZEnv):
         assert self._target_pos is not None and self.obj_init_pos is not None
         if self.reward_function_version == "v2":
             del actions
-            obj = self._get_pos_objects()
+            obj = self._get_pos_objects_cached()
             tcp = self.tcp_center
             target = self._target_pos.copy()
 
@@ -199,3 +199,52 @@ class SawyerWindowOpenEnvV3(SawyerXYZEnv):
             reward = reachRew + pullRew
 
             return reward, 0.0, 0.0, pullDist, 0.0, 0.0
+
+    def episode_constants(self) -> RewardInputs:
+        return {
+            **super().episode_constants(),
+            "window_handle_pos_init": np.array(
+                self.window_handle_pos_init, dtype=np.float64
+            ),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        del action
+        obj = obs[:, 4:7]
+        handle_pos_init = episode_consts["window_handle_pos_init"]
+        target = episode_consts["target_pos"]
+
+        target_to_obj = np.abs(obj[:, 0] - target[:, 0])
+        target_to_obj_init = np.abs(episode_consts["obj_init_pos"][:, 0] - target[:, 0])
+        in_place = reward_utils.make_tolerance(
+            bounds=(0, cls.TARGET_RADIUS), sigmoid="long_tail"
+        )(target_to_obj, np.abs(target_to_obj_init - cls.TARGET_RADIUS))
+
+        handle_radius = 0.02
+        tcp_to_obj = np.linalg.norm(obj - features["tcp_center"], axis=-1)
+        tcp_to_obj_init = np.linalg.norm(
+            handle_pos_init - episode_consts["init_tcp"], axis=-1
+        )
+        reach = reward_utils.make_tolerance(
+            bounds=(0, handle_radius), sigmoid="long_tail"
+        )(tcp_to_obj, np.abs(tcp_to_obj_init - handle_radius))
+
+        reward = 10 * reward_utils.hamacher_product(reach, in_place)
+
+        info = {
+            "success": (target_to_obj <= cls.TARGET_RADIUS).astype(np.float64),
+            "near_object": (tcp_to_obj <= 0.05).astype(np.float64),
+            "grasp_success": np.ones(len(obs)),
+            "grasp_reward": reach,
+            "in_place_reward": in_place,
+            "obj_to_target": target_to_obj,
+            "unscaled_reward": reward,
+        }
+        return reward, info
@@ -73,13 +73,17 @@ def evaluation(
         dones = np.logical_or(terminations, truncations)
         agent.reset(dones)
 
+        # Envs in `structured_info` mode report their metrics in one
+        # structured array with the usual keys as fields.
+        final_metrics = infos.get("final_info", {})
+        final_metrics = final_metrics.get("metrics", final_metrics)
         for i, env_ended in enumerate(dones):
             if env_ended:
                 episodic_returns[task_names[i]].append(
                     float(infos["final_info"]["episode"]["r"][i])
                 )
                 if len(episodic_returns[task_names[i]]) <= num_episodes:
-                    successes[task_names[i]] += int(infos["final_info"]["success"][i])
+                    successes[task_names[i]] += int(final_metrics["success"][i])
 
     episodic_returns = {
         task_name: returns[:num_episodes]
@@ -0,0 +1,182 @@
+"""Recomputes the rewards of stored transitions without stepping the simulator.
+
+Meta-World's (v2) rewards are a function of the observation after a step, the
+action, a few per-episode constants and, for most tasks, a few simulator
+quantities that are not part of the observation (e.g. the gripper's pad
+positions or whether it touches the object). Given those, `relabel()`
+recomputes `reward` and the full `info` dict of any number of transitions
+with `SawyerXYZEnv.compute_reward_batch()`.
+
+To make a dataset relabelable, log `env.episode_constants()` once per episode
+(after its first step) and the `required_features()` of the task from
+`env.reward_features()` after every step.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from metaworld.env_dict import (
+    ALL_V3_ENVIRONMENTS,
+    ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE,
+)
+from metaworld.sawyer_xyz_env import SawyerXYZEnv
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""The number of transitions `relabel()` computes at once by default."""
+
+
+class _RecordingMapping(Mapping[str, Any]):
+    """A read-only mapping that records which keys are looked up."""
+
+    def __init__(self, values: Mapping[str, Any]) -> None:
+        self._values = values
+        self.read: set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        self.read.add(key)
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+def _goal_observable_name(env_name: str) -> str:
+    if env_name in ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE:
+        return env_name
+    if env_name not in ALL_V3_ENVIRONMENTS:
+        raise ValueError(f"{env_name} is not a V3 environment")
+    return f"{env_name}-goal-observable"
+
+
+def _env_cls(env_name: str) -> type[SawyerXYZEnv]:
+    return ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[_goal_observable_name(env_name)]
+
+
+def required_features(env_name: str) -> frozenset[str]:
+    """Returns the `reward_features()` a task's reward needs to be recomputed.
+
+    An empty set means the reward only depends on the observation, the action
+    and the episode constants. This creates the task's env and steps it once
+    to find out, and caches the result.
+
+    Args:
+        env_name: The name of the task, e.g. `"pick-place-v3"` or `"pick-place-v3-goal-observable"`.
+
+    Returns:
+        The keys of `SawyerXYZEnv.reward_features()` that `relabel()` needs.
+    """
+    return _required_features(_goal_observable_name(env_name))
+
+
+@functools.lru_cache(maxsize=None)
+def _required_features(env_name: str) -> frozenset[str]:
+    env = _env_cls(env_name)(seed=0)
+    try:
+        env.reset()
+        obs, *_ = env.step(np.zeros(4, dtype=np.float32))
+        features = _RecordingMapping(
+            {
+                key: np.asarray(value)[None]
+                for key, value in env.reward_features().items()
+            }
+        )
+        env.compute_reward_batch(
+            obs[None],
+            np.zeros((1, 4), dtype=np.float32),
+            {
+                key: np.asarray(value)[None]
+                for key, value in env.episode_constants().items()
+            },
+            features,
+        )
+    finally:
+        env.close()
+    return frozenset(features.read)
+
+
+def relabel(
+    env_name: str,
+    actions: npt.ArrayLike,
+    next_obs: npt.ArrayLike,
+    episode_consts: Mapping[str, npt.ArrayLike],
+    features: Mapping[str, npt.ArrayLike] | None = None,
+    episode_index: npt.ArrayLike | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+    """Recomputes the reward and `info` of stored transitions of one task.
+
+    Args:
+        env_name: The name of the task, e.g. `"pick-place-v3"`.
+        actions: The actions, of shape `(N, 4)`.
+        next_obs: The observations returned by each step, of shape `(N, 39)`.
+        episode_consts: The stacked `episode_constants()`, either one row per transition or, with `episode_index`, one row per episode.
+        features: The stacked `reward_features()`, one row per transition. Only the `required_features()` of the task are read.
+        episode_index: Optional index into the rows of `episode_consts` for every transition, of shape `(N,)`.
+        chunk_size: The number of transitions to compute at once.
+
+    Returns:
+        The rewards, of shape `(N,)`, and the `info` dict of `evaluate_state()`
+        with arrays of shape `(N,)` as values.
+    """
+    env_cls = _env_cls(env_name)
+    assert chunk_size > 0, "chunk_size must be positive"
+    next_obs = np.asarray(next_obs, dtype=np.float64)
+    actions = np.asarray(actions)
+    num_transitions = len(next_obs)
+    if next_obs.ndim != 2 or actions.shape != (num_transitions, 4):
+        raise ValueError(
+            f"Expected next_obs of shape (N, 39) and actions of shape (N, 4), got {next_obs.shape} and {actions.shape}"
+        )
+
+    features = features or {}
+    missing = required_features(env_name) - features.keys()
+    if missing:
+        raise ValueError(
+            f"{env_name} needs the simulator features {sorted(missing)} to be relabeled, log them from `reward_features()`."
+        )
+    features = {
+        key: np.asarray(features[key], dtype=np.float64)
+        for key in required_features(env_name)
+    }
+    consts = {
+        key: np.asarray(value, dtype=np.float64)
+        for key, value in episode_consts.items()
+    }
+    if episode_index is not None:
+        episode_index = np.asarray(episode_index)
+        if episode_index.shape != (num_transitions,):
+            raise ValueError(
+                f"Expected episode_index of shape ({num_transitions},), got {episode_index.shape}"
+            )
+
+    rewards = np.empty(num_transitions, dtype=np.float64)
+    info: dict[str, npt.NDArray[np.float64]] = {}
+    for start in range(0, num_transitions, chunk_size):
+        rows = slice(start, start + chunk_size)
+        if episode_index is None:
+            chunk_consts = {key: value[rows] for key, value in consts.items()}
+        else:
+            chunk_consts = {
+                key: value[episode_index[rows]] for key, value in consts.items()
+            }
+        chunk_rewards, chunk_info = env_cls.compute_reward_batch(
+            next_obs[rows],
+            actions[rows],
+            chunk_consts,
+            {key: value[rows] for key, value in features.items()},
+        )
+        rewards[rows] = chunk_rewards
+        for key, value in chunk_info.items():
+            if key not in info:
+                info[key] = np.empty(num_transitions, dtype=np.float64)
+            info[key][rows] = value
+    return rewards, info
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import copy
 import pickle
+from collections import OrderedDict
 from functools import cached_property
-from typing import Any, Callable, Literal, SupportsFloat
+from typing import Any, Callable, Literal, NamedTuple, SupportsFloat
 
 import mujoco
 import numpy as np
@@ -16,12 +17,39 @@ from gymnasium.utils import seeding
 from gymnasium.utils.ezpickle import EzPickle
 from typing_extensions import TypeAlias
 
-from metaworld.types import XYZ, EnvironmentStateDict, ObservationDict, Task
+from metaworld.types import (
+    INFO_DTYPE,
+    INFO_KEYS,
+    XYZ,
+    EnvironmentStateDict,
+    MultiStepResult,
+    ObservationDict,
+    RewardInputs,
+    Task,
+)
 from metaworld.utils import reward_utils
+from metaworld.utils.mujoco_utils import (
+    NameIndex,
+    contact_forces,
+    data_array_fields,
+    find_data_view,
+)
+from metaworld.utils.sampling import MinDistance, sample_rand_vecs
+from metaworld.utils.snapshot_cache import SnapshotCache
+from metaworld.utils.step_cache import StepCache
 
 RenderMode: TypeAlias = "Literal['human', 'rgb_array', 'depth_array']"
 
 
+class _ResetSnapshot(NamedTuple):
+    """The outcome of `reset_model()` for one task, see `SawyerXYZEnv.cache_resets`."""
+
+    data: mujoco.MjData
+    model_arrays: dict[str, npt.NDArray[np.float64]]
+    attributes: dict[str, Any]
+    views: dict[str, tuple[str, int, tuple[int, ...], tuple[int, ...], np.dtype]]
+
+
 class SawyerMocapBase(mjenv_gym):
     """Provides some commonly-shared functions for Sawyer Mujoco envs that use mocap for XYZ control."""
 
@@ -50,6 +78,7 @@ class SawyerMocapBase(mjenv_gym):
         width: int = 480,
         height: int = 480
     ) -> None:
+        self._step_cache = StepCache()
         mjenv_gym.__init__(
             self,
             model_name,
@@ -63,22 +92,45 @@ class SawyerMocapBase(mjenv_gym):
         )
         self.reset_mocap_welds()
         self.frame_skip = frame_skip
+        self._ids = NameIndex(self.model)
+        self._bind_data_views()
+
+    def _bind_data_views(self) -> None:
+        """Caches views into `self.data` for the bodies and sites read every step.
+
+        Must be called again whenever `self.data` is replaced.
+        """
+        self._hand_xpos = self.data.xpos[self._ids.body["hand"]]
+        self._leftclaw_xpos = self.data.xpos[self._ids.body["leftclaw"]]
+        self._rightclaw_xpos = self.data.xpos[self._ids.body["rightclaw"]]
+        self._left_ee_xpos = self.data.site_xpos[self._ids.site["leftEndEffector"]]
+        self._right_ee_xpos = self.data.site_xpos[self._ids.site["rightEndEffector"]]
+
+    def get_body_com(self, body_name: str) -> npt.NDArray[np.float64]:
+        """Returns a view of the position of the given body.
+
+        Args:
+            body_name: The name of the body.
+        """
+        return self.data.xpos[self._ids.body[body_name]]
 
     def get_endeff_pos(self) -> npt.NDArray[Any]:
         """Returns the position of the end effector."""
-        return self.data.body("hand").xpos
+        return self._hand_xpos
 
     @property
     def tcp_center(self) -> npt.NDArray[Any]:
         """The COM of the gripper's 2 fingers.
 
+        Computed at most once per step, see `StepCache`.
+
         Returns:
             3-element position.
         """
-        right_finger_pos = self.data.site("rightEndEffector")
-        left_finger_pos = self.data.site("leftEndEffector")
-        tcp_center = (right_finger_pos.xpos + left_finger_pos.xpos) / 2.0
-        return tcp_center
+        return self._step_cache.get("tcp_center", self._compute_tcp_center)
+
+    def _compute_tcp_center(self) -> npt.NDArray[np.float64]:
+        return (self._right_ee_xpos + self._left_ee_xpos) / 2.0
 
     @property
     def model_name(self) -> str:
@@ -128,6 +180,7 @@ class SawyerMocapBase(mjenv_gym):
             frame_skip=self.frame_skip,
             observation_space=self.sawyer_observation_space,
         )
+        self._bind_data_views()
         self.set_env_state(state["mocap"])
 
     def reset_mocap_welds(self) -> None:
@@ -156,6 +209,49 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
     TARGET_RADIUS: float = 0.05
     """Upper bound for distance from the target when checking for task completion."""
 
+    RAND_VEC_CONSTRAINTS: tuple[MinDistance, ...] = ()
+    """Constraints that every `rand_vec` drawn from `_random_reset_space` must satisfy."""
+
+    RESET_SPACE_NEEDS_MODEL: bool = False
+    """Whether `__init__()` needs the compiled model to define `_random_reset_space`, see `random_reset_space()`."""
+
+    _without_model: bool = False
+    """Set on the instances `random_reset_space()` creates, whose `__init__()` skips loading the model."""
+
+    HAND_SETTLE_CACHE_SIZE: int = 256
+    """The maximum number of settled hand states kept by the hand settle cache."""
+
+    _hand_settle_cache: OrderedDict[tuple, mujoco.MjData] = OrderedDict()
+    """Simulator states after `_reset_hand()`, shared by all envs in the process. See `cache_hand_settle`."""
+
+    reset_cache: SnapshotCache = SnapshotCache(max_bytes=256 * 2**20)
+    """Snapshots of whole resets, shared by all envs in the process. See `cache_resets`."""
+
+    _RESET_MODEL_ARRAYS: tuple[str, ...] = (
+        "body_pos",
+        "body_quat",
+        "site_pos",
+        "site_quat",
+    )
+    """The model fields that `reset_model()` may write to."""
+
+    _RESET_UNCACHED_ATTRIBUTES: frozenset[str] = frozenset(
+        {
+            "curr_path_length",
+            "_last_rand_vec",
+            "_np_random",
+            "_np_random_seed",
+            "_prev_obs",
+            "_obs_obj_layout",
+            "_obs_scratch",
+            "_forward_pending",
+        }
+    )
+    """Attributes that are never restored from a reset snapshot."""
+
+    _reset_written_attributes: dict[type, set[str]] = {}
+    """The attributes each env class was seen to assign during a reset."""
+
     class _Decorators:
         @classmethod
         def assert_task_is_set(cls, func: Callable) -> Callable:
@@ -202,6 +298,13 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         self.mocap_high = np.hstack(mocap_high)
         self.curr_path_length: int = 0
         self.seeded_rand_vec: bool = False
+        self.cache_hand_settle: bool = False
+        self.validate_hand_settle: bool = False
+        self.hand_settle_atol: float = 1e-10
+        self.cache_resets: bool = False
+        self.fast_kinematics: bool = False
+        self.structured_info: bool = False
+        self._forward_pending: bool = False
         self._freeze_rand_vec: bool = True
         self._last_rand_vec: npt.NDArray[Any] | None = None
         self.num_resets: int = 0
@@ -220,6 +323,11 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
 
         self.task_name = self.__class__.__name__
 
+        if self._without_model:
+            # Only the task's declarations (bounds, spaces, constants) that
+            # `__init__()` sets up after this point are wanted.
+            return
+
         super().__init__(
             self.model_name,
             frame_skip=frame_skip,
@@ -250,6 +358,8 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         self._random_reset_space: Box | None = None  # OVERRIDE ME
         self.goal_space: Box | None = None  # OVERRIDE ME
         self._last_stable_obs: npt.NDArray[np.float64] | None = None
+        self._obs_buffer: npt.NDArray[np.float64] | None = None
+        self._info_buffer = np.zeros((), dtype=INFO_DTYPE)
 
         # Note: It is unlikely that the positions and orientations stored
         # in this initiation of _prev_obs are correct. That being said, it
@@ -371,7 +481,23 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         Returns:
             Flat, 3 element array indicating site's location.
         """
-        return self.data.site(site_name).xpos.copy()
+        return self._step_cache.get(
+            ("site", site_name), self._copy_site_pos, site_name
+        )
+
+    def _copy_site_pos(self, site_name: str) -> npt.NDArray[np.float64]:
+        return self.data.site_xpos[self._ids.site[site_name]].copy()
+
+    def _get_joint_qpos(self, joint_name: str) -> np.float64:
+        """Gets the position of a given slide or hinge joint.
+
+        Args:
+            joint_name: The name of the joint.
+
+        Returns:
+            The joint's scalar position.
+        """
+        return self.data.qpos[self.model.jnt_qposadr[self._ids.joint[joint_name]]]
 
     def _set_pos_site(self, name: str, pos: npt.NDArray[Any]) -> None:
         """Sets the position of a given site.
@@ -383,7 +509,7 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         assert isinstance(pos, np.ndarray)
         assert pos.ndim == 1
 
-        self.data.site(name).xpos = pos[:3]
+        self.data.site_xpos[self._ids.site[name]] = pos[:3]
 
     @property
     def _target_site_config(self) -> list[tuple[str, npt.NDArray[Any]]]:
@@ -409,40 +535,18 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         Returns:
             Whether the gripper is touching the object
         """
-
-        leftpad_geom_id = self.data.geom("leftpad_geom").id
-        rightpad_geom_id = self.data.geom("rightpad_geom").id
-
-        leftpad_object_contacts = [
-            x
-            for x in self.data.contact
-            if (
-                leftpad_geom_id in (x.geom1, x.geom2)
-                and object_geom_id in (x.geom1, x.geom2)
-            )
-        ]
-
-        rightpad_object_contacts = [
-            x
-            for x in self.data.contact
-            if (
-                rightpad_geom_id in (x.geom1, x.geom2)
-                and object_geom_id in (x.geom1, x.geom2)
-            )
-        ]
-
-        leftpad_object_contact_force = sum(
-            self.data.efc_force[x.efc_address] for x in leftpad_object_contacts
-        )
-
-        rightpad_object_contact_force = sum(
-            self.data.efc_force[x.efc_address] for x in rightpad_object_contacts
+        self._forward_if_pending()
+        leftpad_force, rightpad_force = contact_forces(
+            self.data,
+            [
+                (self._ids.geom["leftpad_geom"], object_geom_id),
+                (self._ids.geom["rightpad_geom"], object_geom_id),
+            ],
         )
-
-        return 0 < leftpad_object_contact_force and 0 < rightpad_object_contact_force
+        return 0 < leftpad_force and 0 < rightpad_force
 
     def _get_id_main_object(self) -> int:
-        return self.data.geom("objGeom").id
+        return self._ids.geom["objGeom"]
 
     def _get_pos_objects(self) -> npt.NDArray[Any]:
         """Retrieves object position(s) from mujoco properties or instance vars.
@@ -454,6 +558,14 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         # V1 environments don't have to implement it
         raise NotImplementedError
 
+    def _get_pos_objects_cached(self) -> npt.NDArray[Any]:
+        """Returns `_get_pos_objects()`, computed at most once per step.
+
+        Returns:
+            The (read-only during a step) object position(s).
+        """
+        return self._step_cache.get("pos_objects", self._get_pos_objects)
+
     def _get_quat_objects(self) -> npt.NDArray[Any]:
         """Retrieves object quaternion(s) from mujoco properties.
 
@@ -485,10 +597,6 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
 
         pos_hand = self.get_endeff_pos()
 
-        finger_right, finger_left = (
-            self.data.body("rightclaw"),
-            self.data.body("leftclaw"),
-        )
         # the gripper can be at maximum about ~0.1 m apart.
         # dividing by 0.1 normalized the gripper distance between
         # 0 and 1. Further, we clip because sometimes the grippers
@@ -496,11 +604,13 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         # clipping removes the effects of this random extra distance
         # that is produced by mujoco
 
-        gripper_distance_apart = np.linalg.norm(finger_right.xpos - finger_left.xpos)
+        gripper_distance_apart = np.linalg.norm(
+            self._rightclaw_xpos - self._leftclaw_xpos
+        )
         gripper_distance_apart = np.clip(gripper_distance_apart / 0.1, 0.0, 1.0)
 
         obs_obj_padded = np.zeros(self._obs_obj_max_len)
-        obj_pos = self._get_pos_objects()
+        obj_pos = self._get_pos_objects_cached()
         assert len(obj_pos) % 3 == 0
         obj_pos_split = np.split(obj_pos, len(obj_pos) // 3)
 
@@ -512,12 +622,116 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         )
         return np.hstack((pos_hand, gripper_distance_apart, obs_obj_padded))
 
+    def use_obs_buffer(
+        self, enabled: bool = True, out: npt.NDArray[np.float64] | None = None
+    ) -> npt.NDArray[np.float64] | None:
+        """Toggles writing observations into a single preallocated buffer.
+
+        When enabled, `step()` and `reset()` write the observation into the
+        buffer in place (clipping it in place as well) and return the buffer
+        itself instead of a fresh array, so the steady-state step does not
+        allocate new observation arrays. The returned observation is only
+        valid until the next call to `step()` or `reset()`: copy it if it
+        needs to outlive that.
+
+        Args:
+            enabled: Whether to use the buffer.
+            out: An optional caller-supplied C-contiguous float64 buffer of shape `(39,)`, e.g. a row of a batched observation array. Allocated if not given.
+
+        Returns:
+            The buffer, or `None` when disabling.
+        """
+        if not enabled:
+            self._obs_buffer = None
+            return None
+        if out is None:
+            out = np.zeros(self.sawyer_observation_space.shape, dtype=np.float64)
+        if (
+            out.shape != self.sawyer_observation_space.shape
+            or out.dtype != np.float64
+            or not out.flags.c_contiguous
+        ):
+            raise ValueError(
+                "The observation buffer must be a C-contiguous float64 array of "
+                f"shape {self.sawyer_observation_space.shape}."
+            )
+        self._obs_buffer = out
+        # Views into `out` for each part of the observation.
+        curr_len = 4 + self._obs_obj_max_len
+        self._obs_views = {
+            "hand": out[0:3],
+            "curr": out[0:curr_len],
+            "objects": out[4:curr_len],
+            "prev": out[curr_len : 2 * curr_len],
+            "goal": out[2 * curr_len :],
+        }
+        self._obs_obj_layout: (
+            tuple[int, int, npt.NDArray[np.intp], npt.NDArray[np.intp]] | None
+        ) = None
+        self._obs_scratch = np.zeros(3)
+        self._prev_obs = np.array(self._prev_obs, dtype=np.float64)
+        return out
+
+    def _obs_object_layout(
+        self, num_pos: int, num_quat: int
+    ) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+        """Computes where the object positions and quaternions go in the padded object slots.
+
+        Objects are interleaved as `[pos_0, quat_0, pos_1, quat_1, ...]`.
+        """
+        layout = self._obs_obj_layout
+        if layout is None or layout[:2] != (num_pos, num_quat):
+            assert num_pos % 3 == 0 and num_quat % 4 == 0
+            pos_idx, quat_idx = [], []
+            for i in range(num_pos // 3):
+                pos_idx.extend(range(7 * i, 7 * i + 3))
+                quat_idx.extend(range(7 * i + 3, 7 * i + 7))
+            layout = (num_pos, num_quat, np.array(pos_idx), np.array(quat_idx))
+            self._obs_obj_layout = layout
+        return layout[2], layout[3]
+
+    def _write_obs(self) -> npt.NDArray[np.float64]:
+        """Buffer-mode counterpart of `_get_obs()`, writing into `self._obs_buffer`.
+
+        Produces bit-for-bit the same values as `_get_obs()`.
+
+        Returns:
+            The observation buffer.
+        """
+        out = self._obs_buffer
+        assert out is not None
+        views = self._obs_views
+
+        views["hand"][:] = self.get_endeff_pos()
+        diff = np.subtract(
+            self._rightclaw_xpos, self._leftclaw_xpos, out=self._obs_scratch
+        )
+        out[3] = min(max(np.sqrt(diff.dot(diff)) / 0.1, 0.0), 1.0)
+
+        obj_pos = self._get_pos_objects_cached()
+        obj_quat = self._get_quat_objects()
+        pos_idx, quat_idx = self._obs_object_layout(len(obj_pos), len(obj_quat))
+        objects = views["objects"]
+        objects[len(obj_pos) + len(obj_quat) :] = 0.0
+        objects[pos_idx] = obj_pos
+        objects[quat_idx] = obj_quat
+
+        views["prev"][:] = self._prev_obs
+        if self._partially_observable:
+            views["goal"][:] = 0.0
+        else:
+            views["goal"][:] = self._get_pos_goal()
+        self._prev_obs[:] = views["curr"]
+        return out
+
     def _get_obs(self) -> npt.NDArray[np.float64]:
         """Frame stacks `_get_curr_obs_combined_no_goal()` and concatenates the goal position to form a single flat observation.
 
         Returns:
             The flat observation array (39 elements)
         """
+        if self._obs_buffer is not None:
+            return self._write_obs()
         # do frame stacking
         pos_goal = self._get_pos_goal()
         if self._partially_observable:
@@ -584,6 +798,13 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
     ) -> tuple[npt.NDArray[np.float64], SupportsFloat, bool, bool, dict[str, Any]]:
         """Step the environment.
 
+        If `structured_info` is set, the info dict only holds `"metrics"`, a
+        0-d array of dtype `INFO_DTYPE` with the usual info values as fields,
+        so that vector envs merge a single key into an `(N,)` structured array
+        instead of one array per key. Like the observation buffer of
+        `use_obs_buffer()`, it is overwritten by the next step: copy it if it
+        needs to outlive that.
+
         Args:
             action: The action to take. Must be a 4 element array of floats.
 
@@ -591,16 +812,116 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
             The (next_obs, reward, terminated, truncated, info) tuple.
         """
         assert len(action) == 4, f"Actions should be size 4, got {len(action)}"
+        self._apply_action(action)
+        self._simulate(action)
+        obs, reward, terminated, truncated, info = self._finish_step(action)
+        if self.structured_info:
+            self._info_buffer[()] = tuple(info[key] for key in INFO_KEYS)
+            info = {"metrics": self._info_buffer}
+        return obs, reward, terminated, truncated, info
+
+    def step_many(
+        self, actions: npt.NDArray[np.float32], stop_on_success: bool = True
+    ) -> MultiStepResult:
+        """Executes a sequence of actions, e.g. an open-loop plan or a scripted rollout.
+
+        Equivalent to calling `step()` once per action, but without the
+        per-step wrapper dispatch: call it on the unwrapped env. Stops early
+        after the step that truncates the episode or, if `stop_on_success` is
+        set, after the first successful step.
+
+        Args:
+            actions: The actions to take, of shape `(T, 4)`.
+            stop_on_success: Whether to stop after the first successful step.
+
+        Returns:
+            The stacked per-step results, see `MultiStepResult`.
+        """
+        actions = np.asarray(actions)
+        assert (
+            actions.ndim == 2 and actions.shape[1] == 4
+        ), f"Actions should be of shape (T, 4), got {actions.shape}"
+        num_actions = len(actions)
+        observations = np.zeros((num_actions,) + self.observation_space.shape)
+        rewards = np.zeros(num_actions)
+        truncations = np.zeros(num_actions, dtype=np.bool_)
+        successes = np.zeros(num_actions, dtype=np.bool_)
+
+        num_steps = 0
+        for action in actions:
+            self._apply_action(action)
+            self._simulate(action)
+            obs, reward, _, truncate, info = self._finish_step(action)
+            observations[num_steps] = obs
+            rewards[num_steps] = reward
+            truncations[num_steps] = truncate
+            successes[num_steps] = info["success"]
+            num_steps += 1
+            if truncate or (stop_on_success and successes[num_steps - 1]):
+                break
+        return MultiStepResult(observations, rewards, truncations, successes, num_steps)
+
+    def _apply_action(self, action: npt.NDArray[np.float32]) -> None:
+        """First phase of `step()`: moves the mocap body according to the action.
+
+        Args:
+            action: The action to take. Must be a 4 element array of floats.
+        """
         self.set_xyz_action(action[:3])
         if self.curr_path_length >= self.max_path_length:
             raise ValueError("You must reset the env manually once truncate==True")
+
+    def _simulate(self, action: npt.NDArray[np.float32]) -> None:
+        """Second phase of `step()`: advances the physics by `frame_skip` substeps.
+
+        Only touches `self.model` and `self.data`, so it can be run concurrently
+        for environments that do not share an `MjData`.
+
+        Args:
+            action: The action to take. Must be a 4 element array of floats.
+        """
+        if self.fast_kinematics:
+            # Skips the `mj_rnePostConstraint()` of `do_simulation()`: nothing
+            # reads the force quantities (`cacc`, `cfrc_*`) it computes.
+            self.data.ctrl[0] = action[-1]
+            self.data.ctrl[1] = -action[-1]
+            mujoco.mj_step(self.model, self.data, nstep=self.frame_skip)
+            return
         self.do_simulation([action[-1], -action[-1]], n_frames=self.frame_skip)
+
+    def _finish_step(
+        self, action: npt.NDArray[np.float32]
+    ) -> tuple[npt.NDArray[np.float64], SupportsFloat, bool, bool, dict[str, Any]]:
+        """Last phase of `step()`: builds the observation and evaluates the reward.
+
+        The derived quantities `mj_step()` leaves behind belong to the state
+        before its last substep, so they are recomputed first. By default this
+        is a full `mj_forward()`. If `fast_kinematics` is set, only
+        `mj_kinematics()` is run, which is all the observation and most rewards
+        need (body, geom and site poses). The full forward pass is deferred
+        until contact forces are queried through `touching_object()`, if at all
+        during this step. Observations, rewards and the simulation itself are
+        identical in both modes; only fields nothing in Meta-World reads
+        (e.g. `qacc`, `cacc`) are left stale.
+
+        While the observation and reward are computed, the simulator state
+        cannot change, so `self._step_cache` is open: `tcp_center`, site
+        positions and `_get_pos_objects_cached()` are computed at most once.
+
+        Args:
+            action: The action that was taken.
+
+        Returns:
+            The (next_obs, reward, terminated, truncated, info) tuple.
+        """
         self.curr_path_length += 1
 
-        # Running the simulator can sometimes mess up site positions, so
-        # re-position them here to make sure they're accurate
-        for site in self._target_site_config:
-            self._set_pos_site(*site)
+        if not self.fast_kinematics:
+            # Running the simulator can sometimes mess up site positions, so
+            # re-position them here to make sure they're accurate
+            # (`mj_kinematics()` recomputes all site positions either way).
+            for site in self._target_site_config:
+                self._set_pos_site(*site)
 
         if self._did_see_sim_exception:
             assert self._last_stable_obs is not None
@@ -619,9 +940,31 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
                     "unscaled_reward": 0.0,
                 },
             )
-        mujoco.mj_forward(self.model, self.data)
+        if self.fast_kinematics:
+            mujoco.mj_kinematics(self.model, self.data)
+            self._forward_pending = True
+        else:
+            mujoco.mj_forward(self.model, self.data)
+
+        self._step_cache.open()
+        try:
+            return self._evaluate_step(action)
+        finally:
+            self._step_cache.close()
+
+    def _evaluate_step(
+        self, action: npt.NDArray[np.float32]
+    ) -> tuple[npt.NDArray[np.float64], SupportsFloat, bool, bool, dict[str, Any]]:
+        """Builds the observation and evaluates the reward of a step, see `_finish_step()`."""
         self._last_stable_obs = self._get_obs()
 
+        if self._obs_buffer is not None:
+            space = self.sawyer_observation_space
+            np.clip(self._obs_buffer, space.low, space.high, out=self._obs_buffer)
+            reward, info = self.evaluate_state(self._obs_buffer, action)
+            truncate = self.curr_path_length == self.max_path_length
+            return self._obs_buffer, reward, False, truncate, info
+
         self._last_stable_obs = np.clip(
             self._last_stable_obs,
             a_max=self.sawyer_observation_space.high,
@@ -643,6 +986,17 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
             info,
         )
 
+    def _forward_if_pending(self) -> None:
+        """Runs the full forward pass deferred by a `fast_kinematics` step, if any."""
+        if self._forward_pending:
+            mujoco.mj_forward(self.model, self.data)
+            self._forward_pending = False
+
+    def render(self) -> npt.NDArray[np.uint8] | None:
+        """Renders the environment, see `MujocoEnv.render()`."""
+        self._forward_if_pending()
+        return super().render()
+
     def evaluate_state(
         self, obs: npt.NDArray[np.float64], action: npt.NDArray[np.float32]
     ) -> tuple[float, dict[str, Any]]:
@@ -657,6 +1011,70 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         # V1 environments don't have to implement it
         raise NotImplementedError
 
+    def episode_constants(self) -> RewardInputs:
+        """Returns the per-episode quantities `compute_reward_batch()` reads.
+
+        Subclasses add their own to the ones returned here. Some tasks only
+        settle a constant during the first step of an episode, so read them
+        after `step()`.
+
+        Returns:
+            A dict of arrays, see `reward_utils.stack_reward_inputs()` to batch them.
+        """
+        assert (
+            self._target_pos is not None and self.obj_init_pos is not None
+        ), "`reset_model()` must be called before `episode_constants()`."
+        return {
+            "target_pos": np.array(self._target_pos, dtype=np.float64),
+            "obj_init_pos": np.array(self.obj_init_pos, dtype=np.float64),
+            "init_tcp": np.array(self.init_tcp, dtype=np.float64),
+            "hand_init_pos": np.array(self.hand_init_pos, dtype=np.float64),
+        }
+
+    def reward_features(self) -> RewardInputs:
+        """Returns the per-step simulator quantities `compute_reward_batch()` reads.
+
+        These are the parts of the simulator state the reward uses that are not
+        part of the observation. Subclasses add their own to the ones returned
+        here.
+
+        Returns:
+            A dict of arrays, see `reward_utils.stack_reward_inputs()` to batch them.
+        """
+        return {
+            "tcp_center": self.tcp_center,
+            "left_pad": self.get_body_com("leftpad").copy(),
+            "right_pad": self.get_body_com("rightpad").copy(),
+        }
+
+    @classmethod
+    def compute_reward_batch(
+        cls,
+        obs: npt.NDArray[np.float64],
+        action: npt.NDArray[np.float32],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+    ) -> tuple[npt.NDArray[np.float64], dict[str, npt.NDArray[np.float64]]]:
+        """Computes the (v2) reward and `info` of many steps of this task at once.
+
+        A pure, vectorized version of `evaluate_state()`: every row is one step
+        of one env, e.g. one sub-env of a vector env or one transition of a
+        replay buffer. Row `i` gives the reward `evaluate_state()` computed for
+        that step, up to floating point rounding: with float32 actions,
+        `evaluate_state()` rounds some of its terms to single precision.
+
+        Args:
+            obs: The observations, of shape `(N, 39)`.
+            action: The actions, of shape `(N, 4)`.
+            episode_consts: The stacked `episode_constants()` of each row's episode.
+            features: The stacked `reward_features()` of each row's step.
+
+        Returns:
+            The rewards, of shape `(N,)`, and the `info` dict of
+            `evaluate_state()` with arrays of shape `(N,)` as values.
+        """
+        raise NotImplementedError
+
     def reset_model(self) -> npt.NDArray[np.float64]:
         qpos = self.init_qpos
         qvel = self.init_qvel
@@ -672,53 +1090,278 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
             seed: The seed to use. Ignored, use `seed()` instead.
             options: Additional options to pass to the environment. Ignored.
 
+        If `cache_resets` is set and the task is frozen, the outcome of the
+        reset is stored in `reset_cache` keyed by the env class, the model and
+        the task's `rand_vec`. Resetting to the same task again restores the
+        simulator state and the per-episode attributes instead of running
+        `reset_model()`.
+
         Returns:
             The `(obs, info)` tuple.
         """
         self.curr_path_length = 0
-        self.reset_model()
-        obs, info = super().reset()
+        self._forward_pending = False
+        key = self._reset_cache_key() if self.cache_resets else None
+        snapshot = self.reset_cache.get(key) if key is not None else None
+        if snapshot is not None:
+            self._restore_reset_snapshot(snapshot)
+            obs, info = self._get_obs(), self._get_reset_info()
+            if self.render_mode == "human":
+                self.render()
+        else:
+            before = dict(self.__dict__) if key is not None else None
+            self.reset_model()
+            obs, info = super().reset()
+            if before is not None:
+                self._store_reset_snapshot(key, before)
+        if self._obs_buffer is not None:
+            self._prev_obs[:] = obs[:18]
+            obs[18:36] = self._prev_obs
+            return obs, info
         self._prev_obs = obs[:18].copy()
         obs[18:36] = self._prev_obs
         obs = obs.astype(np.float64)
         return obs, info
 
+    def _reset_cache_key(self) -> tuple | None:
+        """Computes the `reset_cache` key of the next reset.
+
+        Returns:
+            The key, or `None` if the next reset samples a new `rand_vec` and
+            can therefore not be cached.
+        """
+        if not self._freeze_rand_vec or self._last_rand_vec is None:
+            return None
+        return (
+            type(self),
+            self.model_name,
+            np.asarray(self._last_rand_vec, dtype=np.float64).tobytes(),
+        )
+
+    def _store_reset_snapshot(self, key: tuple, before: dict[str, Any]) -> None:
+        """Snapshots the outcome of a reset into `reset_cache`.
+
+        The attributes that were (re)assigned during the reset make up the
+        per-episode state. Attributes that are views into `self.data` are
+        stored as their location, so that they can be rebound to the `MjData`
+        of whichever env restores the snapshot.
+
+        Args:
+            key: The key to store the snapshot under.
+            before: A shallow copy of `self.__dict__` from before the reset.
+        """
+        written = self._reset_written_attributes.setdefault(type(self), set())
+        written.update(
+            name
+            for name, value in self.__dict__.items()
+            if name not in before or before[name] is not value
+        )
+        written -= self._RESET_UNCACHED_ATTRIBUTES
+
+        data = mujoco.MjData(self.model)
+        mujoco.mj_copyData(data, self.model, self.data)
+        model_arrays = {
+            name: getattr(self.model, name).copy() for name in self._RESET_MODEL_ARRAYS
+        }
+        fields = data_array_fields(self.data)
+        attributes, views = {}, {}
+        for name in written:
+            value = self.__dict__[name]
+            if isinstance(value, np.ndarray):
+                view = find_data_view(value, self.data, fields)
+                if view is not None:
+                    views[name] = (*view, value.shape, value.strides, value.dtype)
+                    continue
+            attributes[name] = copy.deepcopy(value)
+
+        nbytes = data.nbuffer + data.parena
+        nbytes += sum(array.nbytes for array in model_arrays.values())
+        nbytes += sum(
+            value.nbytes
+            for value in attributes.values()
+            if isinstance(value, np.ndarray)
+        )
+        self.reset_cache.put(
+            key, _ResetSnapshot(data, model_arrays, attributes, views), nbytes
+        )
+
+    def _restore_reset_snapshot(self, snapshot: _ResetSnapshot) -> None:
+        """Restores the simulator state and the per-episode attributes of a reset.
+
+        Args:
+            snapshot: The snapshot to restore, see `_store_reset_snapshot()`.
+        """
+        mujoco.mj_copyData(self.data, self.model, snapshot.data)
+        for name, array in snapshot.model_arrays.items():
+            getattr(self.model, name)[:] = array
+        for name, value in snapshot.attributes.items():
+            self.__dict__[name] = copy.deepcopy(value)
+        for name, (field, offset, shape, strides, dtype) in snapshot.views.items():
+            self.__dict__[name] = np.ndarray(
+                shape,
+                dtype=dtype,
+                buffer=getattr(self.data, field),
+                offset=offset,
+                strides=strides,
+            )
+
     def _reset_hand(self, steps: int = 50) -> None:
         """Resets the hand position.
 
+        If `cache_hand_settle` is set, the settled simulator state is cached and
+        restored on later resets that start from the same state, skipping the
+        settling simulation. With `validate_hand_settle` also set, the hand is
+        always settled and the result is checked against the cache to within
+        `hand_settle_atol`.
+
         Args:
             steps: The number of steps to take to reset the hand.
         """
-        mocap_id = self.model.body_mocapid[self.data.body("mocap").id]
+        key = self._hand_settle_key(steps) if self.cache_hand_settle else None
+        cached = self._hand_settle_cache.get(key) if key is not None else None
+        if cached is not None and not self.validate_hand_settle:
+            self._hand_settle_cache.move_to_end(key)
+            mujoco.mj_copyData(self.data, self.model, cached)
+            self.init_tcp = self.tcp_center
+            return
+
+        mocap_id = self.model.body_mocapid[self._ids.body["mocap"]]
         for _ in range(steps):
             self.data.mocap_pos[mocap_id][:] = self.hand_init_pos
             self.data.mocap_quat[mocap_id][:] = np.array([1, 0, 1, 0])
             self.do_simulation([-1, 1], self.frame_skip)
         self.init_tcp = self.tcp_center
 
+        if cached is not None:
+            self._validate_hand_settle(cached)
+        elif key is not None:
+            settled = mujoco.MjData(self.model)
+            mujoco.mj_copyData(settled, self.model, self.data)
+            self._hand_settle_cache[key] = settled
+            while len(self._hand_settle_cache) > self.HAND_SETTLE_CACHE_SIZE:
+                self._hand_settle_cache.popitem(last=False)
+
+    def _hand_settle_key(self, steps: int) -> tuple | None:
+        """Computes the hand settle cache key for the current simulator state.
+
+        Settling is deterministic given the model, the hand's target and the
+        starting state, so those make up the key. The body and site placements
+        that tasks write into the model are part of it as well. Only states right after
+        `mj_resetData()` (i.e. at time 0) are cached: the first `reset_model()`
+        of every `reset()` starts from the previous episode's final state, which
+        would never be seen again.
+
+        Args:
+            steps: The number of steps `_reset_hand()` takes.
+
+        Returns:
+            The key, or `None` if the current state should not be cached.
+        """
+        if self.data.time != 0.0:
+            return None
+        size = mujoco.mj_stateSize(self.model, mujoco.mjtState.mjSTATE_INTEGRATION)
+        state = np.empty(size)
+        mujoco.mj_getState(
+            self.model, self.data, state, mujoco.mjtState.mjSTATE_INTEGRATION
+        )
+        return (
+            self.model_name,
+            steps,
+            self.frame_skip,
+            np.asarray(self.hand_init_pos, dtype=np.float64).tobytes(),
+            self.model.body_pos.tobytes(),
+            self.model.body_quat.tobytes(),
+            self.model.site_pos.tobytes(),
+            self.model.site_quat.tobytes(),
+            state.tobytes(),
+        )
+
+    def _validate_hand_settle(self, cached: mujoco.MjData) -> None:
+        """Checks that a freshly settled state matches the cached one.
+
+        Args:
+            cached: The cached settled state.
+        """
+        for field in ("qpos", "qvel", "qacc_warmstart", "xpos", "site_xpos"):
+            fresh, expected = getattr(self.data, field), getattr(cached, field)
+            if not np.allclose(fresh, expected, rtol=0.0, atol=self.hand_settle_atol):
+                raise AssertionError(
+                    f"Cached hand settle state differs from a fresh settle in `{field}`, "
+                    f"max abs diff {np.max(np.abs(fresh - expected))}."
+                )
+
     def _get_state_rand_vec(self) -> npt.NDArray[np.float64]:
         """Gets or generates a random vector for the hand position at reset."""
         if self._freeze_rand_vec:
             assert self._last_rand_vec is not None
             return self._last_rand_vec
-        elif self.seeded_rand_vec:
-            assert self._random_reset_space is not None
-            rand_vec = self.np_random.uniform(
-                self._random_reset_space.low,
-                self._random_reset_space.high,
-                size=self._random_reset_space.low.size,
-            )
-            self._last_rand_vec = rand_vec
-            return rand_vec
+        rng = self.np_random if self.seeded_rand_vec else np.random
+        rand_vec = self.sample_rand_vecs(1, rng)[0]
+        self._last_rand_vec = rand_vec
+        return rand_vec
+
+    def sample_rand_vecs(
+        self, num: int, rng: Any, batch_size: int | None = None
+    ) -> npt.NDArray[np.float64]:
+        """Samples `rand_vec`s from `_random_reset_space` that satisfy `RAND_VEC_CONSTRAINTS`.
+
+        Args:
+            num: The number of `rand_vec`s to sample.
+            rng: A `np.random.Generator`, a `np.random.RandomState` or the `np.random` module.
+            batch_size: The number of candidates drawn at a time, see `sample_rand_vecs()`.
+
+        Returns:
+            The `rand_vec`s, of shape `(num, dim)`.
+        """
+        assert self._random_reset_space is not None
+        return sample_rand_vecs(
+            self._random_reset_space.low,
+            self._random_reset_space.high,
+            self.RAND_VEC_CONSTRAINTS,
+            num,
+            rng,
+            batch_size,
+        )
+
+    @classmethod
+    def random_reset_space(cls) -> Box:
+        """Returns the `_random_reset_space` a new instance of this task would have.
+
+        Unless `RESET_SPACE_NEEDS_MODEL` is set, the task's `__init__()` is run
+        without loading and compiling the MuJoCo model, which takes a small
+        fraction of the time of creating the env.
+
+        Returns:
+            The space `rand_vec`s are drawn from.
+        """
+        if cls.RESET_SPACE_NEEDS_MODEL:
+            env = cls()
+            env.close()
         else:
-            assert self._random_reset_space is not None
-            rand_vec: npt.NDArray[np.float64] = np.random.uniform(  # type: ignore
-                self._random_reset_space.low,
-                self._random_reset_space.high,
-                size=self._random_reset_space.low.size,
-            ).astype(np.float64)
-            self._last_rand_vec = rand_vec
-            return rand_vec
+            env = cls.__new__(cls)
+            env._without_model = True
+            env.__init__()  # type: ignore[misc]
+        assert env._random_reset_space is not None
+        return env._random_reset_space
+
+    @classmethod
+    def sample_task_rand_vecs(
+        cls, num: int, rng: Any, batch_size: int | None = None
+    ) -> npt.NDArray[np.float64]:
+        """Samples `rand_vec`s like `sample_rand_vecs()`, without creating an env.
+
+        Args:
+            num: The number of `rand_vec`s to sample.
+            rng: A `np.random.Generator`, a `np.random.RandomState` or the `np.random` module.
+            batch_size: The number of candidates drawn at a time, see `sample_rand_vecs()`.
+
+        Returns:
+            The `rand_vec`s, of shape `(num, dim)`.
+        """
+        space = cls.random_reset_space()
+        return sample_rand_vecs(
+            space.low, space.high, cls.RAND_VEC_CONSTRAINTS, num, rng, batch_size
+        )
 
     def _gripper_caging_reward(
         self,
@@ -801,16 +1444,18 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
         # offers no encouragement for leaving that position in the first place.
         # That part is left to the reward functions of individual environments.
         caging_lr_margin = np.abs(pad_to_objinit_lr - pad_success_thresh)
-        caging_lr = [
-            reward_utils.tolerance(
-                pad_to_obj_lr[i],  # "x" in the description above
-                bounds=(obj_radius, pad_success_thresh),
-                margin=caging_lr_margin[i],  # "margin" in the description above
-                sigmoid="long_tail",
-            )
-            for i in range(2)
-        ]
-        caging_y = reward_utils.hamacher_product(*caging_lr)
+        caging_tolerance = reward_utils.make_tolerance(
+            bounds=(obj_radius, pad_success_thresh), sigmoid="long_tail"
+        )
+        # Evaluated per pad on scalars: NumPy squares scalars with `pow()` but
+        # arrays exactly, so an array call could change the reward's last bit.
+        caging_y = reward_utils.hamacher_product(
+            caging_tolerance(
+                pad_to_obj_lr[0],  # "x" in the description above
+                caging_lr_margin[0],  # "margin" in the description above
+            ).item(),
+            caging_tolerance(pad_to_obj_lr[1], caging_lr_margin[1]).item(),
+        )
 
         # MARK: X-Z gripper information for caging reward-----------------------
         tcp = self.tcp_center
@@ -858,3 +1503,82 @@ class SawyerXYZEnv(SawyerMocapBase, EzPickle):
             caging_and_gripping = (caging_and_gripping + float(reach)) / 2
 
         return caging_and_gripping
+
+    @classmethod
+    def _gripper_caging_reward_batch(
+        cls,
+        action: npt.NDArray[np.float32],
+        obj_pos: npt.NDArray[Any],
+        episode_consts: RewardInputs,
+        features: RewardInputs,
+        obj_radius: float,
+        pad_success_thresh: float,
+        object_reach_radius: float,
+        xz_thresh: float,
+        desired_gripper_effort: float = 1.0,
+        high_density: bool = False,
+        medium_density: bool = False,
+    ) -> npt.NDArray[np.float64]:
+        """Batched `_gripper_caging_reward()`, see `compute_reward_batch()`.
+
+        Args:
+            action: The actions, of shape `(N, 4)`.
+            obj_pos: The object positions, of shape `(N, 3)`.
+            episode_consts: The stacked `episode_constants()`.
+            features: The stacked `reward_features()`.
+            obj_radius: See `_gripper_caging_reward()`.
+            pad_success_thresh: See `_gripper_caging_reward()`.
+            object_reach_radius: See `_gripper_caging_reward()`.
+            xz_thresh: See `_gripper_caging_reward()`.
+            desired_gripper_effort: See `_gripper_caging_reward()`.
+            high_density: See `_gripper_caging_reward()`.
+            medium_density: See `_gripper_caging_reward()`.
+
+        Returns:
+            The rewards, of shape `(N,)`.
+        """
+        if high_density and medium_density:
+            raise ValueError("Can only be either high_density or medium_density")
+        obj_init_pos = episode_consts["obj_init_pos"]
+        init_tcp = episode_consts["init_tcp"]
+
+        pad_y_lr = np.stack(
+            (features["left_pad"][:, 1], features["right_pad"][:, 1]), axis=-1
+        )
+        pad_to_obj_lr = np.abs(pad_y_lr - obj_pos[:, 1:2])
+        pad_to_objinit_lr = np.abs(pad_y_lr - obj_init_pos[:, 1:2])
+        caging_lr_margin = np.abs(pad_to_objinit_lr - pad_success_thresh)
+        caging_lr = reward_utils.make_tolerance(
+            bounds=(obj_radius, pad_success_thresh), sigmoid="long_tail"
+        )(pad_to_obj_lr, caging_lr_margin)
+        caging_y = reward_utils.hamacher_product(caging_lr[:, 0], caging_lr[:, 1])
+
+        tcp = features["tcp_center"]
+        xz = [0, 2]
+        caging_xz_margin = np.linalg.norm(obj_init_pos[:, xz] - init_tcp[:, xz], axis=-1)
+        caging_xz_margin -= xz_thresh
+        caging_xz = reward_utils.make_tolerance(
+            bounds=(0, xz_thresh), sigmoid="long_tail"
+        )(np.linalg.norm(tcp[:, xz] - obj_pos[:, xz], axis=-1), caging_xz_margin)
+
+        gripper_closed = (
+            np.minimum(np.maximum(0, action[:, -1]), desired_gripper_effort)
+            / desired_gripper_effort
+        )
+
+        caging = reward_utils.hamacher_product(caging_y, caging_xz)
+        gripping = np.where(caging > 0.97, gripper_closed, 0.0)
+        caging_and_gripping = reward_utils.hamacher_product(caging, gripping)
+
+        if high_density:
+            caging_and_gripping = (caging_and_gripping + caging) / 2
+        if medium_density:
+            tcp_to_obj = np.linalg.norm(obj_pos - tcp, axis=-1)
+            tcp_to_obj_init = np.linalg.norm(obj_init_pos - init_tcp, axis=-1)
+            reach_margin = np.abs(tcp_to_obj_init - object_reach_radius)
+            reach = reward_utils.make_tolerance(
+                bounds=(0, object_reach_radius), sigmoid="long_tail"
+            )(tcp_to_obj, reach_margin)
+            caging_and_gripping = (caging_and_gripping + reach) / 2
+
+        return caging_and_gripping
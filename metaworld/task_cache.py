@@ -0,0 +1,231 @@
+"""An on-disk, content-addressed cache of the goals benchmarks sample for their tasks.
+
+Building a benchmark samples `_N_GOALS` goals (`rand_vec`s) for each of its
+environments, which needs an instance of every environment class. With a seed,
+the result is deterministic, so it is stored in a small `.npz` file keyed by a
+hash of everything it depends on: the environments and their arguments, the
+seed, the number of goals, the Meta-World version and the source code of every
+module the environment classes are defined in. Later constructions of the same
+benchmark only read that file.
+
+The cache lives in `$METAWORLD_TASK_CACHE_DIR`, or `$XDG_CACHE_HOME/metaworld/tasks`
+(`~/.cache/metaworld/tasks`) if that is not set. Setting
+`METAWORLD_TASK_CACHE_DIR` to an empty string disables the cache.
+
+Caches can be prebuilt with::
+
+    python -m metaworld.task_cache --seeds 0 1 2 --benchmarks MT10 ML10
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+import zipfile
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+CACHE_DIR_ENV_VAR = "METAWORLD_TASK_CACHE_DIR"
+"""The environment variable that overrides (or, if empty, disables) the cache directory."""
+
+FORMAT_VERSION = 1
+"""Bumped whenever the way goals are sampled or stored changes outside of the hashed modules."""
+
+BENCHMARKS = ("MT10", "MT25", "MT50", "ML10", "ML25", "ML45", "MT1", "ML1")
+"""The benchmarks the CLI can prebuild. `MT1` and `ML1` stand for every task."""
+
+
+def get_cache_dir() -> str | None:
+    """Returns the cache directory, or `None` if the cache is disabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if cache_dir is not None:
+        return cache_dir or None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "metaworld", "tasks")
+
+
+def _version() -> str:
+    try:
+        return importlib.metadata.version("metaworld")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_hash(env_cls: type) -> str:
+    """Hashes the source files of an environment class and of its Meta-World base classes.
+
+    Args:
+        env_cls: The environment class.
+
+    Returns:
+        A hex digest that changes whenever any of those files changes.
+    """
+    from metaworld.utils import sampling
+
+    modules = {sys.modules[cls.__module__] for cls in env_cls.__mro__}
+    modules.add(sampling)
+    paths = sorted(
+        inspect.getfile(module)
+        for module in modules
+        if module.__name__.split(".")[0] == "metaworld"
+    )
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(f"{os.path.basename(path)}:{_file_hash(path)}\n".encode())
+    return h.hexdigest()
+
+
+def task_key(
+    classes: Mapping[str, type],
+    args_kwargs: Mapping[str, Mapping[str, Any]],
+    seed: int,
+    num_goals: int,
+) -> str:
+    """Computes the cache key of the goals `metaworld._make_tasks()` samples.
+
+    The goals of each environment depend on the ones sampled before it, so the
+    key covers the whole, ordered set of environments.
+
+    Args:
+        classes: The environment classes.
+        args_kwargs: The environment arguments and keyword arguments, in sampling order.
+        seed: The random seed.
+        num_goals: The number of goals per environment.
+
+    Returns:
+        The key, a hex digest.
+    """
+    h = hashlib.sha256()
+    h.update(f"{FORMAT_VERSION}\n{_version()}\n{seed}\n{num_goals}\n".encode())
+    for env_name, args in args_kwargs.items():
+        # The task ID only determines the one-hot encoding, not the goals.
+        kwargs = {k: v for k, v in args["kwargs"].items() if k != "task_id"}
+        h.update(f"{env_name}\n{sorted(kwargs.items())!r}\n".encode())
+        h.update(f"{code_hash(classes[env_name])}\n".encode())
+    return h.hexdigest()
+
+
+def load(
+    cache_dir: str, key: str, env_names: Sequence[str]
+) -> dict[str, npt.NDArray[np.float64]] | None:
+    """Reads cached goals.
+
+    Args:
+        cache_dir: The cache directory.
+        key: The cache key, see `task_key()`.
+        env_names: The environments the goals must cover.
+
+    Returns:
+        The goals of each environment, or `None` if they are not (completely) cached.
+    """
+    path = os.path.join(cache_dir, f"{key}.npz")
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            goals = {env_name: data[env_name] for env_name in env_names}
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+        return None
+    return goals
+
+
+def save(
+    cache_dir: str, key: str, goals: Mapping[str, npt.NDArray[np.float64]]
+) -> None:
+    """Writes goals to the cache.
+
+    The file is written under a temporary name and then renamed, so concurrent
+    readers and writers never see a partial file. Failing to write the cache
+    only emits a warning.
+
+    Args:
+        cache_dir: The cache directory.
+        key: The cache key, see `task_key()`.
+        goals: The goals of each environment.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **goals)
+            os.replace(tmp_path, os.path.join(cache_dir, f"{key}.npz"))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError as e:
+        warnings.warn(f"Could not write the task cache in {cache_dir}: {e}")
+
+
+def _build(benchmark: str, seed: int) -> None:
+    import metaworld
+
+    if benchmark in ("MT1", "ML1"):
+        for env_name in metaworld.ALL_V3_ENVIRONMENTS:
+            getattr(metaworld, benchmark)(env_name, seed=seed)
+    else:
+        getattr(metaworld, benchmark)(seed=seed)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Prebuilds the task caches of the given benchmarks and seeds."""
+    parser = argparse.ArgumentParser(
+        prog="python -m metaworld.task_cache", description=main.__doc__
+    )
+    parser.add_argument(
+        "--seeds", type=int, nargs="+", required=True, help="The seeds to build."
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=BENCHMARKS,
+        default=BENCHMARKS[:6],
+        help="The benchmarks to build. Defaults to all but MT1 and ML1.",
+    )
+    parser.add_argument(
+        "--cache-dir", help=f"The cache directory. Defaults to {get_cache_dir()}."
+    )
+    parser.add_argument(
+        "--clear", action="store_true", help="Delete the cache directory first."
+    )
+    args = parser.parse_args(argv)
+
+    if args.cache_dir is not None:
+        os.environ[CACHE_DIR_ENV_VAR] = args.cache_dir
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        parser.error(f"The task cache is disabled by an empty {CACHE_DIR_ENV_VAR}.")
+    if args.clear:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    for benchmark in args.benchmarks:
+        for seed in args.seeds:
+            start = time.perf_counter()
+            _build(benchmark, seed)
+            print(
+                f"{benchmark} seed={seed}: {time.perf_counter() - start:.2f}s",
+                flush=True,
+            )
+    print(f"Task cache: {cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
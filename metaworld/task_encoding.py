@@ -0,0 +1,132 @@
+"""The binary encoding of `Task.data`.
+
+A task of one of the `ALL_V3_ENVIRONMENTS` without extra arguments is encoded
+in a fixed layout that is decoded without `pickle`::
+
+    magic (4 bytes, b"MWT1")
+    env index (uint16, into ALL_V3_ENVIRONMENTS)
+    partially observable (uint8)
+    rand_vec length (uint16)
+    rand_vec (float64 each)
+
+all little-endian, i.e. 9 bytes plus 8 per `rand_vec` entry. Any other task
+(e.g. of a custom environment class) is pickled, as all tasks used to be, and
+`decode_task()` reads both.
+"""
+
+from __future__ import annotations
+
+import functools
+import pickle
+import struct
+from typing import Any, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+MAGIC = b"MWT1"
+"""The first bytes of a binary encoded task."""
+
+_HEADER = struct.Struct("<4sHBH")
+
+
+class DecodedTask(NamedTuple):
+    """The contents of `Task.data`."""
+
+    env_cls: type
+    """The environment class the task belongs to."""
+
+    rand_vec: npt.NDArray[np.float64]
+    """The task's goal (and object positions). Read-only, as it is shared between decodes."""
+
+    partially_observable: bool
+    """Whether the goal is hidden from the observation."""
+
+    kwargs: tuple[tuple[str, Any], ...]
+    """Extra keyword arguments of `SawyerXYZEnv._set_task_inner()`."""
+
+
+@functools.lru_cache(maxsize=None)
+def _env_classes() -> tuple[type, ...]:
+    # Imported lazily, as the environments import this module.
+    from metaworld.env_dict import ALL_V3_ENVIRONMENTS
+
+    return tuple(ALL_V3_ENVIRONMENTS.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _env_indices() -> dict[type, int]:
+    return {env_cls: i for i, env_cls in enumerate(_env_classes())}
+
+
+def encode_task(
+    env_cls: type,
+    rand_vec: npt.ArrayLike,
+    partially_observable: bool,
+    **kwargs: Any,
+) -> bytes:
+    """Encodes the data of a task.
+
+    Args:
+        env_cls: The environment class the task belongs to.
+        rand_vec: The task's goal (and object positions).
+        partially_observable: Whether the goal is hidden from the observation.
+        **kwargs: Extra keyword arguments of `SawyerXYZEnv._set_task_inner()`.
+
+    Returns:
+        The binary encoding of the task, or its pickled data if it cannot be
+        encoded in the binary layout.
+    """
+    env_index = _env_indices().get(env_cls)
+    if env_index is None or kwargs:
+        return pickle.dumps(
+            dict(
+                env_cls=env_cls,
+                rand_vec=rand_vec,
+                partially_observable=partially_observable,
+                **kwargs,
+            )
+        )
+    values = np.ascontiguousarray(rand_vec, dtype="<f8").ravel()
+    header = _HEADER.pack(MAGIC, env_index, bool(partially_observable), len(values))
+    return header + values.tobytes()
+
+
+@functools.lru_cache(maxsize=1024)
+def decode_task(data: bytes) -> DecodedTask:
+    """Decodes the data of a task, in either the binary or the pickled encoding.
+
+    Decoded tasks are cached, so switching between a fixed set of tasks does
+    not decode them again.
+
+    Args:
+        data: The `Task.data`.
+
+    Returns:
+        The decoded task.
+    """
+    if data[: len(MAGIC)] == MAGIC:
+        _, env_index, partially_observable, length = _HEADER.unpack_from(data)
+        if len(data) != _HEADER.size + 8 * length:
+            raise ValueError(
+                f"Expected {_HEADER.size + 8 * length} bytes of task data, got {len(data)}"
+            )
+        rand_vec = np.frombuffer(data, dtype="<f8", offset=_HEADER.size)
+        rand_vec = rand_vec.astype(np.float64)
+        rand_vec.flags.writeable = False
+        return DecodedTask(
+            env_cls=_env_classes()[env_index],
+            rand_vec=rand_vec,
+            partially_observable=bool(partially_observable),
+            kwargs=(),
+        )
+
+    kwargs = pickle.loads(data)
+    rand_vec = np.array(kwargs.pop("rand_vec"))
+    rand_vec.flags.writeable = False
+    return DecodedTask(
+        env_cls=kwargs.pop("env_cls"),
+        rand_vec=rand_vec,
+        partially_observable=kwargs.pop("partially_observable"),
+        kwargs=tuple(kwargs.items()),
+    )
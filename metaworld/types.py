@@ -20,6 +20,46 @@ class Task(NamedTuple):
 XYZ: TypeAlias = "Tuple[float, float, float]"
 """A 3D coordinate."""
 
+RewardInputs: TypeAlias = "dict[str, npt.NDArray[np.float64]]"
+"""Named arrays read by `SawyerXYZEnv.compute_reward_batch()`, one row per env."""
+
+INFO_KEYS = (
+    "success",
+    "near_object",
+    "grasp_success",
+    "grasp_reward",
+    "in_place_reward",
+    "obj_to_target",
+    "unscaled_reward",
+)
+"""The keys of the `info` dict every Sawyer task returns from `step()`."""
+
+INFO_DTYPE = np.dtype([(key, np.float64) for key in INFO_KEYS])
+"""The structured dtype of `info["metrics"]` when `SawyerXYZEnv.structured_info` is set."""
+
+
+class MultiStepResult(NamedTuple):
+    """The result of `SawyerXYZEnv.step_many()`.
+
+    All arrays have one row per requested step. Rows from `num_steps` onwards
+    belong to steps that were not executed and are zero.
+    """
+
+    observations: npt.NDArray[np.float64]
+    """The observation after each step, of shape `(T, 39)`."""
+
+    rewards: npt.NDArray[np.float64]
+    """The reward of each step, of shape `(T,)`."""
+
+    truncations: npt.NDArray[np.bool_]
+    """Whether the episode was truncated by each step, of shape `(T,)`."""
+
+    successes: npt.NDArray[np.bool_]
+    """The `success` info of each step, of shape `(T,)`."""
+
+    num_steps: int
+    """The number of steps that were executed."""
+
 
 class EnvironmentStateDict(TypedDict):
     state: dict[str, Any]
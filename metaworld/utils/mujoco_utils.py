@@ -0,0 +1,175 @@
+"""Helpers for working with raw MuJoCo `MjData` buffers."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+import mujoco
+import numpy as np
+import numpy.typing as npt
+
+
+def data_array_fields(data: mujoco.MjData) -> list[str]:
+    """Lists the names of all the array-valued fields of an `MjData`.
+
+    Args:
+        data: The `MjData` to inspect.
+
+    Returns:
+        The field names, e.g. `["qpos", "qvel", ..., "xpos", ...]`.
+    """
+    fields = []
+    for name in dir(data):
+        if name.startswith("_"):
+            continue
+        try:
+            value = getattr(data, name)
+        except Exception:
+            continue
+        if isinstance(value, np.ndarray) and value.size > 0:
+            fields.append(name)
+    return fields
+
+
+def find_data_view(
+    array: npt.NDArray[Any], data: mujoco.MjData, fields: list[str]
+) -> tuple[str, int] | None:
+    """Finds the `MjData` field that `array` is a view into, if any.
+
+    Args:
+        array: The array to look up.
+        data: The `MjData` that may own the memory of `array`.
+        fields: The candidate field names, see `data_array_fields()`.
+
+    Returns:
+        A `(field_name, byte_offset)` tuple, or `None` if `array` does not
+        point into any of the fields of `data`.
+    """
+    if array.base is None:
+        return None
+    address = array.__array_interface__["data"][0]
+    for name in fields:
+        field = getattr(data, name)
+        start = field.__array_interface__["data"][0]
+        if start <= address < start + field.nbytes:
+            return name, address - start
+    return None
+
+
+def rebind_data_view(
+    array: npt.NDArray[Any], field: npt.NDArray[Any], offset: int
+) -> npt.NDArray[Any]:
+    """Builds a view with the same layout as `array` into another `MjData` field.
+
+    Args:
+        array: The original view.
+        field: The field of the new `MjData` to point into.
+        offset: The byte offset of `array` inside its original field.
+
+    Returns:
+        The new view.
+    """
+    return np.ndarray(
+        array.shape,
+        dtype=array.dtype,
+        buffer=field,
+        offset=offset,
+        strides=array.strides,
+    )
+
+
+def rebind_attributes(
+    attributes: dict[str, Any],
+    old_data: mujoco.MjData,
+    new_data: mujoco.MjData,
+    fields: list[str] | None = None,
+) -> dict[str, Any]:
+    """Copies an attribute dict so that it no longer aliases `old_data`.
+
+    Arrays that are live views into `old_data` (e.g. the result of
+    `env.get_body_com(...)`) are re-pointed at the same location in
+    `new_data`, other arrays are copied and mutable containers are deep-copied.
+    Everything else is shared.
+
+    Args:
+        attributes: The attributes to copy, usually an env's `__dict__`.
+        old_data: The `MjData` the attributes currently refer to.
+        new_data: The `MjData` the copied attributes should refer to.
+        fields: The candidate field names, see `data_array_fields()`.
+
+    Returns:
+        The copied attribute dict.
+    """
+    if fields is None:
+        fields = data_array_fields(old_data)
+    copied = {}
+    for key, value in attributes.items():
+        if isinstance(value, np.ndarray):
+            view = find_data_view(value, old_data, fields)
+            if view is None:
+                copied[key] = value.copy()
+            else:
+                name, offset = view
+                copied[key] = rebind_data_view(value, getattr(new_data, name), offset)
+        elif isinstance(value, (list, dict, set)):
+            copied[key] = copy.deepcopy(value)
+        else:
+            copied[key] = value
+    return copied
+
+
+class NameIndex:
+    """Name-to-id tables for the named objects of an `MjModel`.
+
+    Resolving `data.body("hand")` by name goes through MuJoCo's named accessor
+    machinery on every call. These tables are built once per model so that hot
+    paths can index the raw `MjData` arrays directly, e.g.
+    `data.xpos[index.body["hand"]]`.
+    """
+
+    def __init__(self, model: mujoco.MjModel) -> None:
+        self.body = _name_table(model, mujoco.mjtObj.mjOBJ_BODY, model.nbody)
+        self.geom = _name_table(model, mujoco.mjtObj.mjOBJ_GEOM, model.ngeom)
+        self.site = _name_table(model, mujoco.mjtObj.mjOBJ_SITE, model.nsite)
+        self.joint = _name_table(model, mujoco.mjtObj.mjOBJ_JOINT, model.njnt)
+
+
+def _name_table(model: mujoco.MjModel, obj_type: int, count: int) -> dict[str, int]:
+    table = {}
+    for i in range(count):
+        name = mujoco.mj_id2name(model, obj_type, i)
+        if name:
+            table[name] = i
+    return table
+
+
+def contact_forces(
+    data: mujoco.MjData, geom_pairs: npt.ArrayLike
+) -> npt.NDArray[np.float64]:
+    """Sums the normal contact force between each of the given pairs of geoms.
+
+    Works on the active contacts' `geom1`, `geom2` and `efc_address` arrays
+    with NumPy masks, so all pairs are resolved in one pass over the contacts.
+    The order of the geoms within a pair does not matter.
+
+    Args:
+        data: The `MjData` to query.
+        geom_pairs: The geom id pairs, of shape `(num_pairs, 2)`.
+
+    Returns:
+        The summed contact force for each pair, of shape `(num_pairs,)`.
+    """
+    pairs = np.asarray(geom_pairs).reshape(-1, 2)
+    if data.ncon == 0:
+        return np.zeros(len(pairs))
+    contact = data.contact
+    geom1 = contact.geom1[:, None]
+    geom2 = contact.geom2[:, None]
+    first, second = pairs[:, 0], pairs[:, 1]
+    # (ncon, num_pairs): whether contact i touches both geoms of pair j.
+    matches = ((geom1 == first) | (geom2 == first)) & (
+        (geom1 == second) | (geom2 == second)
+    )
+    forces = data.efc_force[contact.efc_address]
+    return np.where(matches, forces[:, None], 0.0).sum(axis=0)
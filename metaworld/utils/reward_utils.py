@@ -1,7 +1,8 @@
 """A set of reward utilities written by the authors of dm_control."""
 from __future__ import annotations
 
-from typing import Any, Literal, TypeVar
+import functools
+from typing import Any, Callable, Literal, Mapping, Sequence, TypeVar
 
 import numpy as np
 import numpy.typing as npt
@@ -24,17 +25,16 @@ SIGMOID_TYPE = Literal[
 X = TypeVar("X", float, npt.NDArray, np.floating)
 
 
-def _sigmoids(x: X, value_at_1: float, sigmoid: SIGMOID_TYPE) -> X:
-    """Maps the input to values between 0 and 1 using a specified sigmoid function. Returns 1 when the input is 0, between 0 and 1 otherwise.
+@functools.lru_cache(maxsize=None)
+def _sigmoid_fn(sigmoid: SIGMOID_TYPE, value_at_1: float) -> Callable[[X], X]:
+    """Compiles a sigmoid, precomputing its scale.
 
     Args:
-        x: The input.
-        value_at_1: The output value when `x` == 1. Must be between 0 and 1.
-        sigmoid: Choice of sigmoid type. Valid values are 'gaussian', 'hyperbolic',
-        'long_tail', 'reciprocal', 'cosine', 'linear', 'quadratic', 'tanh_squared'.
+        sigmoid: Choice of sigmoid type, see `_sigmoids()`.
+        value_at_1: The output value when `x` == 1, see `_sigmoids()`.
 
     Returns:
-        The input mapped to values between 0.0 and 1.0.
+        A function mapping an input (a scalar or an array) to values between 0 and 1.
 
     Raises:
         ValueError: If not 0 < `value_at_1` < 1, except for `linear`, `cosine` and
@@ -54,46 +54,149 @@ def _sigmoids(x: X, value_at_1: float, sigmoid: SIGMOID_TYPE) -> X:
 
     if sigmoid == "gaussian":
         scale = np.sqrt(-2 * np.log(value_at_1))
-        return np.exp(-0.5 * (x * scale) ** 2)
+        return lambda x: np.exp(-0.5 * (x * scale) ** 2)
 
     elif sigmoid == "hyperbolic":
         scale = np.arccosh(1 / value_at_1)
-        return 1 / np.cosh(x * scale)
+        return lambda x: 1 / np.cosh(x * scale)
 
     elif sigmoid == "long_tail":
         scale = np.sqrt(1 / value_at_1 - 1)
-        return 1 / ((x * scale) ** 2 + 1)
+        return lambda x: 1 / ((x * scale) ** 2 + 1)
 
     elif sigmoid == "reciprocal":
         scale = 1 / value_at_1 - 1
-        return 1 / (abs(x) * scale + 1)
+        return lambda x: 1 / (abs(x) * scale + 1)
 
     elif sigmoid == "cosine":
         scale = np.arccos(2 * value_at_1 - 1) / np.pi
-        scaled_x = x * scale
-        ret = np.where(abs(scaled_x) < 1, (1 + np.cos(np.pi * scaled_x)) / 2, 0.0)
-        return ret.item() if np.isscalar(x) else ret
+
+        def cosine(x):
+            scaled_x = x * scale
+            return np.where(abs(scaled_x) < 1, (1 + np.cos(np.pi * scaled_x)) / 2, 0.0)
+
+        return cosine
 
     elif sigmoid == "linear":
         scale = 1 - value_at_1
-        scaled_x = x * scale
-        ret = np.where(abs(scaled_x) < 1, 1 - scaled_x, 0.0)
-        return ret.item() if np.isscalar(x) else ret
+
+        def linear(x):
+            scaled_x = x * scale
+            return np.where(abs(scaled_x) < 1, 1 - scaled_x, 0.0)
+
+        return linear
 
     elif sigmoid == "quadratic":
         scale = np.sqrt(1 - value_at_1)
-        scaled_x = x * scale
-        ret = np.where(abs(scaled_x) < 1, 1 - scaled_x**2, 0.0)
-        return ret.item() if np.isscalar(x) else ret
+
+        def quadratic(x):
+            scaled_x = x * scale
+            return np.where(abs(scaled_x) < 1, 1 - scaled_x**2, 0.0)
+
+        return quadratic
 
     elif sigmoid == "tanh_squared":
         scale = np.arctanh(np.sqrt(1 - value_at_1))
-        return 1 - np.tanh(x * scale) ** 2
+        return lambda x: 1 - np.tanh(x * scale) ** 2
 
     else:
         raise ValueError(f"Unknown sigmoid type {sigmoid!r}.")
 
 
+def _sigmoids(x: X, value_at_1: float, sigmoid: SIGMOID_TYPE) -> X:
+    """Maps the input to values between 0 and 1 using a specified sigmoid function. Returns 1 when the input is 0, between 0 and 1 otherwise.
+
+    Args:
+        x: The input.
+        value_at_1: The output value when `x` == 1. Must be between 0 and 1.
+        sigmoid: Choice of sigmoid type. Valid values are 'gaussian', 'hyperbolic',
+        'long_tail', 'reciprocal', 'cosine', 'linear', 'quadratic', 'tanh_squared'.
+
+    Returns:
+        The input mapped to values between 0.0 and 1.0.
+
+    Raises:
+        ValueError: If not 0 < `value_at_1` < 1, except for `linear`, `cosine` and
+        `quadratic` sigmoids which allow `value_at_1` == 0.
+        ValueError: If `sigmoid` is of an unknown type.
+    """
+    ret = _sigmoid_fn(sigmoid, value_at_1)(x)
+    if np.isscalar(x) and isinstance(ret, np.ndarray):
+        return ret.item()
+    return ret
+
+
+def make_tolerance(
+    bounds: tuple[float, float] = (0.0, 0.0),
+    sigmoid: SIGMOID_TYPE = "gaussian",
+    value_at_margin: float = _DEFAULT_VALUE_AT_MARGIN,
+) -> Callable[[X, float | npt.NDArray[np.float64]], npt.NDArray[np.float64]]:
+    """Compiles `tolerance()` for fixed bounds and sigmoid.
+
+    The sigmoid's scale is computed once per `(sigmoid, value_at_margin)`. The
+    returned function takes `x` and `margin`, either of which may be an array
+    (e.g. one entry per env), and evaluates all of them in one pass. A zero
+    entry of an array `margin` yields a hard 0/1 tolerance for that entry.
+    For scalar inputs, the results equal those of `tolerance()`. Array entries
+    may differ from the scalar results in the last bit, as NumPy squares
+    arrays exactly but scalars with `pow()`.
+
+    Args:
+        bounds: Inclusive `(lower, upper)` bounds of the target interval, see `tolerance()`.
+        sigmoid: Choice of sigmoid type, see `tolerance()`.
+        value_at_margin: The output when the distance from `x` to the nearest bound is equal to `margin`.
+
+    Returns:
+        A function `(x, margin) -> value` returning an array with values between 0.0 and 1.0.
+
+    Raises:
+        ValueError: If `bounds[0] > bounds[1]`.
+    """
+    lower, upper = bounds
+    if lower > upper:
+        raise ValueError("Lower bound must be <= upper bound.")
+
+    def compiled(
+        x: X, margin: float | npt.NDArray[np.float64] = 0.0
+    ) -> npt.NDArray[np.float64]:
+        if np.ndim(margin) == 0:
+            if margin < 0:
+                raise ValueError(
+                    f"`margin` must be non-negative. Current value: {margin}"
+                )
+            return _tolerance(x, lower, upper, margin, sigmoid, value_at_margin)
+
+        margin = np.asarray(margin)
+        if (margin < 0).any():
+            raise ValueError(f"`margin` must be non-negative. Current value: {margin}")
+        in_bounds = np.logical_and(lower <= x, x <= upper)
+        soft = margin > 0
+        if not soft.any():
+            return np.where(in_bounds, 1.0, 0.0)
+        # Divide by 1 where the margin is zero, those entries are masked below.
+        d = np.where(x < lower, lower - x, x - upper) / np.where(soft, margin, 1.0)
+        value = np.where(soft, _sigmoid_fn(sigmoid, value_at_margin)(d), 0.0)
+        return np.where(in_bounds, 1.0, value)
+
+    return compiled
+
+
+def _tolerance(
+    x: X,
+    lower: float,
+    upper: float,
+    margin: float | np.floating[Any],
+    sigmoid: SIGMOID_TYPE,
+    value_at_margin: float,
+) -> npt.NDArray[np.float64]:
+    """`tolerance()` for a validated scalar `margin`, without unwrapping the result."""
+    in_bounds = np.logical_and(lower <= x, x <= upper)
+    if margin == 0:
+        return np.where(in_bounds, 1.0, 0.0)
+    d = np.where(x < lower, lower - x, x - upper) / margin
+    return np.where(in_bounds, 1.0, _sigmoid_fn(sigmoid, value_at_margin)(d))
+
+
 def tolerance(
     x: X,
     bounds: tuple[float, float] = (0.0, 0.0),
@@ -134,13 +237,7 @@ def tolerance(
     if margin < 0:
         raise ValueError(f"`margin` must be non-negative. Current value: {margin}")
 
-    in_bounds = np.logical_and(lower <= x, x <= upper)
-    if margin == 0:
-        value = np.where(in_bounds, 1.0, 0.0)
-    else:
-        d = np.where(x < lower, lower - x, x - upper) / margin
-        value = np.where(in_bounds, 1.0, _sigmoids(d, value_at_margin, sigmoid))
-
+    value = _tolerance(x, lower, upper, margin, sigmoid, value_at_margin)
     return value.item() if np.isscalar(x) else value
 
 
@@ -187,10 +284,11 @@ def rect_prism_tolerance(
     curr: npt.NDArray[np.float_],
     zero: npt.NDArray[np.float_],
     one: npt.NDArray[np.float_],
-) -> float:
+) -> float | npt.NDArray[np.float64]:
     """Computes a reward if curr is inside a rectangular prism region.
 
-    All inputs are 3D points with shape (3,).
+    All inputs are 3D points with shape (3,), or batches of them with shape
+    (N, 3), in which case one reward per point is returned.
 
     Args:
         curr: The point that the prism reward region is being applied for.
@@ -200,6 +298,15 @@ def rect_prism_tolerance(
     Returns:
         A reward if curr is inside the prism, 1.0 otherwise.
     """
+    if np.ndim(curr) > 1 or np.ndim(zero) > 1 or np.ndim(one) > 1:
+        curr, zero, one = np.asarray(curr), np.asarray(zero), np.asarray(one)
+        in_prism = np.all(
+            (np.minimum(zero, one) <= curr) & (curr <= np.maximum(zero, one)), axis=-1
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scales = (curr - zero) / (one - zero)
+        prod = scales[..., 0] * scales[..., 1] * scales[..., 2]
+        return np.where(in_prism, prod, 1.0)
 
     def in_range(a, b, c):
         return float(b <= a <= c) if c >= b else float(c <= a <= b)
@@ -219,10 +326,11 @@ def rect_prism_tolerance(
         return 1.0
 
 
-def hamacher_product(a: float, b: float) -> float:
+def hamacher_product(a: X, b: X) -> X:
     """Returns the hamacher (t-norm) product of a and b.
 
-    Computes (a * b) / ((a + b) - (a * b)).
+    Computes (a * b) / ((a + b) - (a * b)). Either term may be an array, in
+    which case the product is computed elementwise.
 
     Args:
         a: 1st term of the hamacher product.
@@ -234,6 +342,21 @@ def hamacher_product(a: float, b: float) -> float:
     Raises:
         ValueError: a and b must range between 0 and 1
     """
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        a, b = np.asarray(a), np.asarray(b)
+        if not (((0.0 <= a) & (a <= 1.0)).all() and ((0.0 <= b) & (b <= 1.0)).all()):
+            raise ValueError(f"a ({a}) and b ({b}) must range between 0 and 1")
+        numerator = a * b
+        denominator = a + b - numerator
+        h_prod = np.divide(
+            numerator,
+            denominator,
+            out=np.zeros(np.broadcast(a, b).shape),
+            where=denominator > 0,
+        )
+        assert ((0.0 <= h_prod) & (h_prod <= 1.0)).all()
+        return h_prod
+
     if not ((0.0 <= a <= 1.0) and (0.0 <= b <= 1.0)):
         raise ValueError(f"a ({b}) and b ({b}) must range between 0 and 1")
 
@@ -242,3 +365,20 @@ def hamacher_product(a: float, b: float) -> float:
 
     assert 0.0 <= h_prod <= 1.0
     return h_prod
+
+
+def stack_reward_inputs(
+    inputs: Sequence[Mapping[str, npt.ArrayLike]],
+) -> dict[str, npt.NDArray[np.float64]]:
+    """Stacks per-env `episode_constants()` or `reward_features()` into batches.
+
+    Args:
+        inputs: One dict per env (or step), all with the same keys.
+
+    Returns:
+        A dict mapping each key to an array with one row per input.
+    """
+    return {
+        key: np.stack([np.asarray(entry[key], dtype=np.float64) for entry in inputs])
+        for key in inputs[0]
+    }
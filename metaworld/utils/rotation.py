@@ -34,6 +34,7 @@ from __future__ import annotations
 import itertools
 from typing import Any
 
+import mujoco
 import numpy as np
 import numpy.typing as npt
 
@@ -233,6 +234,48 @@ def mat2quat(mat: npt.ArrayLike) -> npt.NDArray[np.float64]:
     return q
 
 
+def mat2quat_xyzw(
+    mat: npt.NDArray[np.float64], out: npt.NDArray[np.float64] | None = None
+) -> npt.NDArray[np.float64]:
+    """Converts a single rotation matrix to an `(x, y, z, w)` quaternion.
+
+    A fast, unbatched replacement for
+    `scipy.spatial.transform.Rotation.from_matrix(mat).as_quat()` for reading
+    MuJoCo's `xmat`s every step. The conversion is done by `mju_mat2Quat()`,
+    and the sign follows scipy's convention: the component picked by the
+    largest of `(mat[0, 0], mat[1, 1], mat[2, 2], trace)` is positive.
+
+    Args:
+        mat: The rotation matrix, either as a flat `(9,)` array (e.g. a row of `data.geom_xmat`) or of shape `(3, 3)`.
+        out: An optional `(4,)` float64 array to write the quaternion into.
+
+    Returns:
+        The quaternion in scalar-last order, i.e. `out` if it was given.
+    """
+    mat = mat.reshape(9)
+    if out is None:
+        out = np.empty(4)
+    mujoco.mju_mat2Quat(out, mat)
+    # MuJoCo's quaternions are scalar-first.
+    w = out[0]
+    out[:3] = out[1:]
+    out[3] = w
+    m00, m11, m22 = mat[0], mat[4], mat[8]
+    trace = m00 + m11 + m22
+    # The first of the largest, like `np.argmax()`.
+    if m00 >= m11 and m00 >= m22 and m00 >= trace:
+        choice = 0
+    elif m11 >= m22 and m11 >= trace:
+        choice = 1
+    elif m22 >= trace:
+        choice = 2
+    else:
+        choice = 3
+    if out[choice] < 0:
+        np.negative(out, out=out)
+    return out
+
+
 def quat2euler(quat: npt.ArrayLike) -> npt.NDArray[np.float64]:
     """Converts quaternions to euler angles.
 
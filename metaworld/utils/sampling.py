@@ -0,0 +1,110 @@
+"""Batched sampling of task `rand_vec`s under declarative constraints."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+class MinDistance(NamedTuple):
+    """Requires two parts of a `rand_vec` to be at least `min_distance` apart.
+
+    E.g. `MinDistance(slice(0, 2), slice(3, 5), 0.15)` keeps the xy position of
+    the object (the first 3 entries) 15cm away from the xy position of the goal
+    (the last 3 entries).
+    """
+
+    first: slice
+    """The entries of the `rand_vec` to measure from."""
+
+    second: slice | tuple[float, ...]
+    """The entries of the `rand_vec` to measure to, or a fixed point."""
+
+    min_distance: float
+    """The minimum Euclidean distance between `first` and `second`."""
+
+    def satisfied(self, rand_vecs: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+        """Checks the constraint for a batch of `rand_vec`s.
+
+        Args:
+            rand_vecs: The `rand_vec`s, of shape `(num, dim)`.
+
+        Returns:
+            A boolean mask of shape `(num,)`.
+        """
+        if isinstance(self.second, slice):
+            second = rand_vecs[:, self.second]
+        else:
+            second = np.asarray(self.second)
+        distance = np.linalg.norm(rand_vecs[:, self.first] - second, axis=-1)
+        return distance >= self.min_distance
+
+
+def sample_rand_vecs(
+    low: npt.NDArray[np.float64],
+    high: npt.NDArray[np.float64],
+    constraints: Sequence[MinDistance],
+    num: int,
+    rng: Any,
+    batch_size: int | None = None,
+) -> npt.NDArray[np.float64]:
+    """Draws `rand_vec`s uniformly from a box, subject to constraints.
+
+    Candidates are drawn `batch_size` at a time with a single call to
+    `rng.uniform()` and filtered with the vectorized constraints. A draw of
+    shape `(batch_size, dim)` consumes the random stream in the same order as
+    `batch_size` draws of shape `(dim,)`, and candidates drawn past the last
+    accepted one are handed back to `rng`. The samples and the final state of
+    `rng` are therefore exactly those of a rejection loop that draws one
+    candidate at a time.
+
+    Args:
+        low: The lower bounds of the box, of shape `(dim,)`.
+        high: The upper bounds of the box, of shape `(dim,)`.
+        constraints: The constraints every sample has to satisfy.
+        num: The number of samples.
+        rng: A `np.random.Generator`, a `np.random.RandomState` or the `np.random` module.
+        batch_size: The number of candidates drawn at a time. Defaults to `max(2 * num, 16)`.
+
+    Returns:
+        The samples, of shape `(num, dim)`.
+    """
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    if batch_size is None:
+        batch_size = max(2 * num, 16)
+    accepted: list[npt.NDArray[np.float64]] = []
+    count = 0
+    while count < num:
+        state = _get_rng_state(rng)
+        candidates = rng.uniform(low, high, size=(batch_size, low.size)).astype(
+            np.float64
+        )
+        mask = np.ones(batch_size, dtype=np.bool_)
+        for constraint in constraints:
+            mask &= constraint.satisfied(candidates)
+        (indices,) = np.nonzero(mask)
+        if count + len(indices) >= num:
+            # Rewind to just after the last candidate that is used.
+            used = indices[num - count - 1] + 1
+            _set_rng_state(rng, state)
+            rng.uniform(size=used * low.size)
+            indices = indices[: num - count]
+        accepted.append(candidates[indices])
+        count += len(indices)
+    return np.concatenate(accepted)
+
+
+def _get_rng_state(rng: Any) -> Any:
+    if isinstance(rng, np.random.Generator):
+        return rng.bit_generator.state
+    return rng.get_state()
+
+
+def _set_rng_state(rng: Any, state: Any) -> None:
+    if isinstance(rng, np.random.Generator):
+        rng.bit_generator.state = state
+    else:
+        rng.set_state(state)
@@ -0,0 +1,78 @@
+"""A size-bounded LRU cache for simulator snapshots."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class SnapshotCache:
+    """A least-recently-used cache whose capacity is a byte budget.
+
+    Every entry is stored together with its size in bytes. Inserting an entry
+    evicts the least recently used ones until the total size fits into
+    `max_bytes` again. Lookups are counted in `hits` and `misses`.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Creates an empty cache.
+
+        Args:
+            max_bytes: The memory budget of the cache, in bytes.
+        """
+        assert max_bytes >= 0, "max_bytes must be non-negative"
+        self.max_bytes = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.nbytes: int = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Any | None:
+        """Looks up an entry and marks it as the most recently used one.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            The cached value, or `None` on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        """Inserts an entry, evicting the least recently used ones if needed.
+
+        Entries larger than `max_bytes` are not stored.
+
+        Args:
+            key: The key of the entry.
+            value: The value to cache.
+            nbytes: The size of `value` in bytes.
+        """
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def clear(self) -> None:
+        """Removes all entries and resets the hit and miss counters."""
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
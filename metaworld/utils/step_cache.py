@@ -0,0 +1,63 @@
+"""A cache for quantities derived from the simulator state within one step."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+
+class StepCache:
+    """Memoizes values derived from the simulator state while it cannot change.
+
+    The cache is only active between `open()` and `close()`, i.e. while a step
+    builds its observation and evaluates its reward after the physics ran.
+    Outside of that window `get()` computes every value afresh, so code that
+    moves bodies (e.g. `reset_model()`) never sees stale values.
+
+    Cached arrays are made read-only, so that a caller modifying a shared value
+    in place fails loudly instead of corrupting the other readers' view of it.
+    `counts` records how many times each key was computed since the last
+    `open()`.
+    """
+
+    def __init__(self) -> None:
+        self.active: bool = False
+        self.counts: Counter[Hashable] = Counter()
+        self._values: dict[Hashable, Any] = {}
+
+    def open(self) -> None:
+        """Starts caching, discarding the values and counts of the previous step."""
+        self._values.clear()
+        self.counts.clear()
+        self.active = True
+
+    def close(self) -> None:
+        """Stops caching and discards the cached values. `counts` is kept."""
+        self._values.clear()
+        self.active = False
+
+    def get(self, key: Hashable, compute: Callable[..., Any], *args: Any) -> Any:
+        """Returns the cached value of `key`, computing it if needed.
+
+        Args:
+            key: The key of the value.
+            compute: A function computing the value from the current simulator state.
+            *args: Arguments for `compute`.
+
+        Returns:
+            The value.
+        """
+        if not self.active:
+            return compute(*args)
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value = compute(*args)
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        self._values[key] = value
+        self.counts[key] += 1
+        return value
@@ -226,7 +226,9 @@ class AutoTerminateOnSuccessWrapper(gym.Wrapper):
     def step(self, action):
         obs, reward, terminated, truncated, info = self.env.step(action)
         if self.terminate_on_success:
-            terminated = info["success"] == 1.0
+            # Sawyer envs in `structured_info` mode report it in `info["metrics"]`.
+            metrics = info.get("metrics", info)
+            terminated = bool(metrics["success"] == 1.0)
         return obs, reward, terminated, truncated, info
 
 
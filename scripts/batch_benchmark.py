@@ -0,0 +1,87 @@
+"""Compares SawyerXYZBatchEnv against the per-env ways of stepping N worlds.
+
+* `loop`: a Python loop over N unwrapped envs.
+* `sync`: a `SyncVectorEnv` over N envs wrapped like `make_mt_envs()` does.
+* `batch`: a single `SawyerXYZBatchEnv` with N worlds.
+
+Usage: python scripts/batch_benchmark.py [--num-envs N] [--steps T] [env_name ...]
+"""
+
+import argparse
+import time
+from functools import partial
+
+import gymnasium as gym
+import numpy as np
+
+import metaworld
+from metaworld.batch import SawyerXYZBatchEnv
+
+SEED = 42
+
+
+def bench_loop(env_cls, tasks, actions):
+    envs = []
+    for task in tasks:
+        env = env_cls()
+        env.set_task(task)
+        env.reset()
+        envs.append(env)
+    start = time.perf_counter()
+    for step_actions in actions:
+        for env, action in zip(envs, step_actions):
+            _, _, _, truncated, _ = env.step(action)
+            if truncated:
+                env.reset()
+    return time.perf_counter() - start
+
+
+def bench_sync(env_cls, tasks, actions):
+    envs = gym.vector.SyncVectorEnv(
+        [partial(metaworld._init_each_env, env_cls, [task]) for task in tasks],
+        autoreset_mode=gym.vector.AutoresetMode.SAME_STEP,
+    )
+    envs.reset(seed=SEED)
+    start = time.perf_counter()
+    for step_actions in actions:
+        envs.step(step_actions)
+    elapsed = time.perf_counter() - start
+    envs.close()
+    return elapsed
+
+
+def bench_batch(env_cls, tasks, actions):
+    envs = SawyerXYZBatchEnv(env_cls, len(tasks), tasks=tasks)
+    envs.reset(seed=SEED)
+    start = time.perf_counter()
+    for step_actions in actions:
+        envs.step(step_actions)
+    elapsed = time.perf_counter() - start
+    envs.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("env_names", nargs="*", default=["reach-v3", "pick-place-v3"])
+    parser.add_argument("--num-envs", type=int, default=16)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'env':<20} {'loop':>8} {'sync':>8} {'batch':>8}  (seconds)")
+    for env_name in args.env_names:
+        benchmark = metaworld.MT1(env_name, seed=SEED)
+        env_cls = benchmark.train_classes[env_name]
+        tasks = benchmark.train_tasks[: args.num_envs]
+        actions = np.random.default_rng(SEED).uniform(
+            -1, 1, size=(args.steps, len(tasks), 4)
+        )
+        times = [
+            bench(env_cls, tasks, actions)
+            for bench in (bench_loop, bench_sync, bench_batch)
+        ]
+        print(f"{env_name:<20} " + " ".join(f"{t:8.2f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
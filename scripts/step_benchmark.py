@@ -0,0 +1,76 @@
+"""Measures the per-step cost of every V3 environment.
+
+Two numbers are reported per env, both in microseconds and both the best of
+`--repeats` runs to filter out scheduler noise:
+
+* `step`: the mean wall time of a full `env.step()`.
+* `python`: the mean wall time of the Python side of a step, i.e.
+  `_get_obs()` followed by `evaluate_state()` without advancing the physics.
+  This is where the per-step name lookups live.
+
+Run it on two checkouts to compare them.
+
+Usage: python scripts/step_benchmark.py [--steps N] [--repeats R] [env_name ...]
+
+Env names may be given with or without the `-goal-observable` suffix.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from metaworld.env_dict import ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE
+
+SEED = 42
+
+
+def time_env(env_name: str, steps: int) -> tuple[float, float]:
+    """Returns the mean wall times of a full step and of its Python side, in microseconds."""
+    if not env_name.endswith("-goal-observable"):
+        env_name = f"{env_name}-goal-observable"
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name](seed=SEED)
+    env.max_path_length = steps + 1
+    env.reset()
+    actions = np.random.default_rng(SEED).uniform(-1, 1, size=(steps, 4))
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    step_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for action in actions:
+        env.evaluate_state(env._get_obs(), action)
+    python_time = time.perf_counter() - start
+
+    env.close()
+    return step_time / steps * 1e6, python_time / steps * 1e6
+
+
+def best_time(env_name: str, steps: int, repeats: int) -> tuple[float, float]:
+    """Returns the best of `repeats` runs of `time_env()`."""
+    runs = [time_env(env_name, steps) for _ in range(repeats)]
+    return min(run[0] for run in runs), min(run[1] for run in runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("env_names", nargs="*", help="Defaults to all 50 envs.")
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    env_names = args.env_names or sorted(ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE)
+    times = []
+    print(f"{'env':<45} {'step':>8} {'python':>8}  (us/step)")
+    for env_name in env_names:
+        step_us, python_us = best_time(env_name, args.steps, args.repeats)
+        times.append((step_us, python_us))
+        print(f"{env_name:<45} {step_us:8.1f} {python_us:8.1f}")
+    mean_step, mean_python = np.mean(times, axis=0)
+    print(f"{'mean':<45} {mean_step:8.1f} {mean_python:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from metaworld.env_dict import ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE
+from metaworld.policies import ENV_POLICY_MAP
+from metaworld.utils.reward_utils import stack_reward_inputs
+
+NUM_STEPS = 150
+
+
+def _rollout(env_name, seed, noise):
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name](seed=seed)
+    policy = ENV_POLICY_MAP[env_name.replace("-goal-observable", "")]()
+    rng = np.random.default_rng(seed)
+    obs, _ = env.reset()
+    steps = []
+    for _ in range(NUM_STEPS):
+        # Some policies modify the observation they are given.
+        action = policy.get_action(obs.copy()) + rng.normal(scale=noise, size=4)
+        action = np.clip(action, -1.0, 1.0)
+        obs, reward, _, _, info = env.step(action)
+        steps.append(
+            (
+                obs.copy(),
+                action,
+                env.episode_constants(),
+                env.reward_features(),
+                reward,
+                info,
+            )
+        )
+    return type(env), steps
+
+
+@pytest.mark.parametrize("env_name", sorted(ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE.keys()))
+def test_compute_reward_batch_matches_evaluate_state(env_name):
+    # A scripted rollout with little noise mostly solves the task, one with a
+    # lot of noise mostly does not: together they cover most reward branches.
+    env_cls, steps = _rollout(env_name, seed=1, noise=0.1)
+    steps += _rollout(env_name, seed=2, noise=1.0)[1]
+    obs, action, consts, features, rewards, infos = zip(*steps)
+
+    batch_rewards, batch_info = env_cls.compute_reward_batch(
+        np.stack(obs),
+        np.stack(action),
+        stack_reward_inputs(consts),
+        stack_reward_inputs(features),
+    )
+    np.testing.assert_allclose(batch_rewards, rewards, rtol=1e-9, atol=1e-12)
+    assert batch_info.keys() == infos[0].keys()
+    for key in infos[0]:
+        expected = np.array([info[key] for info in infos], dtype=np.float64)
+        np.testing.assert_allclose(
+            batch_info[key], expected, rtol=1e-9, atol=1e-12, err_msg=key
+        )
+
+
+def test_compute_reward_batch_across_envs():
+    env_name = "pick-place-v3-goal-observable"
+    env_cls = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name]
+    envs = [env_cls(seed=seed) for seed in range(4)]
+    policy = ENV_POLICY_MAP["pick-place-v3"]()
+    observations = [env.reset()[0] for env in envs]
+    for _ in range(50):
+        actions = np.stack([policy.get_action(obs.copy()) for obs in observations])
+        results = [env.step(a) for env, a in zip(envs, actions)]
+        observations = [result[0] for result in results]
+        rewards, info = env_cls.compute_reward_batch(
+            np.stack(observations),
+            actions,
+            stack_reward_inputs([env.episode_constants() for env in envs]),
+            stack_reward_inputs([env.reward_features() for env in envs]),
+        )
+        # The policy's actions are float32, which `step()` keeps some terms in.
+        np.testing.assert_allclose(
+            rewards, [result[1] for result in results], rtol=1e-6, atol=1e-12
+        )
+        np.testing.assert_array_equal(
+            info["success"], [result[4]["success"] for result in results]
+        )
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from metaworld.env_dict import ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE
+from metaworld.policies import ENV_POLICY_MAP
+
+NUM_STEPS = 200
+
+
+@pytest.mark.parametrize("env_name", sorted(ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE.keys()))
+def test_fast_kinematics_matches_default(env_name):
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name](seed=3)
+    policy = ENV_POLICY_MAP[env_name.replace("-goal-observable", "")]()
+    rng = np.random.default_rng(0)
+
+    # Record a noisy scripted rollout in the default mode, so that it both
+    # grasps the objects and wanders off the policy's path.
+    obs, _ = env.reset()
+    actions, steps = [], []
+    for _ in range(NUM_STEPS):
+        # Some policies modify the observation they are given.
+        action = policy.get_action(obs.copy()) + rng.normal(scale=0.1, size=4)
+        action = np.clip(action, -1.0, 1.0)
+        obs, reward, _, _, info = env.step(action)
+        actions.append(action)
+        steps.append((obs.copy(), reward, info, env.data.qpos.copy()))
+
+    fast_env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name](seed=3)
+    fast_env.fast_kinematics = True
+    fast_obs, _ = fast_env.reset()
+    for action, (obs, reward, info, qpos) in zip(actions, steps):
+        fast_obs, fast_reward, _, _, fast_info = fast_env.step(action)
+        np.testing.assert_array_equal(fast_obs, obs)
+        assert fast_reward == reward
+        assert fast_info == info
+        np.testing.assert_array_equal(fast_env.data.qpos, qpos)
+
+
+def test_fast_kinematics_defers_forward():
+    # reach-v3 does not query contact forces in its reward.
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE["reach-v3-goal-observable"](seed=0)
+    env.fast_kinematics = True
+    default_env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE["reach-v3-goal-observable"](
+        seed=0
+    )
+    action = np.array([0.0, 0.0, -1.0, 1.0])
+    for e in (env, default_env):
+        e.reset()
+        e.step(action)
+    assert env._forward_pending
+
+    assert env.touching_main_object == default_env.touching_main_object
+    assert not env._forward_pending
+    np.testing.assert_array_equal(env.data.qacc, default_env.data.qacc)
+
+    env.step(action)
+    assert env._forward_pending
+    env.reset()
+    assert not env._forward_pending
@@ -1,8 +1,16 @@
+import pickle
 import random
 
+import gymnasium as gym
+import mujoco
+import pytest
 import numpy as np
 
 import metaworld
+from metaworld.env_dict import ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE
+from metaworld.policies import ENV_POLICY_MAP
+from metaworld.sawyer_xyz_env import SawyerXYZEnv
+from metaworld.types import INFO_DTYPE, INFO_KEYS
 
 
 def test_reset_returns_same_obj_and_goal():
@@ -43,3 +51,301 @@ def test_reset_returns_same_obj_and_goal():
             violating_envs_goals.append(env_name)
     assert not violating_envs_obs
     assert not violating_envs_goals
+
+
+def test_name_index_matches_mujoco():
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE["pick-place-v3-goal-observable"](seed=0)
+    tables = {
+        mujoco.mjtObj.mjOBJ_BODY: env._ids.body,
+        mujoco.mjtObj.mjOBJ_GEOM: env._ids.geom,
+        mujoco.mjtObj.mjOBJ_SITE: env._ids.site,
+        mujoco.mjtObj.mjOBJ_JOINT: env._ids.joint,
+    }
+    for obj_type, table in tables.items():
+        assert table
+        for name, obj_id in table.items():
+            assert mujoco.mj_name2id(env.model, obj_type, name) == obj_id
+
+
+def test_cached_views_follow_data():
+    def assert_views_match(env):
+        np.testing.assert_array_equal(env._hand_xpos, env.data.body("hand").xpos)
+        np.testing.assert_array_equal(
+            env._left_ee_xpos, env.data.site("leftEndEffector").xpos
+        )
+        assert np.shares_memory(env._hand_xpos, env.data.xpos)
+        assert np.shares_memory(env._left_ee_xpos, env.data.site_xpos)
+
+    benchmark = metaworld.MT1("reach-v3", seed=0)
+    env = benchmark.train_classes["reach-v3"]()
+    env.set_task(benchmark.train_tasks[0])
+    env.reset()
+    assert_views_match(env)
+    env.step(np.ones(4))
+    assert_views_match(env)
+
+    restored = pickle.loads(pickle.dumps(env))
+    assert_views_match(restored)
+    restored.step(np.ones(4))
+    assert_views_match(restored)
+
+
+@pytest.mark.parametrize(
+    "env_name", ["reach-v3", "pick-place-v3", "stick-pull-v3", "assembly-v3"]
+)
+def test_obs_buffer_matches_default(env_name):
+    benchmark = metaworld.MT1(env_name, seed=0)
+    envs = []
+    for _ in range(2):
+        env = benchmark.train_classes[env_name]()
+        env.set_task(benchmark.train_tasks[0])
+        envs.append(env)
+    default_env, buffered_env = envs
+    out = np.empty((2, 39))
+    buffer = buffered_env.use_obs_buffer(out=out[1])
+    assert np.shares_memory(buffer, out)
+
+    obs, _ = default_env.reset()
+    buffered_obs, _ = buffered_env.reset()
+    assert buffered_obs is buffer
+    np.testing.assert_array_equal(buffered_obs, obs)
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        action = rng.uniform(-1, 1, size=4)
+        obs, reward, _, truncated, info = default_env.step(action)
+        buffered_obs, buffered_reward, _, buffered_truncated, buffered_info = (
+            buffered_env.step(action)
+        )
+        assert buffered_obs is buffer
+        np.testing.assert_array_equal(buffered_obs, obs)
+        assert buffered_reward == reward
+        assert buffered_truncated == truncated
+        assert buffered_info == info
+
+    buffered_env.use_obs_buffer(False)
+    obs, *_ = default_env.step(np.zeros(4))
+    unbuffered_obs, *_ = buffered_env.step(np.zeros(4))
+    assert unbuffered_obs is not buffer
+    np.testing.assert_array_equal(unbuffered_obs, obs)
+
+
+@pytest.mark.parametrize("env_name", ["reach-v3", "pick-place-v3", "drawer-open-v3"])
+def test_hand_settle_cache_matches_default(env_name):
+    benchmark = metaworld.MT1(env_name, seed=0)
+    tasks = benchmark.train_tasks[:3]
+    default_env = benchmark.train_classes[env_name]()
+    cached_env = benchmark.train_classes[env_name]()
+    cached_env.cache_hand_settle = True
+
+    rng = np.random.default_rng(0)
+    for task in tasks * 2:
+        default_env.set_task(task)
+        cached_env.set_task(task)
+        obs, _ = default_env.reset()
+        cached_obs, _ = cached_env.reset()
+        np.testing.assert_array_equal(cached_obs, obs)
+        np.testing.assert_array_equal(cached_env.init_tcp, default_env.init_tcp)
+        for _ in range(10):
+            action = rng.uniform(-1, 1, size=4)
+            obs, reward, *_ = default_env.step(action)
+            cached_obs, cached_reward, *_ = cached_env.step(action)
+            np.testing.assert_array_equal(cached_obs, obs)
+            assert cached_reward == reward
+
+    cached_env.validate_hand_settle = True
+    cached_env.reset()
+
+
+def test_hand_settle_cache_validation_detects_mismatch():
+    benchmark = metaworld.MT1("reach-v3", seed=0)
+    env = benchmark.train_classes["reach-v3"]()
+    env.set_task(benchmark.train_tasks[0])
+    env.cache_hand_settle = True
+    env.reset()
+
+    env.validate_hand_settle = True
+    for cached in env._hand_settle_cache.values():
+        cached.qpos[0] += 1.0
+    try:
+        with pytest.raises(AssertionError):
+            env.reset()
+    finally:
+        env._hand_settle_cache.clear()
+
+
+def _episode_attributes(env):
+    return {
+        name: value
+        for name, value in env.__dict__.items()
+        if isinstance(value, (np.ndarray, float, int, bool)) and name != "cache_resets"
+    }
+
+
+@pytest.mark.parametrize(
+    "env_name", ["reach-v3", "pick-place-v3", "door-open-v3", "coffee-pull-v3"]
+)
+def test_reset_cache_matches_default(env_name):
+    benchmark = metaworld.MT1(env_name, seed=0)
+    tasks = benchmark.train_tasks[:3]
+    env_cls = benchmark.train_classes[env_name]
+    SawyerXYZEnv.reset_cache.clear()
+    try:
+        # Fill the cache from another env, so that the views stored in the
+        # snapshots have to be rebound to `cached_env.data`.
+        warm_env = env_cls()
+        warm_env.cache_resets = True
+        for task in tasks:
+            warm_env.set_task(task)
+            warm_env.reset()
+        assert SawyerXYZEnv.reset_cache.misses == len(tasks)
+
+        default_env = env_cls()
+        cached_env = env_cls()
+        cached_env.cache_resets = True
+        rng = np.random.default_rng(0)
+        for task in tasks * 2:
+            default_env.set_task(task)
+            cached_env.set_task(task)
+            obs, _ = default_env.reset()
+            cached_obs, _ = cached_env.reset()
+            np.testing.assert_array_equal(cached_obs, obs)
+            default_attributes = _episode_attributes(default_env)
+            cached_attributes = _episode_attributes(cached_env)
+            assert cached_attributes.keys() == default_attributes.keys()
+            for name, value in default_attributes.items():
+                np.testing.assert_array_equal(cached_attributes[name], value)
+            np.testing.assert_array_equal(
+                cached_env.model.body_pos, default_env.model.body_pos
+            )
+            for _ in range(10):
+                action = rng.uniform(-1, 1, size=4)
+                obs, reward, *_ = default_env.step(action)
+                cached_obs, cached_reward, *_ = cached_env.step(action)
+                np.testing.assert_array_equal(cached_obs, obs)
+                assert cached_reward == reward
+        assert SawyerXYZEnv.reset_cache.hits == 2 * len(tasks)
+        assert SawyerXYZEnv.reset_cache.misses == len(tasks)
+        # Live views such as `init_left_pad` must point into the env's own data.
+        assert np.shares_memory(cached_env.init_left_pad, cached_env.data.xpos)
+    finally:
+        SawyerXYZEnv.reset_cache.clear()
+
+
+def test_reset_cache_memory_cap():
+    benchmark = metaworld.MT1("reach-v3", seed=0)
+    env = benchmark.train_classes["reach-v3"]()
+    env.cache_resets = True
+    max_bytes = SawyerXYZEnv.reset_cache.max_bytes
+    SawyerXYZEnv.reset_cache.clear()
+    try:
+        env.set_task(benchmark.train_tasks[0])
+        env.reset()
+        snapshot_bytes = SawyerXYZEnv.reset_cache.nbytes
+        assert len(SawyerXYZEnv.reset_cache) == 1 and snapshot_bytes > 0
+
+        SawyerXYZEnv.reset_cache.max_bytes = 2 * snapshot_bytes
+        for task in benchmark.train_tasks[1:4]:
+            env.set_task(task)
+            env.reset()
+        assert len(SawyerXYZEnv.reset_cache) == 2
+        assert SawyerXYZEnv.reset_cache.nbytes <= 2 * snapshot_bytes
+    finally:
+        SawyerXYZEnv.reset_cache.max_bytes = max_bytes
+        SawyerXYZEnv.reset_cache.clear()
+
+
+@pytest.mark.parametrize("env_name", ["reach-v3", "pick-place-v3", "door-open-v3"])
+def test_step_many_matches_step(env_name):
+    benchmark = metaworld.MT1(env_name, seed=0)
+    task = benchmark.train_tasks[0]
+    env = benchmark.train_classes[env_name]()
+    env.set_task(task)
+    obs, _ = env.reset()
+    policy = ENV_POLICY_MAP[env_name]()
+    actions, observations, rewards, successes = [], [], [], []
+    for _ in range(env.max_path_length):
+        action = policy.get_action(obs)
+        obs, reward, _, truncated, info = env.step(action)
+        actions.append(action)
+        # Some policies modify the observation they are given.
+        observations.append(obs.copy())
+        rewards.append(reward)
+        successes.append(bool(info["success"]))
+        if truncated:
+            break
+
+    # Replay the recorded actions open loop.
+    env.reset()
+    result = env.step_many(np.array(actions), stop_on_success=False)
+    assert result.num_steps == len(actions)
+    np.testing.assert_array_equal(result.observations, observations)
+    np.testing.assert_array_equal(result.rewards, rewards)
+    np.testing.assert_array_equal(result.successes, successes)
+    assert result.truncations[-1] and not result.truncations[:-1].any()
+
+    env.reset()
+    result = env.step_many(np.array(actions))
+    assert any(successes), "the scripted policy should solve the task"
+    first_success = successes.index(True)
+    assert result.num_steps == first_success + 1
+    np.testing.assert_array_equal(
+        result.observations[: result.num_steps], observations[: result.num_steps]
+    )
+    assert not result.observations[result.num_steps :].any()
+    assert env.curr_path_length == result.num_steps
+
+
+def test_structured_info_matches_dict_info():
+    benchmark = metaworld.MT1("pick-place-v3", seed=0)
+    envs = []
+    for structured_info in (False, True):
+        env = benchmark.train_classes["pick-place-v3"]()
+        env.set_task(benchmark.train_tasks[0])
+        env.structured_info = structured_info
+        env.reset()
+        envs.append(env)
+    policy = ENV_POLICY_MAP["pick-place-v3"]()
+    obs, _ = envs[0].reset()
+    envs[1].reset()
+    for _ in range(50):
+        action = policy.get_action(obs.copy())
+        obs, reward, _, _, info = envs[0].step(action)
+        structured_obs, structured_reward, _, _, structured = envs[1].step(action)
+        np.testing.assert_array_equal(structured_obs, obs)
+        assert structured_reward == reward
+        assert structured.keys() == {"metrics"}
+        assert structured["metrics"].dtype == INFO_DTYPE
+        for key in INFO_KEYS:
+            assert structured["metrics"][key] == info[key]
+
+
+def test_structured_info_vector_env():
+    envs = gym.make_vec(
+        "Meta-World/custom-mt-envs",
+        vector_strategy="sync",
+        envs_list=["reach-v3", "push-v3"],
+        seed=0,
+        structured_info=True,
+    )
+    envs.reset()
+    _, _, _, _, infos = envs.step(envs.action_space.sample())
+    assert infos["metrics"].shape == (2,)
+    assert infos["metrics"].dtype == INFO_DTYPE
+    assert infos["_metrics"].all()
+    envs.close()
+
+
+@pytest.mark.parametrize("env_name", sorted(ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE.keys()))
+def test_step_cache_computes_each_quantity_once(env_name):
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name](seed=0)
+    policy = ENV_POLICY_MAP[env_name.replace("-goal-observable", "")]()
+    obs, _ = env.reset()
+    for _ in range(20):
+        obs, *_ = env.step(policy.get_action(obs.copy()))
+        assert env._step_cache.counts["pos_objects"] == 1
+        assert max(env._step_cache.counts.values()) == 1
+    assert not env._step_cache.active
+    # Outside of a step, values are always computed afresh.
+    assert env.tcp_center is not env.tcp_center
+    assert env.tcp_center.flags.writeable
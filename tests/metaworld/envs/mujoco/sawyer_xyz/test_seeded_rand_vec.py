@@ -1,5 +1,6 @@
 import random
 
+import mujoco
 import numpy as np
 import pytest
 
@@ -25,3 +26,47 @@ def test_observations_match(env_name):
         assert r1 == r2
         assert not done1
         assert not done2
+
+
+@pytest.mark.parametrize(
+    "env_name",
+    [
+        "reach-v3-goal-observable",
+        "sweep-into-v3-goal-observable",
+        "door-open-v3-goal-observable",
+    ],
+)
+def test_sample_rand_vecs_matches_resets(env_name):
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name]()
+    env._freeze_rand_vec = False
+    env.seeded_rand_vec = True
+    env.seed(0)
+    rand_vecs = []
+    for _ in range(5):
+        env.reset()
+        rand_vecs.append(env._last_rand_vec)
+
+    # Every reset samples twice, see `metaworld._make_tasks()`.
+    env.seed(0)
+    np.testing.assert_array_equal(
+        env.sample_rand_vecs(10, env.np_random)[1::2], rand_vecs
+    )
+
+
+@pytest.mark.parametrize("env_name", sorted(ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE.keys()))
+def test_sample_task_rand_vecs_matches_env(env_name, monkeypatch):
+    env_cls = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[env_name]
+    env = env_cls()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The model should not be loaded.")
+
+    with monkeypatch.context() as m:
+        m.setattr(mujoco.MjModel, "from_xml_path", fail)
+        space = env_cls.random_reset_space()
+        rand_vecs = env_cls.sample_task_rand_vecs(10, np.random.RandomState(0))
+    np.testing.assert_array_equal(space.low, env._random_reset_space.low)
+    np.testing.assert_array_equal(space.high, env._random_reset_space.high)
+    np.testing.assert_array_equal(
+        rand_vecs, env.sample_rand_vecs(10, np.random.RandomState(0))
+    )
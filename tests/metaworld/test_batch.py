@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import metaworld
+from metaworld.batch import SawyerXYZBatchEnv
+
+NUM_ENVS = 3
+MAX_PATH_LENGTH = 20
+
+
+@pytest.mark.parametrize(
+    "env_name",
+    [
+        "reach-v3",
+        "pick-place-v3",
+        "button-press-topdown-v3",
+        "door-lock-v3",
+        "basketball-v3",
+    ],
+)
+def test_batch_matches_single_envs(env_name):
+    benchmark = metaworld.MT1(env_name, seed=42)
+    env_cls = benchmark.train_classes[env_name]
+    tasks = benchmark.train_tasks[:NUM_ENVS]
+
+    batch = SawyerXYZBatchEnv(env_cls, NUM_ENVS, tasks=tasks, num_threads=2)
+    singles = []
+    for task in tasks:
+        env = env_cls()
+        env.set_task(task)
+        singles.append(env)
+    for env in [*batch.worlds, *singles]:
+        env.max_path_length = MAX_PATH_LENGTH
+
+    obs, _ = batch.reset()
+    assert obs.shape == (NUM_ENVS, 39)
+    for i, env in enumerate(singles):
+        single_obs, _ = env.reset()
+        np.testing.assert_array_equal(obs[i], single_obs)
+
+    rng = np.random.default_rng(0)
+    needs_reset = np.zeros(NUM_ENVS, dtype=bool)
+    for _ in range(2 * MAX_PATH_LENGTH + 2):
+        actions = rng.uniform(-1, 1, size=(NUM_ENVS, 4)).astype(np.float32)
+        obs, rewards, terminated, truncated, infos = batch.step(actions)
+        for i, env in enumerate(singles):
+            if needs_reset[i]:
+                single_obs, _ = env.reset()
+                single_reward, single_truncated, success = 0.0, False, None
+            else:
+                single_obs, single_reward, _, single_truncated, info = env.step(
+                    actions[i]
+                )
+                success = info["success"]
+                assert infos["success"][i] == success
+            np.testing.assert_array_equal(obs[i], single_obs)
+            assert rewards[i] == single_reward
+            assert truncated[i] == single_truncated
+            assert not terminated[i]
+            needs_reset[i] = single_truncated
+    batch.close()
+
+
+def test_batch_reset_mask():
+    benchmark = metaworld.MT1("reach-v3", seed=42)
+    env_cls = benchmark.train_classes["reach-v3"]
+    batch = SawyerXYZBatchEnv(
+        env_cls, NUM_ENVS, tasks=benchmark.train_tasks[:NUM_ENVS], num_threads=1
+    )
+    obs, _ = batch.reset()
+    stepped, *_ = batch.step(np.ones((NUM_ENVS, 4), dtype=np.float32))
+
+    mask = np.array([True, False, False])
+    obs_after, _ = batch.reset(options={"reset_mask": mask})
+    np.testing.assert_array_equal(obs_after[0], obs[0])
+    np.testing.assert_array_equal(obs_after[1:], stepped[1:])
+    batch.close()
+
+
+def test_batch_reset_seed():
+    benchmark = metaworld.MT1("reach-v3", seed=42)
+    env_cls = benchmark.train_classes["reach-v3"]
+
+    def _reset_goals(seed):
+        batch = SawyerXYZBatchEnv(env_cls, NUM_ENVS, num_threads=1)
+        for world in batch.worlds:
+            world._freeze_rand_vec = False
+            world.seeded_rand_vec = True
+            world._set_task_called = True
+        batch.reset(seed=seed)
+        batch.close()
+        return np.stack([world._target_pos for world in batch.worlds])
+
+    goals = _reset_goals(seed=0)
+    np.testing.assert_array_equal(goals, _reset_goals(seed=0))
+    assert len(np.unique(goals, axis=0)) == NUM_ENVS
@@ -150,3 +150,22 @@ def test_metalearning_evaluation(benchmark):
         agent.step_calls
         == num_evals * adaptation_steps * adaptation_episodes * max_episode_steps
     )
+
+
+@pytest.mark.parametrize("structured_info", (False, True))
+def test_evaluation_structured_info(structured_info):
+    SEED = 42
+    envs = gym.make_vec(
+        "Meta-World/custom-mt-envs",
+        vector_strategy="sync",
+        envs_list=["reach-v3", "push-v3", "drawer-close-v3"],
+        seed=SEED,
+        max_episode_steps=300,
+        structured_info=structured_info,
+    )
+    agent = ScriptedPolicyAgent(envs)
+    mean_success_rate, _, success_rate_per_task, _ = evaluation.evaluation(
+        agent, envs, num_episodes=5
+    )
+    assert len(success_rate_per_task) == envs.num_envs
+    assert mean_success_rate >= 0.80
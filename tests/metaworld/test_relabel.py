@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from metaworld.env_dict import ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE
+from metaworld.policies import ENV_POLICY_MAP
+from metaworld.relabel import relabel, required_features
+from metaworld.utils.reward_utils import stack_reward_inputs
+
+
+def _collect(env_name, num_episodes=2, num_steps=100):
+    """Collects a dataset the way `metaworld.relabel` asks it to be logged."""
+    env = ALL_V3_ENVIRONMENTS_GOAL_OBSERVABLE[f"{env_name}-goal-observable"](seed=0)
+    policy = ENV_POLICY_MAP[env_name]()
+    keys = required_features(env_name)
+    actions, next_obs, features, rewards, infos = [], [], [], [], []
+    episode_consts, episode_index = [], []
+    for episode in range(num_episodes):
+        obs, _ = env.reset()
+        for step in range(num_steps):
+            # `step()` keeps some reward terms in the action's dtype.
+            action = np.clip(policy.get_action(obs.copy()), -1.0, 1.0).astype(
+                np.float64
+            )
+            obs, reward, _, _, info = env.step(action)
+            if step == 0:
+                episode_consts.append(env.episode_constants())
+            actions.append(action)
+            next_obs.append(obs.copy())
+            features.append(
+                {k: v for k, v in env.reward_features().items() if k in keys}
+            )
+            rewards.append(reward)
+            infos.append(info)
+            episode_index.append(episode)
+    return (
+        np.stack(actions),
+        np.stack(next_obs),
+        stack_reward_inputs(episode_consts),
+        stack_reward_inputs(features),
+        np.array(episode_index),
+        np.array(rewards),
+        infos,
+    )
+
+
+@pytest.mark.parametrize("env_name", ["pick-place-v3", "reach-v3", "door-unlock-v3"])
+def test_relabel_matches_step(env_name):
+    actions, next_obs, consts, features, episode_index, rewards, infos = _collect(
+        env_name
+    )
+    relabeled, info = relabel(
+        env_name,
+        actions,
+        next_obs,
+        consts,
+        features,
+        episode_index=episode_index,
+        chunk_size=64,
+    )
+    np.testing.assert_allclose(relabeled, rewards, rtol=1e-9, atol=1e-12)
+    for key in info:
+        expected = np.array([i[key] for i in infos], dtype=np.float64)
+        np.testing.assert_allclose(info[key], expected, rtol=1e-9, atol=1e-12)
+
+
+def test_required_features():
+    assert required_features("door-unlock-v3") == frozenset()
+    assert required_features("reach-v3") == {"tcp_center"}
+    assert required_features("pick-place-v3-goal-observable") == {
+        "tcp_center",
+        "left_pad",
+        "right_pad",
+        "touching_main_object",
+    }
+
+
+def test_relabel_missing_features():
+    actions, next_obs, consts, _, episode_index, _, _ = _collect(
+        "reach-v3", num_episodes=1, num_steps=5
+    )
+    with pytest.raises(ValueError, match="tcp_center"):
+        relabel("reach-v3", actions, next_obs, consts, episode_index=episode_index)
+    with pytest.raises(ValueError, match="not a V3 environment"):
+        relabel("reach-v2", actions, next_obs, consts)
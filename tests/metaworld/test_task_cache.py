@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+import metaworld
+from metaworld import task_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(task_cache.CACHE_DIR_ENV_VAR, str(tmp_path))
+    return tmp_path
+
+
+def test_cached_tasks_match_sampled_tasks(cache_dir, monkeypatch):
+    first = metaworld.ML1("pick-place-v3", seed=3)
+    assert len(os.listdir(cache_dir)) == 2  # train and test goals
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The goals should have been read from the cache.")
+
+    monkeypatch.setattr(metaworld, "_sample_goals", fail)
+    second = metaworld.ML1("pick-place-v3", seed=3)
+    assert second.train_tasks == first.train_tasks
+    assert second.test_tasks == first.test_tasks
+
+    monkeypatch.undo()
+    monkeypatch.setenv(task_cache.CACHE_DIR_ENV_VAR, "")
+    uncached = metaworld.ML1("pick-place-v3", seed=3)
+    assert uncached.train_tasks == first.train_tasks
+
+
+def test_task_key():
+    classes = metaworld.ALL_V3_ENVIRONMENTS
+    args_kwargs = {
+        "reach-v3": dict(args=[], kwargs={"task_id": 0}),
+        "push-v3": dict(args=[], kwargs={"task_id": 1}),
+    }
+    key = task_cache.task_key(classes, args_kwargs, seed=0, num_goals=50)
+    assert key == task_cache.task_key(classes, args_kwargs, seed=0, num_goals=50)
+    assert key != task_cache.task_key(classes, args_kwargs, seed=1, num_goals=50)
+    assert key != task_cache.task_key(classes, args_kwargs, seed=0, num_goals=10)
+    reversed_args_kwargs = dict(reversed(args_kwargs.items()))
+    assert key != task_cache.task_key(
+        classes, reversed_args_kwargs, seed=0, num_goals=50
+    )
+    assert task_cache.code_hash(classes["reach-v3"]) != task_cache.code_hash(
+        classes["push-v3"]
+    )
+
+
+def test_disabled_and_unseeded(cache_dir, monkeypatch):
+    metaworld.MT1("reach-v3")
+    assert not os.listdir(cache_dir)
+    monkeypatch.setenv(task_cache.CACHE_DIR_ENV_VAR, "")
+    assert task_cache.get_cache_dir() is None
+    metaworld.MT1("reach-v3", seed=0)
+    assert not os.listdir(cache_dir)
+
+
+def test_corrupt_cache_is_rebuilt(cache_dir):
+    expected = metaworld.MT1("reach-v3", seed=0).train_tasks
+    (path,) = cache_dir.iterdir()
+    path.write_bytes(b"not a cache file")
+    assert metaworld.MT1("reach-v3", seed=0).train_tasks == expected
+    assert metaworld.MT1("reach-v3", seed=0).train_tasks == expected
+
+
+def test_cli(cache_dir, tmp_path, capsys):
+    cli_dir = tmp_path / "cli"
+    task_cache.main(
+        ["--seeds", "0", "1", "--benchmarks", "MT10", "--cache-dir", str(cli_dir)]
+    )
+    assert len(os.listdir(cli_dir)) == 2
+    assert "MT10 seed=1" in capsys.readouterr().out
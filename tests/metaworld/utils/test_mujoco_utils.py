@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import metaworld
+from metaworld.policies import ENV_POLICY_MAP
+from metaworld.utils.mujoco_utils import contact_forces
+
+
+def _loop_contact_force(data, geom_a, geom_b):
+    contacts = [
+        x
+        for x in data.contact
+        if geom_a in (x.geom1, x.geom2) and geom_b in (x.geom1, x.geom2)
+    ]
+    return sum(data.efc_force[x.efc_address] for x in contacts)
+
+
+@pytest.mark.parametrize("env_name", ["pick-place-v3", "pick-out-of-hole-v3"])
+def test_contact_forces_matches_loop(env_name):
+    benchmark = metaworld.MT1(env_name, seed=0)
+    env = benchmark.train_classes[env_name]()
+    env.set_task(benchmark.train_tasks[0])
+    obs, _ = env.reset()
+    policy = ENV_POLICY_MAP[env_name]()
+
+    obj_id = env._get_id_main_object()
+    pairs = [
+        (env._ids.geom["leftpad_geom"], obj_id),
+        (obj_id, env._ids.geom["rightpad_geom"]),
+    ]
+    grasped = False
+    for _ in range(150):
+        obs, *_ = env.step(policy.get_action(obs))
+        forces = contact_forces(env.data, pairs)
+        expected = [_loop_contact_force(env.data, *pair) for pair in pairs]
+        np.testing.assert_allclose(forces, expected, rtol=1e-12, atol=0)
+        grasped |= bool(np.all(forces > 0))
+    assert grasped
+
+
+def test_contact_forces_without_contacts():
+    benchmark = metaworld.MT1("reach-v3", seed=0)
+    env = benchmark.train_classes["reach-v3"]()
+    env.data.ncon = 0
+    np.testing.assert_array_equal(contact_forces(env.data, [(0, 1), (2, 3)]), [0, 0])
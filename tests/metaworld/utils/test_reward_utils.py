@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from metaworld.utils import reward_utils
+
+SIGMOIDS = [
+    "gaussian",
+    "hyperbolic",
+    "long_tail",
+    "reciprocal",
+    "cosine",
+    "linear",
+    "quadratic",
+    "tanh_squared",
+]
+
+
+@pytest.mark.parametrize("sigmoid", SIGMOIDS)
+def test_make_tolerance_matches_scalar(sigmoid):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-1.0, 2.0, size=500)
+    margin = np.abs(rng.normal(scale=0.5, size=500))
+    margin[::7] = 0.0
+    bounds = (0.0, 0.3)
+
+    compiled = reward_utils.make_tolerance(bounds, sigmoid, value_at_margin=0.2)
+    values = compiled(x, margin)
+    expected = [
+        reward_utils.tolerance(
+            x_i, bounds=bounds, margin=m_i, sigmoid=sigmoid, value_at_margin=0.2
+        )
+        for x_i, m_i in zip(x, margin)
+    ]
+    # NumPy squares scalars with `pow()`, so array entries may differ in the last bit.
+    np.testing.assert_array_max_ulp(values, np.array(expected), maxulp=1)
+    in_bounds = (0.0 <= x) & (x <= 0.3)
+    np.testing.assert_array_equal(values[margin == 0], in_bounds[margin == 0])
+
+    # A scalar margin is broadcast.
+    np.testing.assert_array_equal(
+        compiled(x, 0.4),
+        reward_utils.tolerance(
+            x, bounds=bounds, margin=0.4, sigmoid=sigmoid, value_at_margin=0.2
+        ),
+    )
+
+
+def test_tolerance_scalar_types():
+    value = reward_utils.tolerance(0.2, bounds=(0.0, 0.1), margin=0.1)
+    assert isinstance(value, float)
+    assert value == pytest.approx(0.1)
+    assert reward_utils.tolerance(0.05, bounds=(0.0, 0.1), margin=0.1) == 1.0
+
+
+def test_tolerance_errors():
+    with pytest.raises(ValueError):
+        reward_utils.make_tolerance(bounds=(1.0, 0.0))
+    with pytest.raises(ValueError):
+        reward_utils.make_tolerance()(np.zeros(3), np.array([0.1, -0.1, 0.1]))
+    with pytest.raises(ValueError):
+        reward_utils.tolerance(0.5, margin=-1.0)
+    with pytest.raises(ValueError):
+        reward_utils.tolerance(0.5, margin=1.0, value_at_margin=1.0)
+    with pytest.raises(ValueError):
+        reward_utils.tolerance(0.5, margin=1.0, sigmoid="unknown")
+
+
+def test_hamacher_product_batch():
+    rng = np.random.default_rng(0)
+    a = rng.uniform(size=200)
+    b = rng.uniform(size=200)
+    a[::5] = 0.0
+    b[::10] = 0.0
+
+    products = reward_utils.hamacher_product(a, b)
+    expected = [reward_utils.hamacher_product(a_i, b_i) for a_i, b_i in zip(a, b)]
+    np.testing.assert_array_equal(products, expected)
+    np.testing.assert_array_equal(
+        reward_utils.hamacher_product(a, 0.5),
+        [reward_utils.hamacher_product(a_i, 0.5) for a_i in a],
+    )
+    with pytest.raises(ValueError):
+        reward_utils.hamacher_product(np.array([0.5, 1.5]), 0.5)
+
+
+def test_rect_prism_tolerance_batch():
+    rng = np.random.default_rng(0)
+    zero = rng.uniform(size=(200, 3))
+    one = rng.uniform(size=(200, 3))
+    curr = rng.uniform(size=(200, 3))
+    # Make sure some of the points are inside their prism.
+    curr[::3] = (zero[::3] + one[::3]) / 2
+
+    rewards = reward_utils.rect_prism_tolerance(curr, zero, one)
+    expected = [
+        reward_utils.rect_prism_tolerance(c, z, o) for c, z, o in zip(curr, zero, one)
+    ]
+    np.testing.assert_array_equal(rewards, expected)
+    assert (rewards[::3] < 1.0).all()
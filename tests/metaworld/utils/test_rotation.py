@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+import metaworld
+from metaworld.policies import ENV_POLICY_MAP
+from metaworld.utils.rotation import mat2quat_xyzw
+
+
+def _edge_case_matrices():
+    yield np.eye(3)
+    for axis, angle in itertools.product(
+        np.eye(3), [np.pi, np.pi / 2, -np.pi / 2, 2 * np.pi / 3, 1e-9]
+    ):
+        yield Rotation.from_rotvec(axis * angle).as_matrix()
+    # Right angles produce ties between the diagonal entries and the trace.
+    for angles in itertools.product([0, np.pi / 2, np.pi, -np.pi / 2], repeat=3):
+        yield Rotation.from_euler("xyz", angles).as_matrix()
+
+
+def test_mat2quat_xyzw_matches_scipy():
+    matrices = [
+        *_edge_case_matrices(),
+        *Rotation.from_quat(
+            np.random.default_rng(0).normal(size=(1000, 4))
+        ).as_matrix(),
+    ]
+    out = np.empty(4)
+    for mat in matrices:
+        expected = Rotation.from_matrix(mat).as_quat()
+        np.testing.assert_allclose(mat2quat_xyzw(mat), expected, rtol=0, atol=1e-12)
+        assert mat2quat_xyzw(mat.reshape(9), out=out) is out
+        np.testing.assert_allclose(out, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "env_name, xmat",
+    [
+        ("pick-place-v3", lambda env: env.data.geom_xmat[env._ids.geom["objGeom"]]),
+        ("sweep-into-v3", lambda env: env.data.geom_xmat[env._ids.geom["objGeom"]]),
+        ("door-open-v3", lambda env: env.data.geom_xmat[env._ids.geom["handle"]]),
+        ("coffee-push-v3", lambda env: env.data.geom_xmat[env._ids.geom["mug"]]),
+        ("stick-push-v3", lambda env: env.data.xmat[env._ids.body["stick"]]),
+        ("soccer-v3", lambda env: env.data.xmat[env._ids.body["soccer_ball"]]),
+    ],
+)
+def test_quat_objects_match_scipy_on_rollouts(env_name, xmat):
+    benchmark = metaworld.MT1(env_name, seed=0)
+    env = benchmark.train_classes[env_name]()
+    env.set_task(benchmark.train_tasks[0])
+    policy = ENV_POLICY_MAP[env_name]()
+    obs, _ = env.reset()
+    for _ in range(150):
+        expected = Rotation.from_matrix(xmat(env).reshape(3, 3)).as_quat()
+        np.testing.assert_allclose(
+            env._get_quat_objects()[:4], expected, rtol=0, atol=1e-12
+        )
+        obs, *_ = env.step(policy.get_action(obs))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from metaworld.utils.sampling import MinDistance, sample_rand_vecs
+
+LOW = np.array([-0.1, 0.6, 0.02, -0.1, 0.7, 0.05])
+HIGH = np.array([0.1, 0.7, 0.02, 0.1, 0.8, 0.3])
+CONSTRAINTS = (MinDistance(slice(0, 2), slice(3, 5), 0.15),)
+
+
+def _rejection_loop(rng, num):
+    samples = []
+    for _ in range(num):
+        sample = rng.uniform(LOW, HIGH, size=LOW.size)
+        while np.linalg.norm(sample[:2] - sample[3:5]) < 0.15:
+            sample = rng.uniform(LOW, HIGH, size=LOW.size)
+        samples.append(sample)
+    return np.array(samples)
+
+
+@pytest.mark.parametrize(
+    "make_rng", [np.random.RandomState, np.random.default_rng], ids=["legacy", "pcg"]
+)
+@pytest.mark.parametrize("batch_size", [None, 1, 7])
+def test_sample_rand_vecs_matches_rejection_loop(make_rng, batch_size):
+    expected_rng, rng = make_rng(0), make_rng(0)
+    expected = _rejection_loop(expected_rng, 50)
+    samples = sample_rand_vecs(LOW, HIGH, CONSTRAINTS, 50, rng, batch_size)
+    np.testing.assert_array_equal(samples, expected)
+    # The stream is left where the loop left it.
+    assert rng.uniform() == expected_rng.uniform()
+
+
+def test_min_distance_to_fixed_point():
+    constraint = MinDistance(slice(0, 2), (0.0, 0.84), 0.15)
+    samples = sample_rand_vecs(LOW, HIGH, (constraint,), 1000, np.random.default_rng(0))
+    assert samples.shape == (1000, 6)
+    assert constraint.satisfied(samples).all()
+    assert ((samples >= LOW) & (samples <= HIGH)).all()